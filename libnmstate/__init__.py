@@ -17,31 +17,50 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 #
 
+import importlib
 import os
+import sys
 
 from . import error
 from . import schema
 
-from .netapplier import apply
-from .netapplier import commit
-from .netapplier import rollback
-from .netinfo import show
-from .netinfo import show_running_config
-
-from .prettystate import PrettyState
-
-
 ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# The public API is imported from below modules on first use, as they pull in
+# the plugins, jsonschema and PyYAML which dominate the time of
+# `import libnmstate`.
+_LAZY_ATTRS = {
+    "NmstateSession": "session",
+    "PrettyState": "prettystate",
+    "apply": "netapplier",
+    "apply_async": "async_api",
+    "commit": "netapplier",
+    "commit_async": "async_api",
+    "generate_configurations": "gen_conf",
+    "rollback": "netapplier",
+    "rollback_async": "async_api",
+    "show": "netinfo",
+    "show_async": "async_api",
+    "show_running_config": "netinfo",
+    "show_running_config_async": "async_api",
+}
+
 __all__ = [
+    "NmstateSession",
     "PrettyState",
     "apply",
+    "apply_async",
     "commit",
+    "commit_async",
     "error",
+    "generate_configurations",
     "rollback",
+    "rollback_async",
     "schema",
     "show",
+    "show_async",
     "show_running_config",
+    "show_running_config_async",
 ]
 
 
@@ -52,3 +71,22 @@ def _get_version():
 
 
 __version__ = _get_version()
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
+
+if sys.version_info < (3, 7):
+    # Module level __getattr__() (PEP 562) requires Python 3.7+
+    for _name in _LAZY_ATTRS:
+        __getattr__(_name)
@@ -0,0 +1,158 @@
+#
+# Copyright (c) 2021 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import threading
+
+from .netapplier import apply
+from .netapplier import commit
+from .netapplier import rollback
+from .netinfo import show
+from .netinfo import show_running_config
+
+# Maximum number of read-only calls running at the same time, the others are
+# queued
+ASYNC_MAX_WORKERS = 4
+
+# Changes are serialized by running them in a dedicated single worker, so
+# queued changes never hold the workers of read-only calls.
+_READ_EXECUTOR = "read"
+_CHANGE_EXECUTOR = "change"
+
+_executors = {}
+_executor_lock = threading.Lock()
+
+
+async def show_async(*, include_status_data=False, fields=None):
+    """
+    Coroutine version of `libnmstate.show()`.
+    """
+    return await _run(
+        show, include_status_data=include_status_data, fields=fields
+    )
+
+
+async def show_running_config_async():
+    """
+    Coroutine version of `libnmstate.show_running_config()`.
+    """
+    return await _run(show_running_config)
+
+
+async def apply_async(
+    desired_state,
+    *,
+    verify_change=True,
+    commit=True,
+    rollback_timeout=60,
+    save_to_disk=True,
+    scoped_checkpoint=False,
+    kernel_only=False,
+    timings_callback=None,
+):
+    """
+    Coroutine version of `libnmstate.apply()`.
+    The `timings_callback` is invoked in the worker thread.
+    """
+    return await _run(
+        apply,
+        desired_state,
+        verify_change=verify_change,
+        commit=commit,
+        rollback_timeout=rollback_timeout,
+        save_to_disk=save_to_disk,
+        scoped_checkpoint=scoped_checkpoint,
+        kernel_only=kernel_only,
+        timings_callback=timings_callback,
+        executor_name=_CHANGE_EXECUTOR,
+    )
+
+
+async def commit_async(*, checkpoint=None):
+    """
+    Coroutine version of `libnmstate.commit()`.
+    """
+    return await _run(
+        commit, checkpoint=checkpoint, executor_name=_CHANGE_EXECUTOR
+    )
+
+
+async def rollback_async(*, checkpoint=None):
+    """
+    Coroutine version of `libnmstate.rollback()`.
+    """
+    return await _run(
+        rollback, checkpoint=checkpoint, executor_name=_CHANGE_EXECUTOR
+    )
+
+
+async def _run(func, *args, executor_name=_READ_EXECUTOR, **kwargs):
+    """
+    Run the blocking call in worker thread with its own GLib main context,
+    so the event loop is never blocked by the GLib main context iteration
+    and the calls from different worker threads do not interfere.
+    """
+    return await _get_running_loop().run_in_executor(
+        _get_executor(executor_name),
+        functools.partial(_run_with_own_main_context, func, *args, **kwargs),
+    )
+
+
+def _get_executor(name):
+    with _executor_lock:
+        if name not in _executors:
+            max_workers = 1 if name == _CHANGE_EXECUTOR else ASYNC_MAX_WORKERS
+            _executors[name] = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix=f"nmstate-{name}"
+            )
+        return _executors[name]
+
+
+def _get_running_loop():
+    try:
+        return asyncio.get_running_loop()
+    except AttributeError:
+        # asyncio.get_running_loop() requires Python 3.7+
+        return asyncio.get_event_loop()
+
+
+def _run_with_own_main_context(func, *args, **kwargs):
+    main_context = _new_glib_main_context()
+    if main_context is None:
+        return func(*args, **kwargs)
+    # NM.Client uses the thread default main context
+    main_context.push_thread_default()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        main_context.pop_thread_default()
+
+
+def _new_glib_main_context():
+    """
+    Making GLib as optional, return None if not available
+    """
+    try:
+        from libnmstate.nm.common import GLib
+
+        return GLib.MainContext.new()
+    except Exception:
+        return None
@@ -0,0 +1,83 @@
+#
+# Copyright (c) 2021 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+import copy
+
+from libnmstate import validator
+from libnmstate.error import NmstateDependencyError
+from libnmstate.error import NmstateValueError
+from libnmstate.schema import Interface
+from libnmstate.schema import InterfaceState
+from libnmstate.schema import InterfaceType
+
+from .net_state import NetState
+
+NM_PLUGIN_NAME = "NetworkManager"
+
+# Interface types only reported by show(), no configuration could be
+# generated for them.
+_UNCONFIGURABLE_IFACE_TYPES = (InterfaceType.UNKNOWN, InterfaceType.OTHER)
+
+
+def generate_configurations(desired_state):
+    """
+    Generate the configuration files for the desired state without
+    connecting to any daemon, the current state of the host is not used.
+    Hence all the interfaces referred as port or parent should be defined in
+    the desired state.
+
+    :param desired_state: The desired state
+    :type desired_state: dict
+    :returns: A dictionary with plugin name as key and list of
+        `[file_name, file_content]` as value.
+    :rtype: dict
+    """
+    desired_state = copy.deepcopy(desired_state)
+    validator.schema_validate(desired_state)
+    _validate_iface_types(desired_state)
+    net_state = NetState(desired_state)
+    return {NM_PLUGIN_NAME: _generate_nm_keyfiles(net_state)}
+
+
+def _validate_iface_types(desired_state):
+    """
+    The interface of unknown type is ignored when applying, but as the
+    current state is not used, it would silently generate nothing here.
+    """
+    for iface_info in desired_state.get(Interface.KEY, []):
+        iface_type = iface_info.get(Interface.TYPE)
+        iface_state = iface_info.get(Interface.STATE, InterfaceState.UP)
+        if (
+            iface_state == InterfaceState.UP
+            and iface_type in _UNCONFIGURABLE_IFACE_TYPES
+        ):
+            raise NmstateValueError(
+                f"Interface {iface_info.get(Interface.NAME)} type "
+                f"{iface_type} is not supported for generating configuration"
+            )
+
+
+def _generate_nm_keyfiles(net_state):
+    try:
+        from libnmstate.nm.profiles import generate_keyfiles
+    except ImportError as e:
+        raise NmstateDependencyError(
+            f"NetworkManager library is required for generating keyfile: {e}"
+        )
+    return generate_keyfiles(net_state)
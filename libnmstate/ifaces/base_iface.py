@@ -36,6 +36,7 @@ from libnmstate.schema import OvsDB
 
 from ..state import state_match
 from ..state import merge_dict
+from .info_view import InfoView
 
 
 class IPState:
@@ -129,7 +130,8 @@ class BaseIface:
     ROUTE_CHANGED_METADATA = "_changed"
 
     def __init__(self, info, save_to_disk=True):
-        self._origin_info = deepcopy(info)
+        # The original information is only read, no need to copy it.
+        self._origin_info = info
         self._info = deepcopy(info)
         self._is_desired = False
         self._is_changed = False
@@ -196,8 +198,18 @@ class BaseIface:
     def to_dict(self):
         return deepcopy(self._info)
 
+    def to_dict_view(self):
+        """
+        Return a read-only view of to_dict() without copying.
+        """
+        return InfoView(self._info)
+
     @property
     def original_dict(self):
+        """
+        Return the information used to create this interface.
+        Should not be modified.
+        """
         return self._origin_info
 
     def ip_state(self, family):
@@ -385,9 +397,8 @@ class BaseIface:
             ip_state = self.ip_state(family)
             ip_state.remove_link_local_address()
             self._info[family] = ip_state.to_dict()
-        state = self.to_dict()
+        state = _copy_desired_data(self._info, self.original_dict)
         _remove_empty_description(state)
-        _remove_undesired_data(state, self.original_dict)
         _remove_lldp_neighbors(state)
         if Interface.STATE not in state:
             state[Interface.STATE] = InterfaceState.UP
@@ -450,18 +461,20 @@ def _remove_lldp_neighbors(state):
     state.get(LLDP.CONFIG_SUBTREE, {}).pop(LLDP.NEIGHBORS_SUBTREE, None)
 
 
-def _remove_undesired_data(state, desire):
+def _copy_desired_data(state, desire):
     """
-    For any key not defined in `desire`, remove it from `state`
+    Return a copy of `state` only holding the keys defined in `desire`,
+    the undesired data is not copied at all.
     """
-    key_to_remove = []
+    copied_state = {}
     for key, value in state.items():
         if key not in desire:
-            key_to_remove.append(key)
+            continue
         elif isinstance(value, Mapping):
-            _remove_undesired_data(value, desire[key])
-    for key in key_to_remove:
-        state.pop(key)
+            copied_state[key] = _copy_desired_data(value, desire[key])
+        else:
+            copied_state[key] = deepcopy(value)
+    return copied_state
 
 
 def _convert_ovs_external_ids_values_to_string(iface_info):
@@ -17,6 +17,7 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 #
 
+import copy
 import logging
 
 from libnmstate.error import NmstateKernelIntegerRoundedError
@@ -524,10 +525,44 @@ class Ifaces:
         for iface in self.all_ifaces():
             if iface.is_up and iface.is_controller and iface.port:
                 for port_name in iface.port:
-                    port_iface = self._kernel_ifaces[port_name]
-                    if port_iface.type == InterfaceType.UNKNOWN:
+                    # Port might not be included when verifying subset of
+                    # interfaces
+                    port_iface = self._kernel_ifaces.get(port_name)
+                    if port_iface and port_iface.type == InterfaceType.UNKNOWN:
                         iface.remove_port(port_name)
 
+    @property
+    def affected_iface_names(self):
+        """
+        Return names of desired or changed interfaces along with their ports,
+        parents and controllers.
+        """
+        iface_names = set()
+        for iface in self.all_ifaces():
+            if iface.is_desired or iface.is_changed:
+                iface_names.add(iface.name)
+                iface_names.update(iface.port)
+                if iface.parent:
+                    iface_names.add(iface.parent)
+                if iface.controller:
+                    iface_names.add(iface.controller)
+                cur_iface = self.get_cur_iface(iface.name, iface.type)
+                if cur_iface:
+                    iface_names.update(cur_iface.port)
+        return iface_names
+
+    @property
+    def iface_names_to_verify(self):
+        """
+        Return names of interfaces required by verify(): the
+        `affected_iface_names` and ignored interfaces.
+        """
+        iface_names = self.affected_iface_names
+        iface_names.update(
+            iface_name for iface_name, _, _ in self._ignored_ifaces
+        )
+        return iface_names
+
     def verify(self, cur_iface_infos):
         cur_ifaces = Ifaces(
             des_iface_infos=None,
@@ -536,8 +571,7 @@ class Ifaces:
         )
         cur_ifaces._remove_unknown_interface_type_port()
         cur_ifaces._remove_ignore_interfaces(self._ignored_ifaces)
-        self._remove_ignore_interfaces(self._ignored_ifaces)
-        for iface in self.all_ifaces():
+        for iface in self._ifaces_to_verify():
             if iface.is_desired:
                 if (
                     iface.is_virtual
@@ -592,6 +626,36 @@ class Ifaces:
                             )
                         )
 
+    def _ifaces_to_verify(self):
+        """
+        Yield the interfaces without the ignored interfaces and ignored ports
+        for verification. The desired interfaces are not changed, as they
+        might still be applied: the controller holding ignored ports is
+        copied before removing them.
+        """
+        ignored_ifaces = set(
+            (iface_name, iface_type)
+            for iface_name, iface_type, _ in self._ignored_ifaces
+        )
+        # Only kernel interface can be used as port
+        ignored_kernel_iface_names = set(
+            iface_name
+            for iface_name, _, is_user_space_only in self._ignored_ifaces
+            if not is_user_space_only
+        )
+        for iface in self.all_ifaces():
+            if (iface.name, iface.type) in ignored_ifaces:
+                continue
+            if iface.is_up and iface.is_controller and iface.port:
+                ignored_ports = ignored_kernel_iface_names.intersection(
+                    iface.port
+                )
+                if ignored_ports:
+                    iface = copy.deepcopy(iface)
+                    for port_name in ignored_ports:
+                        iface.remove_port(port_name)
+            yield iface
+
     def gen_dns_metadata(self, dns_state, route_state):
         iface_metadata = dns_state.gen_metadata(self, route_state)
         for iface_name, dns_metadata in iface_metadata.items():
@@ -0,0 +1,106 @@
+#
+# Copyright (c) 2021 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+from collections.abc import Mapping
+from collections.abc import Sequence
+from copy import deepcopy
+
+
+class InfoView(Mapping):
+    """
+    Read-only view of interface information without copying it.
+    Nested dictionaries and lists are wrapped as read-only views on access.
+    Changes to the underlying dictionary are visible through the view.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data):
+        self._data = data
+
+    def __getitem__(self, key):
+        return _to_view(self._data[key])
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __eq__(self, other):
+        if isinstance(other, InfoView):
+            other = other._data
+        return self._data == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self._data)
+
+    def to_dict(self):
+        """
+        Return a full copy of the underlying data which is safe to modify.
+        """
+        return deepcopy(self._data)
+
+
+class InfoListView(Sequence):
+    """
+    Read-only view of list nested in interface information.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data):
+        self._data = data
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return InfoListView(self._data[index])
+        return _to_view(self._data[index])
+
+    def __len__(self):
+        return len(self._data)
+
+    def __eq__(self, other):
+        if isinstance(other, InfoListView):
+            other = other._data
+        return self._data == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self._data)
+
+    def to_list(self):
+        """
+        Return a full copy of the underlying data which is safe to modify.
+        """
+        return deepcopy(self._data)
+
+
+def _to_view(value):
+    if isinstance(value, dict):
+        return InfoView(value)
+    elif isinstance(value, list):
+        return InfoListView(value)
+    return value
@@ -17,9 +17,12 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 #
 
+from contextlib import contextmanager
 from copy import deepcopy
 from operator import itemgetter
-import subprocess
+import os
+import socket
+import threading
 import warnings
 
 from libnmstate.error import NmstateValueError
@@ -34,9 +37,12 @@ from .bridge import BridgeIface
 from .base_iface import BaseIface
 
 
-SYSTEMCTL_TIMEOUT_SECONDS = 5
+DEFAULT_OVS_DB_SOCKET_PATH = "/run/openvswitch/db.sock"
+OVS_DB_SOCKET_PROBE_TIMEOUT = 5
 DEPRECATED_SLAVES = "slaves"
 
+_ovs_running_cache = threading.local()
+
 
 class OvsBridgeIface(BridgeIface):
     def __init__(self, info, save_to_disk):
@@ -252,17 +258,44 @@ class OvsInternalIface(BaseIface):
                 self._info.pop(Interface.MAC, None)
 
 
+@contextmanager
+def ovs_running_cache():
+    """
+    Within this context, `is_ovs_running()` probes only once and caches the
+    result. The cache is only visible to the current thread, so concurrent
+    actions in other threads do not share or reset it.
+    """
+    outer_cache = getattr(_ovs_running_cache, "result", None)
+    _ovs_running_cache.result = {}
+    try:
+        yield
+    finally:
+        _ovs_running_cache.result = outer_cache
+
+
 def is_ovs_running():
+    """
+    Check whether OVS database is accepting connection on its unix socket.
+    The result is cached within `ovs_running_cache()`.
+    """
+    cache = getattr(_ovs_running_cache, "result", None)
+    if cache is None:
+        return _probe_ovs_db()
+    if "running" not in cache:
+        cache["running"] = _probe_ovs_db()
+    return cache["running"]
+
+
+def _probe_ovs_db():
+    socket_path = os.environ.get(
+        "OVS_DB_UNIX_SOCKET_PATH", DEFAULT_OVS_DB_SOCKET_PATH
+    )
     try:
-        subprocess.run(
-            ("systemctl", "status", "openvswitch"),
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            check=True,
-            timeout=SYSTEMCTL_TIMEOUT_SECONDS,
-        )
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(OVS_DB_SOCKET_PROBE_TIMEOUT)
+            sock.connect(socket_path)
         return True
-    except Exception:
+    except OSError:
         return False
 
 
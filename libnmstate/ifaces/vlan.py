@@ -28,6 +28,10 @@ class VlanIface(BaseIface):
     def parent(self):
         return self._vlan_config.get(VLAN.BASE_IFACE)
 
+    @property
+    def vlan_id(self):
+        return self._vlan_config.get(VLAN.ID)
+
     @property
     def need_parent(self):
         return True
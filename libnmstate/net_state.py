@@ -17,8 +17,6 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 #
 
-import copy
-
 from libnmstate.error import NmstateVerificationError
 from libnmstate.prettystate import format_desired_current_state_diff
 from libnmstate.schema import DNS
@@ -56,18 +54,61 @@ class NetState:
             desire_state.get(RouteRule.KEY),
             current_state.get(RouteRule.KEY),
         )
-        self.desire_state = copy.deepcopy(desire_state)
-        self.current_state = copy.deepcopy(current_state)
+        # Both states are only read after interfaces been created, no need
+        # to copy them.
+        self.desire_state = desire_state
+        self.current_state = current_state
         if self.desire_state:
             self._ifaces.gen_dns_metadata(self._dns, self._route)
             self._ifaces.gen_route_metadata(self._route)
             self._ifaces.gen_route_rule_metadata(self._route_rule, self._route)
 
-    def verify(self, current_state):
+    @property
+    def iface_names_to_verify(self):
+        return self._ifaces.iface_names_to_verify
+
+    @property
+    def affected_iface_names(self):
+        return self._ifaces.affected_iface_names
+
+    @property
+    def route_tables_to_verify(self):
+        return self._route_rule.route_tables_to_verify(
+            self._route, self.iface_names_to_verify
+        )
+
+    @property
+    def is_dns_desired(self):
+        return DNS.KEY in self.desire_state
+
+    @property
+    def has_changes(self):
+        """
+        Return False if no interface is marked as changed and the desired
+        state already matches the current state.
+        """
+        if any(iface.is_changed for iface in self._ifaces.all_ifaces()):
+            return True
+        try:
+            self.verify(self.current_state)
+        except NmstateVerificationError:
+            return True
+        return False
+
+    def verify(self, current_state, scoped=False):
+        """
+        When `scoped` is True, only verify interfaces and routes of
+        `iface_names_to_verify`, route rules of `route_tables_to_verify` and
+        DNS when desired, the `current_state` is not required to hold other
+        information.
+        """
+        iface_names = self.iface_names_to_verify if scoped else None
+        route_tables = self.route_tables_to_verify if scoped else None
         self._ifaces.verify(current_state.get(Interface.KEY))
-        self._dns.verify(current_state.get(DNS.KEY))
-        self._route.verify(current_state.get(Route.KEY))
-        self._route_rule.verify(current_state.get(RouteRule.KEY))
+        if not scoped or self.is_dns_desired:
+            self._dns.verify(current_state.get(DNS.KEY))
+        self._route.verify(current_state.get(Route.KEY), iface_names)
+        self._route_rule.verify(current_state.get(RouteRule.KEY), route_tables)
         self._verify_other_global_info(current_state)
 
     def _verify_other_global_info(self, current_state):
@@ -89,3 +130,11 @@ class NetState:
     @property
     def dns(self):
         return self._dns
+
+    @property
+    def route(self):
+        return self._route
+
+    @property
+    def route_rule(self):
+        return self._route_rule
@@ -17,12 +17,16 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 #
 
+from contextlib import contextmanager
 import copy
+import logging
 import time
 
 
 from libnmstate import validator
+from libnmstate.error import NmstateValueError
 from libnmstate.error import NmstateVerificationError
+from libnmstate.plugin import NmstatePlugin
 
 from .nmstate import create_checkpoints
 from .nmstate import destroy_checkpoints
@@ -35,6 +39,9 @@ from .net_state import NetState
 MAINLOOP_TIMEOUT = 35
 VERIFY_RETRY_INTERNAL = 1
 VERIFY_RETRY_TIMEOUT = 5
+# When more than one plugin could notify changes, each of them is waited in
+# turn for this many seconds.
+CHANGE_NOTIFICATION_SLICE = 0.1
 
 
 def apply(
@@ -44,6 +51,9 @@ def apply(
     commit=True,
     rollback_timeout=60,
     save_to_disk=True,
+    scoped_checkpoint=False,
+    kernel_only=False,
+    timings_callback=None,
 ):
     """
     Apply the desired state
@@ -53,26 +63,40 @@ def apply(
     :param commit: Commit the changes after verification if the state matches.
     :param rollback_timeout: Revert the changes if they are not commited within
         this timeout (specified in seconds).
+    :param scoped_checkpoint: Only include the interfaces affected by the
+        desired state in the checkpoint instead of all interfaces.
+    :param kernel_only: Apply the memory-only changes directly to kernel
+        without NetworkManager. No checkpoint is created, hence changes cannot
+        be rolled back. Requires `save_to_disk=False`. Memory-only changes are
+        also applied directly to kernel when NetworkManager is not available.
+    :param timings_callback: Invoked with a dictionary holding the seconds
+        spent on each phase of the apply and on each plugin action once the
+        apply finished or failed. Its `changed` key is False when the desired
+        state was already applied and nothing was changed.
     :type verify_change: bool
     :type commit: bool
     :type rollback_timeout: int (seconds)
+    :type scoped_checkpoint: bool
+    :type kernel_only: bool
+    :type timings_callback: callable
     :returns: Checkpoint identifier
     :rtype: str
     """
-    desired_state = copy.deepcopy(desired_state)
-    with plugin_context() as plugins:
-        validator.schema_validate(desired_state)
-        current_state = show_with_plugins(plugins, include_status_data=True)
-        validator.validate_capabilities(
-            desired_state, plugins_capabilities(plugins)
+    if kernel_only and save_to_disk:
+        raise NmstateValueError(
+            "Applying directly to kernel requires save_to_disk=False"
+        )
+    with plugin_context(kernel_only, memory_only=not save_to_disk) as plugins:
+        return apply_with_plugins(
+            plugins,
+            desired_state,
+            verify_change=verify_change,
+            commit=commit,
+            rollback_timeout=rollback_timeout,
+            save_to_disk=save_to_disk,
+            scoped_checkpoint=scoped_checkpoint,
+            timings_callback=timings_callback,
         )
-        net_state = NetState(desired_state, current_state, save_to_disk)
-        checkpoints = create_checkpoints(plugins, rollback_timeout)
-        _apply_ifaces_state(plugins, net_state, verify_change, save_to_disk)
-        if commit:
-            destroy_checkpoints(plugins, checkpoints)
-        else:
-            return checkpoints
 
 
 def commit(*, checkpoint=None):
@@ -99,22 +123,201 @@ def rollback(*, checkpoint=None):
         rollback_checkpoints(plugins, checkpoint)
 
 
-def _apply_ifaces_state(plugins, net_state, verify_change, save_to_disk):
-    for plugin in plugins:
-        plugin.apply_changes(net_state, save_to_disk)
-    verified = False
+def apply_with_plugins(
+    plugins,
+    desired_state,
+    *,
+    verify_change=True,
+    commit=True,
+    rollback_timeout=60,
+    save_to_disk=True,
+    scoped_checkpoint=False,
+    timings_callback=None,
+):
+    timings = _ApplyTimings()
+    if timings_callback:
+        for plugin in plugins:
+            plugin.start_action_timings()
+    try:
+        return _apply_with_plugins(
+            plugins,
+            desired_state,
+            verify_change,
+            commit,
+            rollback_timeout,
+            save_to_disk,
+            scoped_checkpoint,
+            timings,
+        )
+    finally:
+        if timings_callback:
+            timings_callback(timings.to_dict(plugins))
+
+
+def _apply_with_plugins(
+    plugins,
+    desired_state,
+    verify_change,
+    commit,
+    rollback_timeout,
+    save_to_disk,
+    scoped_checkpoint,
+    timings,
+):
+    with timings.phase("validate"):
+        desired_state = copy.deepcopy(desired_state)
+        validator.schema_validate(desired_state)
+    with timings.phase("show"):
+        current_state = show_with_plugins(plugins, include_status_data=True)
+        validator.validate_capabilities(
+            desired_state, plugins_capabilities(plugins)
+        )
+    with timings.phase("net_state"):
+        net_state = NetState(desired_state, current_state, save_to_disk)
+        # Caller of `commit=False` expects a checkpoint to commit or rollback
+        # later, hence only skip when committing.
+        has_changes = not commit or _has_pending_changes(
+            plugins, net_state, save_to_disk
+        )
+    timings.changed = has_changes
+    if not has_changes:
+        logging.info("Desired state already applied, nothing changed")
+        return None
+    with timings.phase("checkpoint"):
+        checkpoints = create_checkpoints(
+            plugins,
+            rollback_timeout,
+            net_state.affected_iface_names if scoped_checkpoint else None,
+        )
+    _apply_ifaces_state(
+        plugins, net_state, verify_change, save_to_disk, timings
+    )
+    if commit:
+        with timings.phase("commit"):
+            destroy_checkpoints(plugins, checkpoints)
+    else:
+        return checkpoints
+
+
+class _ApplyTimings:
+    """
+    Seconds spent on each phase of an apply.
+    """
+
+    def __init__(self):
+        self._start_time = time.monotonic()
+        self._phases = {}
+        self.verify_attempts = 0
+        self.changed = None
+
+    @contextmanager
+    def phase(self, name):
+        start_time = time.monotonic()
+        try:
+            yield
+        finally:
+            self._phases[name] = self._phases.get(name, 0.0) + (
+                time.monotonic() - start_time
+            )
+
+    def to_dict(self, plugins):
+        """
+        Return the timings along with the actions reported by plugins:
+            * total: seconds since creation
+            * phases: seconds spent on each phase in order
+            * verify_attempts: number of verifications done
+            * changed: False if desired state was already applied, None if
+              failed before knowing
+            * actions: plugin name to list of action name and its seconds
+        """
+        actions = {}
+        for plugin in plugins:
+            plugin_actions = plugin.pop_action_timings()
+            if plugin_actions:
+                actions[plugin.name] = [
+                    {"action": action, "duration": duration}
+                    for action, duration in plugin_actions
+                ]
+        return {
+            "total": time.monotonic() - self._start_time,
+            "phases": dict(self._phases),
+            "verify_attempts": self.verify_attempts,
+            "changed": self.changed,
+            "actions": actions,
+        }
+
+
+def _has_pending_changes(plugins, net_state, save_to_disk):
+    return net_state.has_changes or any(
+        plugin.has_pending_changes(net_state, save_to_disk)
+        for plugin in plugins
+    )
+
+
+def _apply_ifaces_state(
+    plugins, net_state, verify_change, save_to_disk, timings=None
+):
+    if timings is None:
+        timings = _ApplyTimings()
+    with timings.phase("apply"):
+        for plugin in plugins:
+            plugin.apply_changes(net_state, save_to_disk)
     if verify_change:
-        for _ in range(VERIFY_RETRY_TIMEOUT):
-            try:
-                _verify_change(plugins, net_state)
-                verified = True
-                break
-            except NmstateVerificationError:
-                time.sleep(VERIFY_RETRY_INTERNAL)
-        if not verified:
+        with timings.phase("verify"):
+            _verify_change_with_retry(plugins, net_state, timings)
+
+
+def _verify_change_with_retry(plugins, net_state, timings):
+    """
+    Instead of sleeping fixed interval between each verification, wait for
+    change notification from plugins and verify again once any change
+    related to the desired interfaces is noticed.
+    """
+    deadline = time.monotonic() + VERIFY_RETRY_TIMEOUT * VERIFY_RETRY_INTERNAL
+    iface_names = net_state.iface_names_to_verify
+    while True:
+        timings.verify_attempts += 1
+        try:
             _verify_change(plugins, net_state)
+            return
+        except NmstateVerificationError:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise
+        _wait_for_change(
+            plugins, iface_names, min(remaining, VERIFY_RETRY_INTERNAL)
+        )
+
+
+def _wait_for_change(plugins, iface_names, timeout):
+    notifiers = [
+        plugin
+        for plugin in plugins
+        if NmstatePlugin.PLUGIN_CAPABILITY_CHANGE_NOTIFICATION
+        in plugin.plugin_capabilities
+    ]
+    if not notifiers:
+        time.sleep(timeout)
+    elif len(notifiers) == 1:
+        notifiers[0].wait_for_change(iface_names, timeout)
+    else:
+        deadline = time.monotonic() + timeout
+        while True:
+            for plugin in notifiers:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                if plugin.wait_for_change(
+                    iface_names, min(remaining, CHANGE_NOTIFICATION_SLICE)
+                ):
+                    return
 
 
 def _verify_change(plugins, net_state):
-    current_state = show_with_plugins(plugins)
-    net_state.verify(current_state)
+    current_state = show_with_plugins(
+        plugins,
+        iface_names=net_state.iface_names_to_verify,
+        route_tables=net_state.route_tables_to_verify,
+        include_dns=net_state.is_dns_desired,
+    )
+    net_state.verify(current_state, scoped=True)
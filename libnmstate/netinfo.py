@@ -22,7 +22,7 @@ from .nmstate import show_with_plugins
 from .nmstate import show_running_config_with_plugins
 
 
-def show(*, include_status_data=False):
+def show(*, include_status_data=False, fields=None):
     """
     Reports configuration and status data on the system.
     Configuration data is the set of writable data which can change the system
@@ -31,9 +31,13 @@ def show(*, include_status_data=False):
     including read-only and statistics information.
     When include_status_data is set, both are reported, otherwise only the
     configuration data is reported.
+    When fields is set, only the listed subtrees are reported and the
+    plugins skip collecting the others. Each field is a dot separated path,
+    for example `["interfaces.name", "interfaces.ipv4", "routes.config"]`.
+    The interface name and type are always reported.
     """
     with plugin_context() as plugins:
-        return show_with_plugins(plugins, include_status_data)
+        return show_with_plugins(plugins, include_status_data, fields=fields)
 
 
 def show_running_config():
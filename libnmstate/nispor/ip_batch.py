@@ -0,0 +1,344 @@
+#
+# Copyright (c) 2021 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+import logging
+import subprocess
+
+from libnmstate.error import NmstateNotSupportedError
+from libnmstate.error import NmstatePluginError
+from libnmstate.iplib import is_ipv6_link_local_addr
+from libnmstate.route import RouteEntry
+from libnmstate.route_rule import RouteRuleEntry
+from libnmstate.schema import Bond
+from libnmstate.schema import DNS
+from libnmstate.schema import Interface
+from libnmstate.schema import InterfaceIP
+from libnmstate.schema import InterfaceType
+from libnmstate.schema import LinuxBridge
+from libnmstate.schema import Route
+from libnmstate.schema import RouteRule
+
+IP_BATCH_TIMEOUT = 30
+ROUTE_PROTOCOL = "static"
+
+# Interface types could be created or deleted by `ip link`
+_IP_LINK_TYPES = {
+    InterfaceType.BOND: "bond",
+    InterfaceType.DUMMY: "dummy",
+    InterfaceType.LINUX_BRIDGE: "bridge",
+    InterfaceType.VETH: "veth",
+    InterfaceType.VLAN: "vlan",
+    InterfaceType.VRF: "vrf",
+}
+# Interface types cannot be configured by `ip`
+_UNSUPPORTED_TYPES = (
+    InterfaceType.INFINIBAND,
+    InterfaceType.OVS_BRIDGE,
+    InterfaceType.OVS_INTERFACE,
+    InterfaceType.OVS_PORT,
+    InterfaceType.TEAM,
+)
+# Controllers should be created before ports, parents before children
+_CREATE_ORDER = (
+    InterfaceType.BOND,
+    InterfaceType.LINUX_BRIDGE,
+    InterfaceType.VRF,
+    InterfaceType.DUMMY,
+    InterfaceType.VETH,
+    InterfaceType.VLAN,
+)
+
+
+def gen_ip_batch_commands(net_state):
+    """
+    Return a list of `ip` commands(without the leading `ip`) which could be
+    used by `ip -batch` to apply the network state without persisting it.
+    """
+    if net_state.is_dns_desired:
+        raise NmstateNotSupportedError(
+            f"Applying {DNS.KEY} without NetworkManager is not supported"
+        )
+    changed_ifaces = [
+        iface
+        for iface in net_state.ifaces.all_ifaces()
+        if (iface.is_changed or iface.is_desired) and not iface.is_ignore
+    ]
+    for iface in changed_ifaces:
+        _validate_iface(iface)
+
+    cmds = []
+    for iface in changed_ifaces:
+        if iface.is_absent or (iface.is_down and iface.is_virtual):
+            cur_iface = net_state.ifaces.get_cur_iface(iface.name, iface.type)
+            if cur_iface:
+                cmds.append(f"link del {iface.name}")
+        elif iface.is_down:
+            cmds.append(f"link set {iface.name} down")
+
+    up_ifaces = [iface for iface in changed_ifaces if iface.is_up]
+    for iface_type in _CREATE_ORDER:
+        for iface in up_ifaces:
+            if iface.type == iface_type and not _is_existing_or_peer(
+                net_state, iface
+            ):
+                cmds.append(_gen_link_add_command(iface))
+
+    for iface in up_ifaces:
+        cmds.extend(_gen_link_set_commands(net_state, iface))
+
+    for iface in up_ifaces:
+        cur_iface = net_state.ifaces.get_cur_iface(iface.name, iface.type)
+        cmds.extend(_gen_address_commands(iface, cur_iface))
+
+    cmds.extend(_gen_route_commands(net_state))
+    cmds.extend(_gen_route_rule_commands(net_state))
+    return cmds
+
+
+def run_ip_batch(cmds):
+    if not cmds:
+        return
+    logging.debug("Running ip -batch with commands:\n" + "\n".join(cmds))
+    try:
+        output = subprocess.run(
+            ["ip", "-batch", "-"],
+            input="\n".join(cmds) + "\n",
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            timeout=IP_BATCH_TIMEOUT,
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        raise NmstatePluginError(f"Failed to run ip -batch: {e}")
+    if output.returncode != 0:
+        raise NmstatePluginError(
+            f"ip -batch failed with exit code {output.returncode}: "
+            f"{output.stderr.strip()}"
+        )
+
+
+def _validate_iface(iface):
+    if iface.is_user_space_only or iface.type in _UNSUPPORTED_TYPES:
+        raise NmstateNotSupportedError(
+            f"Interface {iface.name} type {iface.type} is not supported "
+            "without NetworkManager"
+        )
+    if iface.controller_type in _UNSUPPORTED_TYPES:
+        raise NmstateNotSupportedError(
+            f"Interface {iface.name} as port of {iface.controller_type} is "
+            "not supported without NetworkManager"
+        )
+    if iface.is_up:
+        for family in (Interface.IPV4, Interface.IPV6):
+            if iface.is_dynamic(family):
+                raise NmstateNotSupportedError(
+                    f"Dynamic IP of interface {iface.name} is not supported "
+                    "without NetworkManager"
+                )
+        original = iface.original_dict
+        if original.get(Bond.CONFIG_SUBTREE, {}).get(
+            Bond.OPTIONS_SUBTREE
+        ) or original.get(LinuxBridge.CONFIG_SUBTREE, {}).get(
+            LinuxBridge.OPTIONS_SUBTREE
+        ):
+            raise NmstateNotSupportedError(
+                f"Options of interface {iface.name} is not supported without "
+                "NetworkManager"
+            )
+
+
+def _is_existing_or_peer(net_state, iface):
+    if net_state.ifaces.get_cur_iface(iface.name, iface.type):
+        return True
+    if iface.type == InterfaceType.VETH:
+        # Created along with the peer
+        peer_iface = net_state.ifaces.all_kernel_ifaces.get(iface.peer)
+        if (
+            peer_iface
+            and peer_iface.is_up
+            and peer_iface.type == InterfaceType.VETH
+            and not net_state.ifaces.get_cur_iface(
+                iface.peer, InterfaceType.VETH
+            )
+            and peer_iface.name < iface.name
+        ):
+            return True
+    return False
+
+
+def _gen_link_add_command(iface):
+    link_type = _IP_LINK_TYPES.get(iface.type)
+    if link_type is None:
+        raise NmstateNotSupportedError(
+            f"Creating interface {iface.name} type {iface.type} is not "
+            "supported without NetworkManager"
+        )
+    if iface.type == InterfaceType.VLAN:
+        return (
+            f"link add link {iface.parent} name {iface.name} type vlan "
+            f"id {iface.vlan_id}"
+        )
+    cmd = f"link add name {iface.name} type {link_type}"
+    if iface.type == InterfaceType.BOND and iface.bond_mode:
+        cmd += f" mode {iface.bond_mode}"
+    elif iface.type == InterfaceType.VETH:
+        cmd += f" peer name {iface.peer}"
+    elif iface.type == InterfaceType.VRF:
+        cmd += f" table {iface.route_table_id}"
+    return cmd
+
+
+def _gen_link_set_commands(net_state, iface):
+    cmds = []
+    if iface.mtu:
+        cmds.append(f"link set {iface.name} mtu {iface.mtu}")
+    if iface.mac and iface.original_dict.get(Interface.MAC):
+        cmds.append(f"link set {iface.name} address {iface.mac}")
+    if iface.controller:
+        if iface.controller_type == InterfaceType.BOND:
+            # Kernel only allows enslaving bond port when down
+            cmds.append(f"link set {iface.name} down")
+        cmds.append(f"link set {iface.name} master {iface.controller}")
+    elif _get_cur_controller(net_state, iface.name):
+        cmds.append(f"link set {iface.name} nomaster")
+    cmds.append(f"link set {iface.name} up")
+    return cmds
+
+
+def _get_cur_controller(net_state, iface_name):
+    for iface_info in net_state.current_state.get(Interface.KEY, []):
+        cur_iface = net_state.ifaces.get_cur_iface(
+            iface_info[Interface.NAME], iface_info[Interface.TYPE]
+        )
+        if cur_iface and iface_name in cur_iface.port:
+            return cur_iface.name
+    return None
+
+
+def _gen_address_commands(iface, cur_iface):
+    cmds = []
+    for family in (Interface.IPV4, Interface.IPV6):
+        des_addrs = set()
+        if iface.ip_state(family).is_enabled:
+            des_addrs = _get_addresses(iface, family)
+        cur_addrs = _get_addresses(cur_iface, family) if cur_iface else set()
+        for addr in sorted(cur_addrs - des_addrs):
+            cmds.append(f"address del {addr} dev {iface.name}")
+        for addr in sorted(des_addrs - cur_addrs):
+            cmds.append(f"address replace {addr} dev {iface.name}")
+    return cmds
+
+
+def _get_addresses(iface, family):
+    return set(
+        f"{addr[InterfaceIP.ADDRESS_IP]}/"
+        f"{addr[InterfaceIP.ADDRESS_PREFIX_LENGTH]}"
+        for addr in iface.ip_state(family).addresses
+        if not is_ipv6_link_local_addr(
+            addr[InterfaceIP.ADDRESS_IP],
+            addr[InterfaceIP.ADDRESS_PREFIX_LENGTH],
+        )
+    )
+
+
+def _gen_route_commands(net_state):
+    cur_routes = set(
+        RouteEntry(route)
+        for route in net_state.current_state.get(Route.KEY, {}).get(
+            Route.CONFIG, []
+        )
+    )
+    des_routes = set()
+    for routes in net_state.route.config_iface_routes.values():
+        des_routes.update(routes)
+
+    cmds = []
+    for route in sorted(cur_routes - des_routes):
+        iface = net_state.ifaces.all_kernel_ifaces.get(
+            route.next_hop_interface
+        )
+        # Routes are removed along with deleted interface
+        if iface and not iface.is_absent:
+            cmds.append("route del " + _route_to_ip_args(route))
+    for route in sorted(des_routes - cur_routes):
+        cmds.append(
+            f"route replace {_route_to_ip_args(route)} proto {ROUTE_PROTOCOL}"
+        )
+    return cmds
+
+
+def _route_to_ip_args(route):
+    args = [route.destination]
+    if route.next_hop_address:
+        args.append(f"via {route.next_hop_address}")
+    args.append(f"dev {route.next_hop_interface}")
+    if route.metric not in (None, Route.USE_DEFAULT_METRIC):
+        args.append(f"metric {route.metric}")
+    if route.table_id not in (None, Route.USE_DEFAULT_ROUTE_TABLE):
+        args.append(f"table {route.table_id}")
+    return " ".join(args)
+
+
+def _gen_route_rule_commands(net_state):
+    cur_rules = set(
+        RouteRuleEntry(rule)
+        for rule in net_state.current_state.get(RouteRule.KEY, {}).get(
+            RouteRule.CONFIG, []
+        )
+    )
+    des_rules = net_state.route_rule.config_rules
+
+    cmds = []
+    for rule in sorted(cur_rules, key=_rule_sort_key):
+        if not any(_rule_match(des_rule, rule) for des_rule in des_rules):
+            cmds.append("rule del " + _route_rule_to_ip_args(rule))
+    for rule in sorted(des_rules, key=_rule_sort_key):
+        if not any(_rule_match(rule, cur_rule) for cur_rule in cur_rules):
+            cmds.append("rule add " + _route_rule_to_ip_args(rule))
+    return cmds
+
+
+def _rule_match(des_rule, cur_rule):
+    """
+    Kernel assigns priority for rule added without priority, hence rule
+    with default priority matches any priority.
+    """
+    if des_rule.priority == RouteRule.USE_DEFAULT_PRIORITY:
+        return (des_rule.ip_from, des_rule.ip_to, des_rule.route_table) == (
+            cur_rule.ip_from,
+            cur_rule.ip_to,
+            cur_rule.route_table,
+        )
+    return des_rule == cur_rule
+
+
+def _rule_sort_key(rule):
+    return (rule.priority, rule.route_table, rule.ip_from, rule.ip_to)
+
+
+def _route_rule_to_ip_args(rule):
+    args = []
+    if rule.ip_from:
+        args.append(f"from {rule.ip_from}")
+    if rule.ip_to:
+        args.append(f"to {rule.ip_to}")
+    if rule.priority not in (None, RouteRule.USE_DEFAULT_PRIORITY):
+        args.append(f"priority {rule.priority}")
+    args.append(f"table {rule.route_table}")
+    return " ".join(args)
@@ -0,0 +1,77 @@
+#
+# Copyright (c) 2021 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+from libnmstate.error import NmstateNotSupportedError
+from libnmstate.iplib import KERNEL_MAIN_ROUTE_TABLE_ID
+from libnmstate.schema import Route
+
+from .ip_batch import ROUTE_PROTOCOL
+from .ip_batch import gen_ip_batch_commands
+from .ip_batch import run_ip_batch
+from .plugin import NisporPlugin
+from .route import nispor_route_state_to_nmstate
+
+# Metric assigned by kernel when not defined
+KERNEL_DEFAULT_METRICS = {"ipv4": 0, "ipv6": 1024}
+
+
+class NisporKernelPlugin(NisporPlugin):
+    """
+    Apply memory-only changes directly to kernel without NetworkManager.
+    No checkpoint is supported, hence failed changes cannot be rolled back.
+    """
+
+    @property
+    def name(self):
+        return "kernel"
+
+    def apply_changes(self, net_state, save_to_disk):
+        if save_to_disk:
+            raise NmstateNotSupportedError(
+                "Saving to disk is not supported without NetworkManager, "
+                "please apply the state as memory only"
+            )
+        run_ip_batch(gen_ip_batch_commands(net_state))
+
+    def get_routes(self):
+        np_routes = self._state.routes
+        config_routes = nispor_route_state_to_nmstate(
+            np_rt
+            for np_rt in np_routes
+            if getattr(np_rt, "protocol", None) == ROUTE_PROTOCOL
+        )
+        for route in config_routes:
+            _remove_kernel_default_values(route)
+        return {
+            Route.RUNNING: nispor_route_state_to_nmstate(np_routes),
+            Route.CONFIG: config_routes,
+        }
+
+
+def _remove_kernel_default_values(route):
+    """
+    Route created without table or metric is stored by kernel with the main
+    route table and the default metric, report them as default values.
+    Route explicitly defined with these values is reported the same way.
+    """
+    if route[Route.TABLE_ID] == KERNEL_MAIN_ROUTE_TABLE_ID:
+        route[Route.TABLE_ID] = Route.USE_DEFAULT_ROUTE_TABLE
+    family = "ipv6" if ":" in route[Route.DESTINATION] else "ipv4"
+    if route[Route.METRIC] == KERNEL_DEFAULT_METRICS[family]:
+        route[Route.METRIC] = Route.USE_DEFAULT_METRIC
@@ -0,0 +1,241 @@
+#
+# Copyright (c) 2021 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+import errno
+import logging
+import select
+import socket
+import struct
+import time
+
+NETLINK_ROUTE = 0
+
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV4_ROUTE = 0x40
+RTMGRP_IPV4_RULE = 0x80
+RTMGRP_IPV6_IFADDR = 0x100
+RTMGRP_IPV6_ROUTE = 0x400
+# RTNLGRP_IPV6_RULE is 19, no legacy RTMGRP_ constant defined by kernel
+RTMGRP_IPV6_RULE = 1 << (19 - 1)
+
+RTM_NEWLINK = 16
+RTM_DELLINK = 17
+RTM_NEWADDR = 20
+RTM_DELADDR = 21
+RTM_NEWROUTE = 24
+RTM_DELROUTE = 25
+
+IFLA_IFNAME = 3
+RTA_OIF = 4
+RTA_MULTIPATH = 9
+
+_NLMSG_HDR = struct.Struct("=IHHII")
+_IFINFOMSG_LEN = 16
+# The ifi_index of ifinfomsg and ifa_index of ifaddrmsg are both at offset 4
+_IFINDEX = struct.Struct("=4xi")
+_RTMSG_LEN = 12
+_RTATTR_HDR = struct.Struct("=HH")
+_U32 = struct.Struct("=I")
+# rtnh_len, rtnh_flags, rtnh_hops, rtnh_ifindex
+_RTNEXTHOP = struct.Struct("=HBBi")
+_RECV_BUFFER_SIZE = 65536
+
+
+class NetlinkMonitor:
+    """
+    Listen on rtnetlink multicast groups for link, address, route and route
+    rule changes.
+    """
+
+    def __init__(self):
+        self._socket = socket.socket(
+            socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE
+        )
+        try:
+            self._socket.setblocking(False)
+            self._socket.bind(
+                (
+                    0,
+                    RTMGRP_LINK
+                    | RTMGRP_IPV4_IFADDR
+                    | RTMGRP_IPV4_ROUTE
+                    | RTMGRP_IPV4_RULE
+                    | RTMGRP_IPV6_IFADDR
+                    | RTMGRP_IPV6_ROUTE
+                    | RTMGRP_IPV6_RULE,
+                )
+            )
+        except OSError:
+            self._socket.close()
+            raise
+
+    def close(self):
+        if self._socket:
+            self._socket.close()
+            self._socket = None
+
+    def wait(self, iface_names, timeout):
+        """
+        Block for at most `timeout` seconds till any link, address or route
+        change of specified interfaces or any route rule change is noticed.
+        When `iface_names` is None, any change is noticed.
+        Return True if change noticed.
+        """
+        deadline = time.monotonic() + timeout
+        iface_indexes = None
+        if iface_names is not None:
+            iface_indexes = _get_iface_indexes(iface_names)
+        while True:
+            if self._drain(iface_names, iface_indexes):
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            select.select([self._socket], [], [], remaining)
+
+    def _drain(self, iface_names, iface_indexes):
+        found = False
+        while True:
+            try:
+                data = self._socket.recv(_RECV_BUFFER_SIZE)
+            except BlockingIOError:
+                return found
+            except OSError as e:
+                if e.errno == errno.ENOBUFS:
+                    # Kernel dropped some messages, assume we missed change
+                    logging.debug("Netlink socket buffer overrun")
+                    found = True
+                    continue
+                raise
+            if not found and is_relevant_netlink_data(
+                data, iface_names, iface_indexes
+            ):
+                found = True
+
+
+def is_relevant_netlink_data(data, iface_names, iface_indexes=None):
+    """
+    Return True if any of netlink messages in data is:
+        * a link message of specified interfaces,
+        * an address message of interfaces in `iface_indexes`,
+        * a route message with output interface in `iface_indexes` or
+          without output interface,
+        * a message of other type, for example route rule.
+    The index of link message of specified interfaces is added to the
+    `iface_indexes` set, so interfaces created after the wait started are
+    tracked.
+    When `iface_names` is None, any message is relevant.
+    """
+    if iface_names is None:
+        return bool(data)
+    if iface_indexes is None:
+        iface_indexes = set()
+    offset = 0
+    while offset + _NLMSG_HDR.size <= len(data):
+        msg_len, msg_type, _, _, _ = _NLMSG_HDR.unpack_from(data, offset)
+        if msg_len < _NLMSG_HDR.size:
+            break
+        payload_start = offset + _NLMSG_HDR.size
+        payload_end = offset + msg_len
+        payload = data[payload_start:payload_end]
+        if _is_relevant_netlink_msg(
+            msg_type, payload, iface_names, iface_indexes
+        ):
+            return True
+        offset += _nl_align(msg_len)
+    return False
+
+
+def _is_relevant_netlink_msg(msg_type, payload, iface_names, iface_indexes):
+    if msg_type in (RTM_NEWLINK, RTM_DELLINK):
+        iface_name = _get_link_iface_name(payload)
+        if iface_name is None:
+            return True
+        iface_index = _get_iface_index(payload)
+        if iface_name in iface_names:
+            if iface_index is not None:
+                iface_indexes.add(iface_index)
+            return True
+        # Renamed from specified interface
+        return iface_index in iface_indexes
+    elif msg_type in (RTM_NEWADDR, RTM_DELADDR):
+        iface_index = _get_iface_index(payload)
+        return iface_index is None or iface_index in iface_indexes
+    elif msg_type in (RTM_NEWROUTE, RTM_DELROUTE):
+        oif_indexes = _get_route_oif_indexes(payload)
+        return not oif_indexes or not oif_indexes.isdisjoint(iface_indexes)
+    else:
+        return True
+
+
+def _get_iface_indexes(iface_names):
+    iface_indexes = set()
+    for iface_name in iface_names:
+        try:
+            iface_indexes.add(socket.if_nametoindex(iface_name))
+        except OSError:
+            # Not exist yet or user space only, the index will be learned
+            # from the link message once created.
+            pass
+    return iface_indexes
+
+
+def _get_iface_index(payload):
+    if len(payload) < _IFINDEX.size:
+        return None
+    return _IFINDEX.unpack_from(payload)[0]
+
+
+def _get_link_iface_name(payload):
+    for rta_type, value in _iter_rtattrs(payload, _IFINFOMSG_LEN):
+        if rta_type == IFLA_IFNAME:
+            return value.split(b"\0", 1)[0].decode("utf-8", "replace")
+    return None
+
+
+def _get_route_oif_indexes(payload):
+    oif_indexes = set()
+    for rta_type, value in _iter_rtattrs(payload, _RTMSG_LEN):
+        if rta_type == RTA_OIF and len(value) >= _U32.size:
+            oif_indexes.add(_U32.unpack_from(value)[0])
+        elif rta_type == RTA_MULTIPATH:
+            offset = 0
+            while offset + _RTNEXTHOP.size <= len(value):
+                rtnh_len, _, _, ifindex = _RTNEXTHOP.unpack_from(value, offset)
+                if rtnh_len < _RTNEXTHOP.size:
+                    break
+                oif_indexes.add(ifindex)
+                offset += _nl_align(rtnh_len)
+    return oif_indexes
+
+
+def _iter_rtattrs(payload, offset):
+    while offset + _RTATTR_HDR.size <= len(payload):
+        rta_len, rta_type = _RTATTR_HDR.unpack_from(payload, offset)
+        if rta_len < _RTATTR_HDR.size:
+            break
+        value_start = offset + _RTATTR_HDR.size
+        value_end = offset + rta_len
+        yield rta_type, payload[value_start:value_end]
+        offset += _nl_align(rta_len)
+
+
+def _nl_align(length):
+    return (length + 3) & ~3
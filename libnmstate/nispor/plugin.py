@@ -17,6 +17,9 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 #
 
+import logging
+import time
+
 from nispor import NisporNetState
 
 from libnmstate.plugin import NmstatePlugin
@@ -30,6 +33,7 @@ from .dummy import NisporPluginDummyIface
 from .ethernet import NisporPluginEthernetIface
 from .macvlan import NisporPluginMacVlanIface
 from .macvtap import NisporPluginMacVtapIface
+from .monitor import NetlinkMonitor
 from .veth import NisporPluginVethIface
 from .vlan import NisporPluginVlanIface
 from .vxlan import NisporPluginVxlanIface
@@ -44,6 +48,10 @@ _INFO_TYPE_RUNNING_CONFIG = "running_config"
 
 
 class NisporPlugin(NmstatePlugin):
+    def __init__(self):
+        self._np_state = None
+        self._monitor = None
+
     @property
     def name(self):
         return "nispor"
@@ -54,6 +62,7 @@ class NisporPlugin(NmstatePlugin):
             NmstatePlugin.PLUGIN_CAPABILITY_IFACE,
             NmstatePlugin.PLUGIN_CAPABILITY_ROUTE,
             NmstatePlugin.PLUGIN_CAPABILITY_ROUTE_RULE,
+            NmstatePlugin.PLUGIN_CAPABILITY_CHANGE_NOTIFICATION,
         ]
 
     @property
@@ -63,11 +72,48 @@ class NisporPlugin(NmstatePlugin):
         # yet.
         return NmstatePlugin.DEFAULT_PRIORITY - 1
 
-    def _get_interfaces(self, info_type):
-        np_state = NisporNetState.retrieve()
+    def refresh_content(self):
+        """
+        Retrieve a single kernel snapshot to be shared by get_interfaces(),
+        get_routes() and get_route_rules() till next refresh.
+        """
+        self._np_state = NisporNetState.retrieve()
+
+    def unload(self):
+        self._np_state = None
+        if self._monitor:
+            self._monitor.close()
+            self._monitor = None
+
+    def wait_for_change(self, iface_names, timeout):
+        if self._monitor is None:
+            try:
+                self._monitor = NetlinkMonitor()
+            except OSError as e:
+                logging.debug(f"Failed to listen on rtnetlink: {e}")
+                time.sleep(timeout)
+                return False
+        return self._monitor.wait(iface_names, timeout)
+
+    @property
+    def _state(self):
+        if self._np_state is None:
+            self.refresh_content()
+        return self._np_state
+
+    def _get_interfaces(self, info_type, iface_names=None):
+        np_state = self._state
         ifaces = []
         config_only = info_type == _INFO_TYPE_RUNNING_CONFIG
-        for np_iface in np_state.ifaces.values():
+        if iface_names is None:
+            np_ifaces = np_state.ifaces.values()
+        else:
+            np_ifaces = [
+                np_state.ifaces[iface_name]
+                for iface_name in iface_names
+                if iface_name in np_state.ifaces
+            ]
+        for np_iface in np_ifaces:
             iface_type = np_iface.type
             if iface_type == "dummy":
                 ifaces.append(
@@ -128,15 +174,18 @@ class NisporPlugin(NmstatePlugin):
     def get_interfaces(self):
         return self._get_interfaces(_INFO_TYPE_RUNNING)
 
+    def get_interfaces_by_names(self, iface_names):
+        return self._get_interfaces(_INFO_TYPE_RUNNING, iface_names)
+
     def get_running_config_interfaces(self):
         return self._get_interfaces(_INFO_TYPE_RUNNING_CONFIG)
 
     def get_routes(self):
-        np_state = NisporNetState.retrieve()
+        np_state = self._state
         return {Route.RUNNING: nispor_route_state_to_nmstate(np_state.routes)}
 
     def get_route_rules(self):
-        np_state = NisporNetState.retrieve()
+        np_state = self._state
         return {
             RouteRule.CONFIG: nispor_route_rule_state_to_nmstate(
                 np_state.route_rules
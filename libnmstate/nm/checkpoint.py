@@ -35,23 +35,30 @@ def get_checkpoints(nm_client):
 
 
 class CheckPoint:
-    def __init__(self, nm_context, timeout=60, dbuspath=None):
+    def __init__(self, nm_context, timeout=60, dbuspath=None, nm_devs=None):
         self._ctx = nm_context
         self._timeout = timeout
         self._dbuspath = dbuspath
         self._timeout_source = None
+        self._nm_devs = nm_devs
 
     def __str__(self):
         return self._dbuspath
 
     @staticmethod
-    def create(nm_context, timeout=60):
-        cp = CheckPoint(nm_context=nm_context, timeout=timeout)
+    def create(nm_context, timeout=60, nm_devs=None):
+        """
+        When `nm_devs` is empty or None, all devices are included in the
+        checkpoint.
+        """
+        cp = CheckPoint(
+            nm_context=nm_context, timeout=timeout, nm_devs=nm_devs
+        )
         cp._create()
         return cp
 
     def _create(self):
-        devs = []
+        devs = self._nm_devs or []
         timeout = self._timeout
         cp_flags = (
             NM.CheckpointCreateFlags.DELETE_NEW_CONNECTIONS
@@ -133,11 +140,21 @@ class CheckPoint:
             cp = client.checkpoint_create_finish(result)
             if cp:
                 self._dbuspath = cp.get_path()
-                logging.debug(
-                    "Checkpoint {} created for all devices".format(
-                        self._dbuspath
+                if self._nm_devs:
+                    logging.debug(
+                        f"Checkpoint {self._dbuspath} created for devices: "
+                        + ", ".join(
+                            sorted(
+                                nm_dev.get_iface() for nm_dev in self._nm_devs
+                            )
+                        )
+                    )
+                else:
+                    logging.debug(
+                        "Checkpoint {} created for all devices".format(
+                            self._dbuspath
+                        )
                     )
-                )
                 self._ctx.finish_async("Create checkpoint")
             else:
                 error_msg = (
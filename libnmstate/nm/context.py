@@ -17,8 +17,10 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 #
 
+from contextlib import contextmanager
 import datetime
 import logging
+import time
 
 from libnmstate.error import NmstateInternalError
 from libnmstate.error import NmstateTimeoutError
@@ -41,7 +43,16 @@ FAST_ASYNC_QUEUE_SIZE = 300
 
 
 class NmContext:
-    def __init__(self):
+    def __init__(
+        self,
+        fast_queue_size=FAST_ASYNC_QUEUE_SIZE,
+        slow_queue_size=SLOW_ASYNC_QUEUE_SIZE,
+    ):
+        """
+        The `fast_queue_size` and `slow_queue_size` are the maximum number of
+        in-flight async actions registered with `fast=True` and
+        `fast=False` respectively.
+        """
         self._client = NM.Client.new(cancellable=None)
         self._context = self._client.get_main_context()
         self._quitting = False
@@ -51,7 +62,18 @@ class NmContext:
         self._last_async_finish_time = None
         self._fast_queue = None
         self._slow_queue = None
+        self._async_groups = None
+        self._action_to_async_group = None
+        self._cur_async_group = None
+        self._device_index = None
+        self._device_signal_handlers = []
+        self._fast_queue_size = fast_queue_size
+        self._slow_queue_size = slow_queue_size
+        self._queue_stats = None
+        self._action_start_times = None
+        self._action_timings = None
         self._init_queue()
+        self._init_queue_stats()
         self._init_cancellable()
 
     def _init_client(self):
@@ -61,6 +83,44 @@ class NmContext:
     def _init_queue(self):
         self._fast_queue = set()
         self._slow_queue = set()
+        self._async_groups = {}
+        self._action_to_async_group = {}
+        self._action_start_times = {}
+
+    def _init_queue_stats(self):
+        self._queue_stats = {
+            "fast_queue_peak": 0,
+            "slow_queue_peak": 0,
+            "queue_full_wait_count": 0,
+            "queue_full_wait_time": 0.0,
+        }
+
+    @property
+    def queue_stats(self):
+        """
+        Return a dict of async queue statistics since creation:
+            * fast_queue_peak: maximum in-flight fast actions
+            * slow_queue_peak: maximum in-flight slow actions
+            * queue_full_wait_count: times registration waited for free slot
+            * queue_full_wait_time: seconds spent on waiting for free slot
+        """
+        return dict(self._queue_stats)
+
+    def start_action_timings(self):
+        """
+        Start recording the (action, seconds) of async actions, measured from
+        `register_async()` to `finish_async()`, till `pop_action_timings()`.
+        """
+        self._action_timings = []
+
+    def pop_action_timings(self):
+        """
+        Stop recording and return the list of (action, seconds) for async
+        actions finished since `start_action_timings()`.
+        """
+        timings = self._action_timings or []
+        self._action_timings = None
+        return timings
 
     def _init_cancellable(self):
         self._cancellable = Gio.Cancellable.new()
@@ -83,10 +143,50 @@ class NmContext:
             )
         return self._context
 
+    def get_devices_by_name(self, iface_name):
+        """
+        Return a list of NM.Device with specified interface name.
+        The device index is created on first use and kept up to date by
+        the `device-added` and `device-removed` signals of NM.Client.
+        """
+        if self._device_index is None:
+            self._init_device_index()
+        return list(self._device_index.get(iface_name, []))
+
+    def _init_device_index(self):
+        self._device_index = {}
+        for nm_dev in self._client.get_devices():
+            self._index_device(nm_dev)
+        self._device_signal_handlers = [
+            self._client.connect("device-added", self._on_device_added),
+            self._client.connect("device-removed", self._on_device_removed),
+        ]
+
+    def _index_device(self, nm_dev):
+        self._device_index.setdefault(nm_dev.get_iface(), []).append(nm_dev)
+
+    def _on_device_added(self, _client, nm_dev):
+        self._index_device(nm_dev)
+
+    def _on_device_removed(self, _client, nm_dev):
+        iface_name = nm_dev.get_iface()
+        nm_devs = self._device_index.get(iface_name, [])
+        if nm_dev in nm_devs:
+            nm_devs.remove(nm_dev)
+            if not nm_devs:
+                del self._device_index[iface_name]
+
+    def _del_device_index(self):
+        for handler_id in self._device_signal_handlers:
+            self._client.handler_disconnect(handler_id)
+        self._device_signal_handlers = []
+        self._device_index = None
+
     def clean_up(self):
         if self._cancellable:
             self._cancellable.cancel()
         self._del_timeout()
+        self._del_device_index()
         self._del_client()
         self._context = None
         self._cancellable = None
@@ -126,15 +226,18 @@ class NmContext:
         for example: profile modification.
         """
         queue = self._fast_queue if fast else self._slow_queue
-        max_queue = FAST_ASYNC_QUEUE_SIZE if fast else SLOW_ASYNC_QUEUE_SIZE
+        max_queue = self._fast_queue_size if fast else self._slow_queue_size
         if len(queue) >= max_queue:
             logging.debug(
-                f"Async queue({max_queue}) full, waiting all existing actions "
+                f"Async queue({max_queue}) full, waiting any existing action "
                 "to be finished before registering more async action"
             )
-            # TODO: No need to wait all finish, should continue when the queue
-            #       is considerably empty and ready for new async action.
-            self.wait_all_finish()
+            start_time = time.monotonic()
+            self._wait_till(lambda: len(queue) < max_queue)
+            self._queue_stats["queue_full_wait_count"] += 1
+            self._queue_stats["queue_full_wait_time"] += (
+                time.monotonic() - start_time
+            )
 
         if action in self._fast_queue or action in self._slow_queue:
             raise NmstateInternalError(
@@ -143,6 +246,16 @@ class NmContext:
 
         logging.debug(f"Async action: {action} started")
         queue.add(action)
+        self._action_start_times[action] = time.monotonic()
+        if self._cur_async_group is not None:
+            self._async_groups.setdefault(self._cur_async_group, set()).add(
+                action
+            )
+            self._action_to_async_group[action] = self._cur_async_group
+        peak_key = "fast_queue_peak" if fast else "slow_queue_peak"
+        self._queue_stats[peak_key] = max(
+            self._queue_stats[peak_key], len(queue)
+        )
 
     def finish_async(self, action, suppress_log=False):
         """
@@ -153,6 +266,56 @@ class NmContext:
             logging.debug(f"Async action: {action} finished")
         self._fast_queue.discard(action)
         self._slow_queue.discard(action)
+        start_time = self._action_start_times.pop(action, None)
+        if start_time is not None and self._action_timings is not None:
+            self._action_timings.append(
+                (action, time.monotonic() - start_time)
+            )
+        group = self._action_to_async_group.pop(action, None)
+        if group is not None:
+            group_actions = self._async_groups[group]
+            group_actions.discard(action)
+            if not group_actions:
+                del self._async_groups[group]
+
+    @contextmanager
+    def async_group(self, group):
+        """
+        Tag all async actions registered within this context with the
+        hashable `group`, so caller could wait on them via
+        `wait_any_async_group_finish()`.
+        """
+        parent_group = self._cur_async_group
+        self._cur_async_group = group
+        try:
+            yield
+        finally:
+            self._cur_async_group = parent_group
+
+    def get_async_group(self, action):
+        """
+        Return the group of specified registered action or None.
+        """
+        return self._action_to_async_group.get(action)
+
+    def is_async_group_finished(self, group):
+        return group not in self._async_groups
+
+    def wait_any_async_group_finish(self, groups):
+        """
+        Block till any of specified groups has all its async actions finished
+        or anyone failed by `fail()`.
+        Return the set of finished groups.
+        """
+        if groups:
+            self._wait_till(
+                lambda: any(
+                    self.is_async_group_finished(group) for group in groups
+                )
+            )
+        return set(
+            group for group in groups if self.is_async_group_finished(group)
+        )
 
     def _action_all_finished(self):
         return not (len(self._fast_queue) or len(self._slow_queue))
@@ -184,23 +347,45 @@ class NmContext:
             self._del_timeout()
             self._error = exception
 
+    def dispatch_pending_events(self):
+        """
+        Process the pending events of NM.Client without blocking, so the
+        NM.Client object cache reflects changes happened since last
+        iteration of main context.
+        """
+        while self.context.iteration(False):
+            pass
+
     def wait_all_finish(self):
         """
         Block till all async actions been marked as finished via
         `finish_async()` or anyone failed by `fail()`.
         """
+        self._wait_till(self._action_all_finished)
+
+    def _wait_till(self, condition):
+        """
+        Block till condition() is True or any action failed by `fail()`.
+        """
         self._last_async_finish_time = datetime.datetime.now()
-        if not self._action_all_finished():
-            self._timeout_source = GLib.timeout_source_new(
-                IDLE_CHECK_INTERNAL * 1000
-            )
-            user_data = None
-            self._timeout_source.set_callback(self._idle_timeout_cb, user_data)
-            self._timeout_source.attach(self._context)
+        if not condition():
+            # Might be nested in another wait, only the outermost one
+            # manages the idle checker.
+            own_timeout_source = self._timeout_source is None
+            if own_timeout_source:
+                self._timeout_source = GLib.timeout_source_new(
+                    IDLE_CHECK_INTERNAL * 1000
+                )
+                user_data = None
+                self._timeout_source.set_callback(
+                    self._idle_timeout_cb, user_data
+                )
+                self._timeout_source.attach(self._context)
 
-            while not self._action_all_finished() and not self._error:
+            while not condition() and not self._error:
                 self.context.iteration(True)
-            self._del_timeout()
+            if own_timeout_source:
+                self._del_timeout()
 
         if self._error:
             # The queue and error should be flush and perpare for another run
@@ -22,6 +22,7 @@ import logging
 from libnmstate.error import NmstateLibnmError
 from libnmstate.schema import InterfaceType
 
+from .common import GLib
 from .common import NM
 from .macvlan import is_macvtap
 from .translator import Nm2Api
@@ -84,8 +85,7 @@ class DeviceReapply:
                 f"{self._iface_type}: error={e}, "
                 "Fallback to device activation"
             )
-            self._ctx.finish_async(action, suppress_log=True)
-            self._profile_activation.run()
+            self._fallback_to_activation(action)
             return
 
         if success:
@@ -96,7 +96,13 @@ class DeviceReapply:
                 f"iface={self._iface_name}, type={self._iface_type} "
                 "error='None returned from reapply_finish()'"
             )
-            self._ctx.finish_async(action, suppress_log=True)
+            self._fallback_to_activation(action)
+
+    def _fallback_to_activation(self, action):
+        # The activation is part of the same async group as the reapply
+        group = self._ctx.get_async_group(action)
+        self._ctx.finish_async(action, suppress_log=True)
+        with self._ctx.async_group(group):
             self._profile_activation.run()
 
 
@@ -145,6 +151,13 @@ def list_devices(client):
     return client.get_devices()
 
 
+def list_devices_by_names(ctx, iface_names):
+    nm_devs = []
+    for iface_name in iface_names:
+        nm_devs.extend(ctx.get_devices_by_name(iface_name))
+    return nm_devs
+
+
 def get_device_common_info(dev):
     return {
         "name": dev.get_iface(),
@@ -191,10 +204,56 @@ def get_nm_dev(ctx, iface_name, iface_type):
     kernel interface, it could be OVS bridge or OVS port where name
     can duplicate with kernel interface name.
     """
-    for nm_dev in ctx.client.get_devices():
-        cur_iface_type = get_iface_type(nm_dev)
-        if nm_dev.get_iface() == iface_name and (
-            iface_type is None or cur_iface_type == iface_type
-        ):
+    for nm_dev in ctx.get_devices_by_name(iface_name):
+        if iface_type is None or get_iface_type(nm_dev) == iface_type:
             return nm_dev
     return None
+
+
+def wait_for_device_change(ctx, iface_names, timeout):
+    """
+    Iterate the main context till state of any NM.Device or its
+    NM.ActiveConnection of specified interfaces changed, or till `timeout`
+    seconds passed.
+    Return True if change noticed.
+    """
+    is_changed = []
+    is_timeout = []
+    handlers = []
+
+    def _on_change(*_args):
+        is_changed.append(1)
+
+    def _on_device_added_or_removed(_client, nm_dev):
+        if nm_dev.get_iface() in iface_names:
+            is_changed.append(1)
+
+    def _watch(obj, signal, callback):
+        handlers.append((obj, obj.connect(signal, callback)))
+
+    _watch(ctx.client, "device-added", _on_device_added_or_removed)
+    _watch(ctx.client, "device-removed", _on_device_added_or_removed)
+    for nm_dev in list_devices_by_names(ctx, iface_names):
+        for signal in (
+            "state-changed",
+            "notify::active-connection",
+            "notify::ip4-config",
+            "notify::ip6-config",
+        ):
+            _watch(nm_dev, signal, _on_change)
+        nm_ac = nm_dev.get_active_connection()
+        if nm_ac:
+            _watch(nm_ac, "state-changed", _on_change)
+            _watch(nm_ac, "notify::state-flags", _on_change)
+
+    timeout_source = GLib.timeout_source_new(int(timeout * 1000))
+    try:
+        timeout_source.set_callback(lambda x: is_timeout.append(1))
+        timeout_source.attach(ctx.context)
+        while not is_changed and not is_timeout:
+            ctx.context.iteration(True)
+    finally:
+        timeout_source.destroy()
+        for obj, handler_id in handlers:
+            obj.handler_disconnect(handler_id)
+    return bool(is_changed)
@@ -0,0 +1,83 @@
+#
+# Copyright (c) 2021 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+from .common import GLib
+from .common import NM
+
+_CLIENT_SIGNALS = (
+    "device-removed",
+    "connection-removed",
+    "active-connection-added",
+    "active-connection-removed",
+    # DNS changes of profiles, DHCP or global DNS configuration
+    "notify::dns-configuration",
+)
+
+
+class NmChangeMonitor:
+    """
+    Invoke `callback()` on any change of NetworkManager devices, profiles,
+    active connections or DNS configuration.
+    The `run()` blocks till `stop()` is called, hence should be invoked in
+    a dedicated thread. It uses its own main context and NM.Client, so it
+    does not interfere with NmContext used by other threads.
+    """
+
+    def __init__(self, callback):
+        self._callback = callback
+        self._context = GLib.MainContext.new()
+        self._stopped = False
+
+    def run(self):
+        self._context.push_thread_default()
+        try:
+            client = NM.Client.new(cancellable=None)
+            client.connect("device-added", self._on_device_added)
+            client.connect("connection-added", self._on_profile_added)
+            for signal in _CLIENT_SIGNALS:
+                client.connect(signal, self._on_change)
+            for nm_dev in client.get_devices():
+                self._watch_device(nm_dev)
+            for nm_profile in client.get_connections():
+                self._watch_profile(nm_profile)
+            while not self._stopped:
+                self._context.iteration(True)
+        finally:
+            self._context.pop_thread_default()
+
+    def stop(self):
+        self._stopped = True
+        self._context.wakeup()
+
+    def _on_device_added(self, _client, nm_dev):
+        self._watch_device(nm_dev)
+        self._callback()
+
+    def _on_profile_added(self, _client, nm_profile):
+        self._watch_profile(nm_profile)
+        self._callback()
+
+    def _watch_device(self, nm_dev):
+        nm_dev.connect("state-changed", self._on_change)
+
+    def _watch_profile(self, nm_profile):
+        nm_profile.connect("changed", self._on_change)
+
+    def _on_change(self, *_args):
+        self._callback()
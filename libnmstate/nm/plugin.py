@@ -24,23 +24,37 @@ from libnmstate.error import NmstateDependencyError
 from libnmstate.error import NmstateValueError
 from libnmstate.ifaces.ovs import is_ovs_running
 from libnmstate.schema import DNS
+from libnmstate.schema import Ethernet
+from libnmstate.schema import InfiniBand
 from libnmstate.schema import Interface
 from libnmstate.schema import InterfaceType
 from libnmstate.schema import LLDP
+from libnmstate.schema import OVSBridge
+from libnmstate.schema import OVSInterface
+from libnmstate.schema import OvsDB
 from libnmstate.schema import Route
+from libnmstate.schema import Team
 from libnmstate.plugin import NmstatePlugin
 
 
 from .checkpoint import CheckPoint
 from .checkpoint import get_checkpoints
 from .common import NM
+from .context import FAST_ASYNC_QUEUE_SIZE
+from .context import SLOW_ASYNC_QUEUE_SIZE
 from .context import NmContext
 from .device import get_device_common_info
+from .device import get_iface_type
 from .device import list_devices
+from .device import list_devices_by_names
+from .device import wait_for_device_change
+from .dns import get_dns_config_iface_names
 from .dns import get_running as get_dns_running
 from .dns import get_running_config as get_dns_running_config
 from .infiniband import get_info as get_infiniband_info
+from .ipv4 import acs_and_ip_profiles as acs_and_ip4_profiles
 from .ipv4 import get_info as get_ipv4_info
+from .ipv6 import acs_and_ip_profiles as acs_and_ip6_profiles
 from .ipv6 import get_info as get_ipv6_info
 from .lldp import get_info as get_lldp_info
 from .macvlan import get_current_macvlan_type
@@ -58,13 +72,36 @@ from .user import get_info as get_user_info
 from .veth import get_current_veth_type
 from .wired import get_info as get_wired_info
 
+# Interface properties whose collectors require the applied configs
+APPLIED_CONFIG_PROPERTIES = frozenset(
+    [
+        Interface.IPV4,
+        Interface.IPV6,
+        InfiniBand.CONFIG_SUBTREE,
+        OvsDB.OVS_DB_SUBTREE,
+    ]
+)
+
 
 class NetworkManagerPlugin(NmstatePlugin):
-    def __init__(self):
-        self._ctx = NmContext()
+    def __init__(
+        self,
+        fast_queue_size=FAST_ASYNC_QUEUE_SIZE,
+        slow_queue_size=SLOW_ASYNC_QUEUE_SIZE,
+    ):
+        """
+        The `fast_queue_size` and `slow_queue_size` limit the in-flight async
+        actions of NmContext. libnmstate sets them from the
+        NMSTATE_NM_FAST_QUEUE_SIZE and NMSTATE_NM_SLOW_QUEUE_SIZE system
+        environments when defined.
+        """
+        self._ctx = NmContext(
+            fast_queue_size=fast_queue_size, slow_queue_size=slow_queue_size
+        )
         self._checkpoint = None
         self._check_version_mismatch()
         self.__applied_configs = None
+        self.__scoped_applied_configs = None
 
     @property
     def priority(self):
@@ -85,6 +122,24 @@ class NetworkManagerPlugin(NmstatePlugin):
             self.__applied_configs = get_all_applied_configs(self.context)
         return self.__applied_configs
 
+    def _get_applied_configs(self, iface_names):
+        iface_names = frozenset(iface_names)
+        if self.__applied_configs is not None:
+            return {
+                iface_name: nm_profile
+                for iface_name, nm_profile in self.__applied_configs.items()
+                if iface_name in iface_names
+            }
+        if (
+            self.__scoped_applied_configs is None
+            or self.__scoped_applied_configs[0] != iface_names
+        ):
+            self.__scoped_applied_configs = (
+                iface_names,
+                get_all_applied_configs(self.context, iface_names),
+            )
+        return self.__scoped_applied_configs[1]
+
     @property
     def checkpoint(self):
         return self._checkpoint
@@ -113,17 +168,48 @@ class NetworkManagerPlugin(NmstatePlugin):
             NmstatePlugin.PLUGIN_CAPABILITY_ROUTE,
             NmstatePlugin.PLUGIN_CAPABILITY_ROUTE_RULE,
             NmstatePlugin.PLUGIN_CAPABILITY_DNS,
+            NmstatePlugin.PLUGIN_CAPABILITY_CHANGE_NOTIFICATION,
         ]
 
+    def wait_for_change(self, iface_names, timeout):
+        return wait_for_device_change(self.context, iface_names, timeout)
+
     def get_interfaces(self):
+        return self._get_interfaces()
+
+    def get_interfaces_by_names(self, iface_names):
+        return self._get_interfaces(iface_names)
+
+    def get_interfaces_with_properties(self, properties, iface_names=None):
+        return self._get_interfaces(iface_names, properties)
+
+    def _get_interfaces(self, iface_names=None, properties=None):
+        """
+        When `properties` is not None, skip the collectors of other
+        properties, including the retrieval of applied configs when no
+        requested property depends on it.
+        """
         info = []
 
-        applied_configs = self._applied_configs
+        def _is_requested(key):
+            return properties is None or key in properties
+
+        use_applied_configs = (
+            properties is None
+            or not APPLIED_CONFIG_PROPERTIES.isdisjoint(properties)
+        )
+        if not use_applied_configs:
+            applied_configs = {}
+        elif iface_names is None:
+            applied_configs = self._applied_configs
+        else:
+            applied_configs = self._get_applied_configs(iface_names)
 
-        devices_info = [
-            (dev, get_device_common_info(dev))
-            for dev in list_devices(self.client)
-        ]
+        if iface_names is None:
+            nm_devs = list_devices(self.client)
+        else:
+            nm_devs = list_devices_by_names(self.context, iface_names)
+        devices_info = [(dev, get_device_common_info(dev)) for dev in nm_devs]
 
         for dev, devinfo in devices_info:
             if not dev.get_managed():
@@ -134,25 +220,42 @@ class NetworkManagerPlugin(NmstatePlugin):
             applied_config = applied_configs.get(iface_info[Interface.NAME])
 
             act_con = dev.get_active_connection()
-            iface_info[Interface.IPV4] = get_ipv4_info(act_con, applied_config)
-            iface_info[Interface.IPV6] = get_ipv6_info(act_con, applied_config)
-            iface_info.update(get_wired_info(dev))
-            iface_info.update(get_user_info(self.context, dev))
-            iface_info.update(get_lldp_info(self.client, dev))
-            iface_info.update(get_team_info(dev))
-            iface_info.update(get_infiniband_info(applied_config))
-            iface_info.update(get_current_macvlan_type(applied_config))
-            iface_info.update(get_current_veth_type(applied_config))
+            if _is_requested(Interface.IPV4):
+                iface_info[Interface.IPV4] = get_ipv4_info(
+                    act_con, applied_config
+                )
+            if _is_requested(Interface.IPV6):
+                iface_info[Interface.IPV6] = get_ipv6_info(
+                    act_con, applied_config
+                )
+            if _is_requested(Ethernet.CONFIG_SUBTREE):
+                iface_info.update(get_wired_info(dev))
+            if _is_requested(Interface.DESCRIPTION):
+                iface_info.update(get_user_info(self.context, dev))
+            if _is_requested(LLDP.CONFIG_SUBTREE):
+                iface_info.update(get_lldp_info(self.client, dev))
+            if _is_requested(Team.CONFIG_SUBTREE):
+                iface_info.update(get_team_info(dev))
+            if _is_requested(InfiniBand.CONFIG_SUBTREE):
+                iface_info.update(get_infiniband_info(applied_config))
+            if use_applied_configs:
+                iface_info.update(get_current_macvlan_type(applied_config))
+                iface_info.update(get_current_veth_type(applied_config))
+            else:
+                # Detect MAC VTAP and veth from the profile instead
+                iface_info[Interface.TYPE] = get_iface_type(dev)
 
             if iface_info[Interface.TYPE] == InterfaceType.OVS_BRIDGE:
-                iface_info.update(get_ovs_bridge_info(dev))
+                if _is_requested(OVSBridge.CONFIG_SUBTREE):
+                    iface_info.update(get_ovs_bridge_info(dev))
                 iface_info = _remove_ovs_bridge_unsupported_entries(iface_info)
             elif iface_info[Interface.TYPE] == InterfaceType.OVS_INTERFACE:
-                iface_info.update(get_ovs_interface_info(act_con))
+                if _is_requested(OVSInterface.PATCH_CONFIG_SUBTREE):
+                    iface_info.update(get_ovs_interface_info(act_con))
             elif iface_info[Interface.TYPE] == InterfaceType.OVS_PORT:
                 continue
 
-            if applied_config:
+            if applied_config and _is_requested(OvsDB.OVS_DB_SUBTREE):
                 iface_info.update(get_ovsdb_external_ids(applied_config))
 
             info.append(iface_info)
@@ -174,6 +277,13 @@ class NetworkManagerPlugin(NmstatePlugin):
     def get_routes(self):
         return {Route.CONFIG: get_route_running_config(self._applied_configs)}
 
+    def get_routes_by_ifaces(self, iface_names):
+        return {
+            Route.CONFIG: get_route_running_config(
+                self._get_applied_configs(iface_names)
+            )
+        }
+
     def get_route_rules(self):
         """
         Nispor will provide running config of route rule from kernel.
@@ -187,10 +297,29 @@ class NetworkManagerPlugin(NmstatePlugin):
         }
 
     def refresh_content(self):
+        self.context.dispatch_pending_events()
         self.__applied_configs = None
+        self.__scoped_applied_configs = None
 
     def apply_changes(self, net_state, save_to_disk):
         NmProfiles(self.context).apply_config(net_state, save_to_disk)
+        logging.debug(
+            f"NetworkManager async queue stats: {self.context.queue_stats}"
+        )
+
+    def start_action_timings(self):
+        if self._ctx:
+            self._ctx.start_action_timings()
+
+    def pop_action_timings(self):
+        if self._ctx is None:
+            return []
+        return self._ctx.pop_action_timings()
+
+    def has_pending_changes(self, net_state, save_to_disk):
+        return NmProfiles(self.context).has_pending_changes(
+            net_state, save_to_disk
+        )
 
     def _load_checkpoint(self, checkpoint_path):
         if checkpoint_path:
@@ -216,8 +345,16 @@ class NetworkManagerPlugin(NmstatePlugin):
                 else:
                     raise NmstateValueError("No checkpoint specified or found")
 
-    def create_checkpoint(self, timeout=60):
-        self._checkpoint = CheckPoint.create(self._ctx, timeout)
+    def create_checkpoint(self, timeout=60, iface_names=None):
+        nm_devs = None
+        if iface_names is not None:
+            nm_devs = _get_checkpoint_devices(self._ctx, iface_names)
+            if not nm_devs:
+                logging.debug(
+                    "None of the affected interfaces exists, "
+                    "fallback to checkpoint all devices"
+                )
+        self._checkpoint = CheckPoint.create(self._ctx, timeout, nm_devs)
         return str(self._checkpoint)
 
     def rollback_checkpoint(self, checkpoint=None):
@@ -249,6 +386,28 @@ class NetworkManagerPlugin(NmstatePlugin):
             )
 
 
+def _get_checkpoint_devices(context, iface_names):
+    """
+    Return NM.Device of specified interfaces, the interfaces currently
+    holding DNS configuration and the OVS ports of OVS bridges.
+    """
+    iface_names = set(iface_names)
+    iface_names.update(
+        get_dns_config_iface_names(
+            acs_and_ip4_profiles(context.client),
+            acs_and_ip6_profiles(context.client),
+        )
+    )
+    nm_devs = {}
+    for iface_name in iface_names:
+        for nm_dev in context.get_devices_by_name(iface_name):
+            nm_devs[nm_dev.get_path()] = nm_dev
+            if nm_dev.get_device_type() == NM.DeviceType.OVS_BRIDGE:
+                for nm_port_dev in nm_dev.get_slaves():
+                    nm_devs[nm_port_dev.get_path()] = nm_port_dev
+    return list(nm_devs.values())
+
+
 def _remove_ovs_bridge_unsupported_entries(iface_info):
     """
     OVS bridges are not supporting several common interface key entries.
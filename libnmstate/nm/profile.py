@@ -27,6 +27,7 @@ import time
 from libnmstate.error import NmstateInternalError
 from libnmstate.error import NmstateLibnmError
 from libnmstate.error import NmstateNotSupportedError
+from libnmstate.error import NmstateValueError
 from libnmstate.schema import Interface
 from libnmstate.schema import InterfaceType
 
@@ -51,6 +52,97 @@ IMPORT_NM_DEV_RETRY_INTERNAL = 0.5
 FALLBACK_CHECKER_INTERNAL = 15
 
 
+def has_pending_change(iface):
+    return (iface.is_changed or iface.is_desired) and not iface.is_ignore
+
+
+class NmProfilePlaceholder:
+    """
+    Stand-in of NmProfile for interface without pending change, only used
+    by other profiles to refer it as controller or parent.
+    The UUID of current profile is retrieved on first use.
+    """
+
+    def __init__(self, ctx, iface):
+        self._ctx = ctx
+        self._iface = iface
+        self._uuid = None
+
+    @property
+    def iface(self):
+        return self._iface
+
+    @property
+    def has_pending_change(self):
+        return False
+
+    @property
+    def uuid(self):
+        if self._uuid is None:
+            nm_dev = get_nm_dev(self._ctx, self._iface.name, self._iface.type)
+            nm_ac = nm_dev.get_active_connection() if nm_dev else None
+            nm_profile = nm_ac.get_connection() if nm_ac else None
+            self._uuid = nm_profile.get_uuid() if nm_profile else ""
+        return self._uuid
+
+
+class NmKeyfileProfile:
+    """
+    NM.SimpleConnection generated from interface without querying
+    NetworkManager daemon, only used for generating keyfile.
+    """
+
+    KEYFILE_SUFFIX = ".nmconnection"
+
+    def __init__(self, iface):
+        if Api2Nm.get_iface_type(iface.type) == InterfaceType.UNKNOWN:
+            raise NmstateValueError(
+                f"Interface {iface.name} type {iface.type} is not supported "
+                "by NetworkManager for generating keyfile"
+            )
+        self._iface = iface
+        self._nm_simple_conn = create_new_nm_simple_conn(iface, None)
+
+    @property
+    def iface(self):
+        return self._iface
+
+    @property
+    def uuid(self):
+        return self._nm_simple_conn.get_uuid()
+
+    @property
+    def file_name(self):
+        return self._nm_simple_conn.get_id() + NmKeyfileProfile.KEYFILE_SUFFIX
+
+    def update_controller(self, controller):
+        nm_simple_conn_update_controller(self._nm_simple_conn, controller)
+
+    def update_parent(self, parent):
+        nm_simple_conn_update_parent(
+            self._nm_simple_conn, self.iface.type, parent
+        )
+
+    def to_keyfile(self):
+        if not hasattr(NM, "keyfile_write"):
+            raise NmstateNotSupportedError(
+                "NetworkManager 1.30 or later is required for generating "
+                "keyfile"
+            )
+        try:
+            self._nm_simple_conn.normalize()
+            key_file = NM.keyfile_write(
+                self._nm_simple_conn, NM.KeyfileHandlerFlags.NONE, None, None
+            )
+            data, _ = key_file.to_data()
+        except GLib.Error as e:
+            raise NmstateLibnmError(
+                f"Failed to generate keyfile for interface {self.iface.name} "
+                f"type {self.iface.type}: {e}"
+            )
+        return data
+
+
 class NmProfile:
     # For unmanged iface and desired to down
     ACTION_ACTIVATE_FIRST = "activate_first"
@@ -114,9 +206,7 @@ class NmProfile:
 
     @property
     def has_pending_change(self):
-        return (
-            self.iface.is_changed or self.iface.is_desired
-        ) and not self.iface.is_ignore
+        return has_pending_change(self.iface)
 
     @property
     def uuid(self):
@@ -236,7 +326,7 @@ class NmProfile:
             cur_nm_profile = self._get_first_nm_profile()
             if (
                 cur_nm_profile
-                and _is_memory_only(cur_nm_profile) != self._save_to_disk
+                and is_memory_only(cur_nm_profile) != self._save_to_disk
             ):
                 self._nm_profile = cur_nm_profile
                 self._nm_simple_conn = cur_nm_profile
@@ -261,7 +351,7 @@ class NmProfile:
             cur_nm_profile = self._get_first_nm_profile()
             if (
                 cur_nm_profile
-                and _is_memory_only(cur_nm_profile) != self._save_to_disk
+                and is_memory_only(cur_nm_profile) != self._save_to_disk
             ):
                 self._nm_profile = cur_nm_profile
                 return
@@ -724,7 +814,7 @@ class ProfileDelete:
         return GLib.SOURCE_REMOVE
 
 
-def _is_memory_only(nm_profile):
+def is_memory_only(nm_profile):
     if nm_profile:
         profile_flags = nm_profile.get_flags()
         return (
@@ -20,6 +20,8 @@
 # This file is targeting:
 #   * Actions required the knownldege of multiple NmProfile
 
+from collections import defaultdict
+from itertools import chain
 import logging
 
 from libnmstate.schema import InterfaceType
@@ -27,13 +29,18 @@ from libnmstate.schema import InterfaceType
 from .common import NM
 from .device import is_externally_managed
 from .device import list_devices
+from .device import list_devices_by_names
 from .device import get_nm_dev
 from .dns import get_dns_config_iface_names
 from .ipv4 import acs_and_ip_profiles as acs_and_ip4_profiles
 from .ipv6 import acs_and_ip_profiles as acs_and_ip6_profiles
 from .ovs import create_iface_for_nm_ovs_port
+from .profile import NmKeyfileProfile
 from .profile import NmProfile
+from .profile import NmProfilePlaceholder
 from .profile import ProfileDelete
+from .profile import has_pending_change
+from .profile import is_memory_only
 from .veth import create_iface_for_nm_veth_peer
 from .veth import is_nm_veth_supported
 
@@ -44,12 +51,15 @@ class NmProfiles:
 
     def apply_config(self, net_state, save_to_disk):
         self._prepare_state_for_profiles(net_state)
-        all_profiles = [
-            NmProfile(self._ctx, iface, save_to_disk)
-            for iface in net_state.ifaces.all_ifaces()
-        ]
+        all_profiles = []
+        placeholders = []
+        for iface in net_state.ifaces.all_ifaces():
+            if has_pending_change(iface):
+                all_profiles.append(NmProfile(self._ctx, iface, save_to_disk))
+            else:
+                placeholders.append(NmProfilePlaceholder(self._ctx, iface))
 
-        _use_uuid_as_controller_and_parent(all_profiles)
+        _use_uuid_as_controller_and_parent(all_profiles, placeholders)
 
         changed_ovs_bridges_and_ifaces = {}
         for profile in all_profiles:
@@ -65,11 +75,15 @@ class NmProfiles:
                 profile.save_config()
         self._ctx.wait_all_finish()
 
-        for action in NmProfile.ACTIONS:
-            for profile in all_profiles:
-                if profile.has_action(action):
-                    profile.do_action(action)
-            self._ctx.wait_all_finish()
+        action_graph = _gen_action_graph(all_profiles)
+        if action_graph is None:
+            logging.debug(
+                "Dependency loop found in NmProfile actions, "
+                "fallback to run actions in global order"
+            )
+            _do_actions_in_global_order(self._ctx, all_profiles)
+        else:
+            _do_actions_by_graph(self._ctx, action_graph)
 
         if save_to_disk:
             for profile in all_profiles:
@@ -80,6 +94,35 @@ class NmProfiles:
                 self._ctx, changed_ovs_bridges_and_ifaces, net_state
             )
 
+    def has_pending_changes(self, net_state, save_to_disk):
+        """
+        Return True if any desired interface is not activated by a profile
+        matching `save_to_disk` or still activated while desired as down or
+        absent.
+        """
+        for iface in net_state.ifaces.all_ifaces():
+            if not has_pending_change(iface):
+                continue
+            nm_dev = get_nm_dev(self._ctx, iface.name, iface.type)
+            nm_ac = nm_dev.get_active_connection() if nm_dev else None
+            if iface.is_up:
+                if (
+                    nm_ac is None
+                    or not nm_dev.get_managed()
+                    or is_externally_managed(nm_dev)
+                    or bool(is_memory_only(nm_ac.get_connection()))
+                    == save_to_disk
+                ):
+                    return True
+            elif nm_ac:
+                return True
+            elif iface.is_absent and any(
+                nm_profile.get_interface_name() == iface.name
+                for nm_profile in self._ctx.client.get_connections()
+            ):
+                return True
+        return False
+
     def _prepare_state_for_profiles(self, net_state):
         _preapply_dns_fix_for_profiles(self._ctx, net_state)
         _mark_nm_external_subordinate_changed(self._ctx, net_state)
@@ -89,6 +132,35 @@ class NmProfiles:
         _create_veth_iface_for_missing_peers(net_state)
 
 
+def generate_keyfiles(net_state):
+    """
+    Return a list of `[file_name, file_content]` of NetworkManager keyfiles
+    for interfaces desired as up, the NetworkManager daemon is not required.
+    """
+    _append_nm_ovs_port_iface(net_state)
+    _create_veth_iface_for_missing_peers(net_state)
+    nm_profiles = [
+        NmKeyfileProfile(iface)
+        for iface in net_state.ifaces.all_ifaces()
+        if iface.is_up and has_pending_change(iface)
+    ]
+    _use_uuid_as_controller_and_parent(nm_profiles, [])
+
+    keyfiles = []
+    file_names = set()
+    for nm_profile in nm_profiles:
+        file_name = nm_profile.file_name
+        if file_name in file_names:
+            # OVS bridge and OVS internal interface could share the same name
+            file_name = (
+                f"{nm_profile.iface.name}-{nm_profile.iface.type}"
+                f"{NmKeyfileProfile.KEYFILE_SUFFIX}"
+            )
+        file_names.add(file_name)
+        keyfiles.append([file_name, nm_profile.to_keyfile()])
+    return keyfiles
+
+
 def _append_nm_ovs_port_iface(net_state):
     """
     In NM OVS, each OVS internal/system/ interface should be
@@ -111,9 +183,17 @@ def _append_nm_ovs_port_iface(net_state):
     net_state.ifaces.add_ifaces(nm_ovs_port_ifaces.values())
 
 
-def get_all_applied_configs(context):
+def get_all_applied_configs(context, iface_names=None):
+    """
+    When `iface_names` is not None, only retrieve applied configs of
+    specified interfaces.
+    """
     applied_configs = {}
-    for nm_dev in list_devices(context.client):
+    if iface_names is None:
+        nm_devs = list_devices(context.client)
+    else:
+        nm_devs = list_devices_by_names(context, iface_names)
+    for nm_dev in nm_devs:
         if (
             nm_dev.get_state()
             in (
@@ -323,16 +403,20 @@ def _delete_orphan_nm_ovs_port_profiles(
     context.wait_all_finish()
 
 
-def _use_uuid_as_controller_and_parent(nm_profiles):
-    iface_to_uuid = {}
-    kernel_iface_to_uuid = {}
+def _use_uuid_as_controller_and_parent(nm_profiles, placeholders):
+    """
+    The `placeholders` are only used for UUID lookup, their UUID is only
+    retrieved when referred by any profile in `nm_profiles`.
+    """
+    iface_to_profile = {}
+    kernel_iface_to_profile = {}
 
-    for nm_profile in nm_profiles:
-        iface_to_uuid[
+    for nm_profile in chain(placeholders, nm_profiles):
+        iface_to_profile[
             f"{nm_profile.iface.name}/{nm_profile.iface.type}"
-        ] = nm_profile.uuid
+        ] = nm_profile
         if not nm_profile.iface.is_user_space_only:
-            kernel_iface_to_uuid[nm_profile.iface.name] = nm_profile.uuid
+            kernel_iface_to_profile[nm_profile.iface.name] = nm_profile
 
     for nm_profile in nm_profiles:
         iface = nm_profile.iface
@@ -343,15 +427,15 @@ def _use_uuid_as_controller_and_parent(nm_profiles):
             and (iface.is_changed or iface.is_desired)
             and not iface.is_ignore
         ):
-            uuid = iface_to_uuid.get(
+            controller_profile = iface_to_profile.get(
                 f"{iface.controller}/{iface.controller_type}"
             )
-            if uuid:
-                nm_profile.update_controller(uuid)
+            if controller_profile and controller_profile.uuid:
+                nm_profile.update_controller(controller_profile.uuid)
         if iface.need_parent:
-            uuid = kernel_iface_to_uuid.get(iface.parent)
-            if uuid:
-                nm_profile.update_parent(uuid)
+            parent_profile = kernel_iface_to_profile.get(iface.parent)
+            if parent_profile and parent_profile.uuid:
+                nm_profile.update_parent(parent_profile.uuid)
 
 
 def _nm_ovs_port_has_child(nm_profile, ovs_bridge_iface, net_state):
@@ -366,3 +450,164 @@ def _nm_ovs_port_has_child(nm_profile, ovs_bridge_iface, net_state):
         ):
             return True
     return False
+
+
+# Actions activating the profile
+_ACTIVATION_ACTIONS = (
+    NmProfile.ACTION_TOP_MASTER,
+    NmProfile.ACTION_NEW_IFACES,
+    NmProfile.ACTION_OTHER_MASTER,
+    NmProfile.ACTION_NEW_OVS_PORT,
+    NmProfile.ACTION_NEW_OVS_IFACE,
+    NmProfile.ACTION_NEW_VETH,
+    NmProfile.ACTION_NEW_VETH_PEER,
+    NmProfile.ACTION_MODIFIED,
+    NmProfile.ACTION_NEW_VLAN,
+    NmProfile.ACTION_NEW_VXLAN,
+)
+
+# Actions deactivating or removing the profile
+_TEARDOWN_ACTIONS = (
+    NmProfile.ACTION_DEACTIVATE,
+    NmProfile.ACTION_DELETE_PROFILE,
+    NmProfile.ACTION_DELETE_DEVICE,
+)
+
+# Placeholder node finished once all activation actions finished
+_ACTIVATION_BARRIER = (None, "activation_barrier")
+
+
+def _do_actions_in_global_order(context, all_profiles):
+    for action in NmProfile.ACTIONS:
+        for profile in all_profiles:
+            if profile.has_action(action):
+                profile.do_action(action)
+        context.wait_all_finish()
+
+
+def _gen_action_graph(all_profiles):
+    """
+    Return a dict with (NmProfile, action) as key and the set of
+    (NmProfile, action) it depends on as value:
+        * Actions of the same profile follow the order of
+          `NmProfile.ACTIONS`.
+        * Activation waits for the activation of its controller, its
+          parent and, for veth peer, the veth interface creating it.
+        * Deactivation and deletion wait for all activations, so does the
+          global order.
+    Return None if dependency loop found.
+    """
+    profiles_by_name = defaultdict(list)
+    profiles_by_name_type = {}
+    for profile in all_profiles:
+        profiles_by_name[profile.iface.name].append(profile)
+        profiles_by_name_type[
+            f"{profile.iface.name}/{profile.iface.type}"
+        ] = profile
+
+    action_graph = {}
+    last_setup_nodes = {}
+    for profile in all_profiles:
+        pre_node = None
+        for action in NmProfile.ACTIONS:
+            if not profile.has_action(action):
+                continue
+            node = (profile, action)
+            action_graph[node] = set([pre_node]) if pre_node else set()
+            if action not in _TEARDOWN_ACTIONS:
+                last_setup_nodes[profile] = node
+            pre_node = node
+
+    activation_nodes = set()
+    for node, dep_nodes in action_graph.items():
+        profile, action = node
+        if action in _ACTIVATION_ACTIONS:
+            activation_nodes.add(node)
+            for dep_profile in _get_activation_dependencies(
+                profile, profiles_by_name, profiles_by_name_type
+            ):
+                dep_node = last_setup_nodes.get(dep_profile)
+                if dep_node and dep_profile is not profile:
+                    dep_nodes.add(dep_node)
+        elif action in _TEARDOWN_ACTIONS:
+            dep_nodes.add(_ACTIVATION_BARRIER)
+    action_graph[_ACTIVATION_BARRIER] = activation_nodes
+
+    if _has_dependency_loop(action_graph):
+        return None
+    return action_graph
+
+
+def _get_activation_dependencies(
+    profile, profiles_by_name, profiles_by_name_type
+):
+    iface = profile.iface
+    dep_profiles = []
+    if iface.controller:
+        controller_profile = profiles_by_name_type.get(
+            f"{iface.controller}/{iface.controller_type}"
+        )
+        if controller_profile:
+            dep_profiles.append(controller_profile)
+    if iface.parent:
+        dep_profiles.extend(profiles_by_name.get(iface.parent, []))
+    if profile.has_action(NmProfile.ACTION_NEW_VETH_PEER):
+        dep_profiles.extend(profiles_by_name.get(iface.peer, []))
+    return dep_profiles
+
+
+def _gen_dependents(action_graph):
+    """
+    Return the dict of node to the list of nodes depending on it and
+    the dict of node to the count of its unfinished dependencies.
+    """
+    dependents = defaultdict(list)
+    dep_counts = {}
+    for node, dep_nodes in action_graph.items():
+        dep_counts[node] = len(dep_nodes)
+        for dep_node in dep_nodes:
+            dependents[dep_node].append(node)
+    return dependents, dep_counts
+
+
+def _has_dependency_loop(action_graph):
+    dependents, dep_counts = _gen_dependents(action_graph)
+
+    ready_nodes = [node for node, count in dep_counts.items() if not count]
+    resolved_count = 0
+    while ready_nodes:
+        node = ready_nodes.pop()
+        resolved_count += 1
+        for dependent in dependents[node]:
+            dep_counts[dependent] -= 1
+            if not dep_counts[dependent]:
+                ready_nodes.append(dependent)
+    return resolved_count != len(action_graph)
+
+
+def _do_actions_by_graph(context, action_graph):
+    """
+    Start each action as soon as all the actions it depends on finished.
+    """
+    dependents, dep_counts = _gen_dependents(action_graph)
+
+    # Preserve the insertion order for predictable action order
+    ready_nodes = [node for node, count in dep_counts.items() if not count]
+    running_nodes = set()
+    while ready_nodes or running_nodes:
+        for node in ready_nodes:
+            profile, action = node
+            if profile:
+                with context.async_group(node):
+                    profile.do_action(action)
+            running_nodes.add(node)
+        ready_nodes = []
+
+        finished_nodes = context.wait_any_async_group_finish(running_nodes)
+        for node in finished_nodes:
+            running_nodes.remove(node)
+            for dependent in dependents[node]:
+                dep_counts[dependent] -= 1
+                if not dep_counts[dependent]:
+                    ready_nodes.append(dependent)
+    context.wait_all_finish()
@@ -34,6 +34,8 @@ from libnmstate.schema import InterfaceType
 from libnmstate.schema import Route
 from libnmstate.schema import RouteRule
 
+from .ifaces.ovs import ovs_running_cache
+from .nispor.kernel_plugin import NisporKernelPlugin
 from .nispor.plugin import NisporPlugin
 from .plugin import NmstatePlugin
 from .state import merge_dict
@@ -41,50 +43,118 @@ from .state import merge_dict
 _INFO_TYPE_RUNNING = 1
 _INFO_TYPE_RUNNING_CONFIG = 2
 
+# System environments overriding the maximum number of in-flight async
+# actions of NetworkManager plugin
+NM_FAST_QUEUE_SIZE_ENV = "NMSTATE_NM_FAST_QUEUE_SIZE"
+NM_SLOW_QUEUE_SIZE_ENV = "NMSTATE_NM_SLOW_QUEUE_SIZE"
+
 
 @contextmanager
-def plugin_context():
-    plugins = _load_plugins()
+def plugin_context(kernel_only=False, memory_only=False):
+    plugins = load_plugins(kernel_only, memory_only)
     try:
-        # Lowest priority plugin should perform actions first.
-        plugins.sort(key=attrgetter("priority"))
-        yield plugins
-    except (Exception, KeyboardInterrupt):
-        for plugin in plugins:
-            if plugin.checkpoint:
-                try:
-                    plugin.rollback_checkpoint()
-                # Don't complex thing by raise exception when handling another
-                # exception, just log the rollback failure.
-                except Exception as e:
-                    logging.error(f"Rollback failed with error {e}")
-        raise
+        with plugins_action_context(plugins):
+            yield plugins
     finally:
-        for plugin in plugins:
-            plugin.unload()
+        unload_plugins(plugins)
+
+
+def load_plugins(kernel_only=False, memory_only=False):
+    """
+    Return the loaded plugins sorted by priority.
+    When `kernel_only` is True, only load the plugin applying memory-only
+    changes directly to kernel.
+    When `memory_only` is True and the NetworkManager plugin cannot be
+    loaded, the plugin applying changes directly to kernel is loaded instead
+    of the nispor plugin.
+    """
+    plugins = _load_plugins(kernel_only, memory_only)
+    # Lowest priority plugin should perform actions first.
+    plugins.sort(key=attrgetter("priority"))
+    return plugins
+
+
+def unload_plugins(plugins):
+    for plugin in plugins:
+        plugin.unload()
+
+
+@contextmanager
+def plugins_action_context(plugins):
+    """
+    Wrap a single show/apply/commit/rollback action on loaded plugins:
+        * Probe the OVS running state once per action.
+        * Rollback the pending checkpoints on failure.
+    """
+    with ovs_running_cache():
+        try:
+            yield plugins
+        except (Exception, KeyboardInterrupt):
+            for plugin in plugins:
+                if plugin.checkpoint:
+                    try:
+                        plugin.rollback_checkpoint()
+                    # Don't complex thing by raise exception when handling
+                    # another exception, just log the rollback failure.
+                    except Exception as e:
+                        logging.error(f"Rollback failed with error {e}")
+            raise
 
 
 def show_with_plugins(
-    plugins, include_status_data=None, info_type=_INFO_TYPE_RUNNING
+    plugins,
+    include_status_data=None,
+    info_type=_INFO_TYPE_RUNNING,
+    iface_names=None,
+    route_tables=None,
+    include_dns=True,
+    fields=None,
 ):
+    """
+    When `iface_names` is not None, only report interfaces and routes of
+    specified interfaces.
+    When `route_tables` is not None, only report route rules of specified
+    route tables.
+    When `fields` is not None, only report the specified subtrees, check
+    `libnmstate.show()` for detail.
+    """
+    field_tree = None if fields is None else _gen_field_tree(fields)
+    iface_properties = None
+    if field_tree and field_tree.get(Interface.KEY):
+        iface_properties = set(field_tree[Interface.KEY])
+
+    def _is_requested(key):
+        return field_tree is None or key in field_tree
+
     for plugin in plugins:
         plugin.refresh_content()
     report = {}
-    if include_status_data and info_type == _INFO_TYPE_RUNNING:
+    if (
+        include_status_data
+        and info_type == _INFO_TYPE_RUNNING
+        and _is_requested("capabilities")
+    ):
         report["capabilities"] = plugins_capabilities(plugins)
 
-    report[Interface.KEY] = _get_interface_info_from_plugins(
-        plugins, info_type
-    )
+    if _is_requested(Interface.KEY):
+        report[Interface.KEY] = _get_interface_info_from_plugins(
+            plugins, info_type, iface_names, iface_properties
+        )
 
-    report[Route.KEY] = _get_routes_from_plugins(plugins, info_type)
+    if _is_requested(Route.KEY):
+        report[Route.KEY] = _get_routes_from_plugins(
+            plugins, info_type, iface_names
+        )
 
-    report[RouteRule.KEY] = _get_route_rules_from_plugins(plugins)
+    if _is_requested(RouteRule.KEY):
+        report[RouteRule.KEY] = _get_route_rules_from_plugins(
+            plugins, route_tables
+        )
 
     dns_plugin = _find_plugin_for_capability(
         plugins, NmstatePlugin.PLUGIN_CAPABILITY_DNS
     )
-    if dns_plugin:
+    if dns_plugin and include_dns and _is_requested(DNS.KEY):
         report[DNS.KEY] = dns_plugin.get_dns_client_config()
         if info_type != _INFO_TYPE_RUNNING:
             report[DNS.KEY].pop(DNS.RUNNING, None)
@@ -92,10 +162,65 @@ def show_with_plugins(
     for plugin in plugins:
         report.update(plugin.get_global_state())
 
+    if field_tree is not None:
+        report = _project_state(report, field_tree)
+
     validator.schema_validate(report)
     return report
 
 
+def _gen_field_tree(fields):
+    """
+    Convert list of dot separated paths like `interfaces.ipv4` into nested
+    dict like `{"interfaces": {"ipv4": {}}}`, empty dict means the whole
+    subtree is requested.
+    The interface name and type are always included to identify interfaces.
+    """
+    if isinstance(fields, str):
+        raise NmstateValueError(
+            f"Invalid fields {fields}: should be a list of strings"
+        )
+    field_tree = {}
+    for field in fields:
+        if not isinstance(field, str) or not all(field.split(".")):
+            raise NmstateValueError(
+                f"Invalid field {field}: should be dot separated property "
+                "names like 'interfaces.ipv4'"
+            )
+        node = field_tree
+        keys = field.split(".")
+        for index, key in enumerate(keys):
+            if key in node and not node[key]:
+                # Whole subtree is already requested
+                break
+            if index == len(keys) - 1:
+                node[key] = {}
+            else:
+                node = node.setdefault(key, {})
+    if field_tree.get(Interface.KEY):
+        for key in (Interface.NAME, Interface.TYPE):
+            field_tree[Interface.KEY][key] = {}
+    return field_tree
+
+
+def _project_state(state, field_tree):
+    """
+    Return the `state` only holding the subtrees defined in `field_tree`.
+    The list items are projected individually.
+    """
+    if not field_tree:
+        return state
+    if isinstance(state, list):
+        return [_project_state(item, field_tree) for item in state]
+    if isinstance(state, dict):
+        return {
+            key: _project_state(value, field_tree[key])
+            for key, value in state.items()
+            if key in field_tree
+        }
+    return state
+
+
 def plugins_capabilities(plugins):
     capabilities = set()
     for plugin in plugins:
@@ -103,10 +228,17 @@ def plugins_capabilities(plugins):
     return list(capabilities)
 
 
-def _load_plugins():
-    plugins = [NisporPlugin()]
+def _load_plugins(kernel_only, memory_only):
+    if kernel_only:
+        return [NisporKernelPlugin()]
+    nm_plugins = _load_nm_plugin()
+    if memory_only and not nm_plugins:
+        logging.info("Applying memory-only changes directly to kernel")
+        plugins = [NisporKernelPlugin()]
+    else:
+        plugins = [NisporPlugin()]
     plugins.extend(_load_external_py_plugins())
-    plugins.extend(_load_nm_plugin())
+    plugins.extend(nm_plugins)
     return plugins
 
 
@@ -114,15 +246,38 @@ def _load_nm_plugin():
     """
     Makin NetworkManager plugin as optional
     """
+    queue_sizes = {}
+    for arg_name, env_name in (
+        ("fast_queue_size", NM_FAST_QUEUE_SIZE_ENV),
+        ("slow_queue_size", NM_SLOW_QUEUE_SIZE_ENV),
+    ):
+        queue_size = _get_positive_int_env(env_name)
+        if queue_size is not None:
+            queue_sizes[arg_name] = queue_size
     try:
         from libnmstate.nm import NetworkManagerPlugin
 
-        return [NetworkManagerPlugin()]
+        return [NetworkManagerPlugin(**queue_sizes)]
     except Exception as e:
         logging.warning(f"Failed to load NetworkManager plugin: {e}")
         return []
 
 
+def _get_positive_int_env(env_name):
+    value = os.environ.get(env_name)
+    if not value:
+        return None
+    try:
+        int_value = int(value)
+    except ValueError:
+        int_value = 0
+    if int_value <= 0:
+        raise NmstateValueError(
+            f"Invalid {env_name}={value}, should be a positive integer"
+        )
+    return int_value
+
+
 def _load_external_py_plugins():
     """
     Load module from folder defined in system evironment NMSTATE_PLUGIN_DIR,
@@ -163,7 +318,13 @@ def _find_plugin_for_capability(plugins, capability):
     return chose_plugin
 
 
-def _get_interface_info_from_plugins(plugins, info_type):
+def _get_interface_info_from_plugins(
+    plugins, info_type, iface_names=None, iface_properties=None
+):
+    """
+    When `iface_properties` is not None, plugins are only required to report
+    the specified interface properties.
+    """
     all_ifaces = {}
     IFACE_PRIORITY_METADATA = "_plugin_priority"
     IFACE_PLUGIN_SRC_METADATA = "_plugin_source"
@@ -175,6 +336,12 @@ def _get_interface_info_from_plugins(plugins, info_type):
             continue
         if info_type == _INFO_TYPE_RUNNING_CONFIG:
             ifaces = plugin.get_running_config_interfaces()
+        elif iface_properties is not None:
+            ifaces = plugin.get_interfaces_with_properties(
+                iface_properties, iface_names
+            )
+        elif iface_names is not None:
+            ifaces = plugin.get_interfaces_by_names(iface_names)
         else:
             ifaces = plugin.get_interfaces()
         for iface in ifaces:
@@ -260,16 +427,23 @@ def _get_interface_info_from_plugins(plugins, info_type):
     return sorted(all_ifaces.values(), key=itemgetter(Interface.NAME))
 
 
-def create_checkpoints(plugins, timeout):
+def create_checkpoints(plugins, timeout, iface_names=None):
     """
     Return a string containing all the check point created by each plugin in
     the format:
         plugin.name|<checkpoing_path>|plugin.name|<checkpoing_path|...
 
+    When `iface_names` is not None, plugins are asked to only include the
+    specified interfaces in their checkpoints.
     """
     checkpoints = []
     for plugin in plugins:
-        checkpoint = plugin.create_checkpoint(timeout)
+        if iface_names is None:
+            checkpoint = plugin.create_checkpoint(timeout)
+        else:
+            checkpoint = plugin.create_checkpoint(
+                timeout, iface_names=iface_names
+            )
         if checkpoint:
             checkpoints.append(f"{plugin.name}|{checkpoint}")
     return "|".join(checkpoints)
@@ -323,11 +497,14 @@ def _parse_checkpoints(checkpoints):
         checkpoint_index[plugin_name] = checkpoint
 
 
-def _get_routes_from_plugins(plugins, info_type):
+def _get_routes_from_plugins(plugins, info_type, iface_names=None):
     ret = {Route.RUNNING: [], Route.CONFIG: []}
     for plugin in plugins:
         if NmstatePlugin.PLUGIN_CAPABILITY_ROUTE in plugin.plugin_capabilities:
-            plugin_routes = plugin.get_routes()
+            if iface_names is None:
+                plugin_routes = plugin.get_routes()
+            else:
+                plugin_routes = plugin.get_routes_by_ifaces(iface_names)
             if info_type == _INFO_TYPE_RUNNING:
                 ret[Route.RUNNING].extend(plugin_routes.get(Route.RUNNING, []))
             ret[Route.CONFIG].extend(plugin_routes.get(Route.CONFIG, []))
@@ -336,14 +513,19 @@ def _get_routes_from_plugins(plugins, info_type):
     return ret
 
 
-def _get_route_rules_from_plugins(plugins):
+def _get_route_rules_from_plugins(plugins, route_tables=None):
     ret = {RouteRule.CONFIG: []}
     for plugin in plugins:
         if (
             NmstatePlugin.PLUGIN_CAPABILITY_ROUTE_RULE
             in plugin.plugin_capabilities
         ):
-            plugin_route_rules = plugin.get_route_rules()
+            if route_tables is None:
+                plugin_route_rules = plugin.get_route_rules()
+            else:
+                plugin_route_rules = plugin.get_route_rules_by_tables(
+                    route_tables
+                )
             ret[RouteRule.CONFIG].extend(
                 plugin_route_rules.get(RouteRule.CONFIG, [])
             )
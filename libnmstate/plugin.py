@@ -22,6 +22,10 @@ from abc import abstractproperty
 from abc import abstractmethod
 
 from .error import NmstatePluginError
+from .iplib import KERNEL_MAIN_ROUTE_TABLE_ID
+from .schema import Interface
+from .schema import Route
+from .schema import RouteRule
 
 
 class NmstatePlugin(metaclass=ABCMeta):
@@ -32,6 +36,7 @@ class NmstatePlugin(metaclass=ABCMeta):
     PLUGIN_CAPABILITY_ROUTE = "route"
     PLUGIN_CAPABILITY_ROUTE_RULE = "route_rule"
     PLUGIN_CAPABILITY_DNS = "dns"
+    PLUGIN_CAPABILITY_CHANGE_NOTIFICATION = "change_notification"
 
     DEFAULT_PRIORITY = 10
 
@@ -62,6 +67,29 @@ class NmstatePlugin(metaclass=ABCMeta):
             f"Plugin {self.name} BUG: get_interfaces() not implemented"
         )
 
+    def get_interfaces_by_names(self, iface_names):
+        """
+        Return the same as get_interfaces() but only for interfaces with
+        specified names.
+        Plugin may override this to skip querying other interfaces.
+        """
+        return [
+            iface
+            for iface in self.get_interfaces()
+            if iface[Interface.NAME] in iface_names
+        ]
+
+    def get_interfaces_with_properties(self, properties, iface_names=None):
+        """
+        Return the same as get_interfaces(), or get_interfaces_by_names()
+        when `iface_names` is not None, but the interfaces are only required
+        to hold the specified top level properties besides name and type.
+        Plugin may override this to skip collecting other properties.
+        """
+        if iface_names is None:
+            return self.get_interfaces()
+        return self.get_interfaces_by_names(iface_names)
+
     def get_running_config_interfaces(self):
         """
         Return a list of dict with network interface running configuration.
@@ -74,6 +102,14 @@ class NmstatePlugin(metaclass=ABCMeta):
     def apply_changes(self, net_state, save_to_disk):
         pass
 
+    def has_pending_changes(self, net_state, save_to_disk):
+        """
+        Return True if plugin still has work to do for `apply_changes()`
+        even the desired state already matches the current state, for
+        example, the configuration is not persisted yet.
+        """
+        return False
+
     @property
     def capabilities(self):
         return []
@@ -82,7 +118,11 @@ class NmstatePlugin(metaclass=ABCMeta):
     def plugin_capabilities(self):
         pass
 
-    def create_checkpoint(self, timeout):
+    def create_checkpoint(self, timeout, iface_names=None):
+        """
+        When `iface_names` is not None, plugin may only include these
+        interfaces in the checkpoint.
+        """
         return None
 
     def rollback_checkpoint(self, checkpoint=None):
@@ -101,11 +141,64 @@ class NmstatePlugin(metaclass=ABCMeta):
             f"Plugin {self.name} BUG: get_route_rules() not implemented"
         )
 
+    def get_routes_by_ifaces(self, iface_names):
+        """
+        Return the same as get_routes() but only for routes with next hop
+        interface in specified names.
+        Plugin may override this to skip querying other routes.
+        """
+        return {
+            key: [
+                route
+                for route in routes
+                if route.get(Route.NEXT_HOP_INTERFACE) in iface_names
+            ]
+            for key, routes in self.get_routes().items()
+        }
+
+    def get_route_rules_by_tables(self, route_tables):
+        """
+        Return the same as get_route_rules() but only for route rules of
+        specified route tables.
+        Plugin may override this to skip querying other route rules.
+        """
+        return {
+            key: [
+                rule
+                for rule in rules
+                if rule.get(RouteRule.ROUTE_TABLE, KERNEL_MAIN_ROUTE_TABLE_ID)
+                in route_tables
+            ]
+            for key, rules in self.get_route_rules().items()
+        }
+
     def get_dns_client_config(self):
         raise NmstatePluginError(
             f"Plugin {self.name} BUG: get_dns_client_config() not implemented"
         )
 
+    def wait_for_change(self, iface_names, timeout):
+        """
+        Block for at most `timeout` seconds till a change related to any of
+        the specified interfaces is noticed.
+        Return True when change noticed, False on timeout.
+        Only invoked on plugin with PLUGIN_CAPABILITY_CHANGE_NOTIFICATION.
+        """
+        return False
+
+    def start_action_timings(self):
+        """
+        Start recording the timings of plugin internal actions.
+        """
+        pass
+
+    def pop_action_timings(self):
+        """
+        Stop recording and return the list of (action, seconds) for plugin
+        internal actions finished since `start_action_timings()`.
+        """
+        return []
+
     def get_global_state(self):
         """
         Allowing plugin to append global information to content of
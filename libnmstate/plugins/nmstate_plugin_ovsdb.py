@@ -206,28 +206,26 @@ class NmstateOvsdbPlugin(NmstatePlugin):
                 continue
             if not iface.is_up:
                 continue
+            iface_info = iface.to_dict_view()
             if iface.type == OVSBridge.TYPE:
                 table_name = "Bridge"
-            elif OvsDB.OVS_DB_SUBTREE in iface.to_dict():
+            elif OvsDB.OVS_DB_SUBTREE in iface_info:
                 table_name = "Interface"
             else:
                 continue
             ids_after_nm_applied = cur_iface_to_ext_ids.get(iface.name, {})
-            ids_before_nm_applied = (
-                iface.to_dict()
-                .get(OvsDB.OVS_DB_SUBTREE, {})
-                .get(OvsDB.EXTERNAL_IDS, {})
-            )
+            ids_before_nm_applied = iface_info.get(
+                OvsDB.OVS_DB_SUBTREE, {}
+            ).get(OvsDB.EXTERNAL_IDS, {})
             original_desire_ids = iface.original_dict.get(
                 OvsDB.OVS_DB_SUBTREE, {}
             ).get(OvsDB.EXTERNAL_IDS)
 
-            desire_ids = []
-
+            # Copy as NetworkManager external ID might be added below
             if original_desire_ids is None:
-                desire_ids = ids_before_nm_applied
+                desire_ids = dict(ids_before_nm_applied)
             else:
-                desire_ids = original_desire_ids
+                desire_ids = dict(original_desire_ids)
 
             # should include external_id created by NetworkManager.
             if NM_EXTERNAL_ID in ids_after_nm_applied:
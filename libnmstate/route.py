@@ -21,6 +21,7 @@ from collections import defaultdict
 
 from libnmstate.error import NmstateValueError
 from libnmstate.error import NmstateVerificationError
+from libnmstate.iplib import KERNEL_MAIN_ROUTE_TABLE_ID
 from libnmstate.iplib import is_ipv6_address
 from libnmstate.iplib import canonicalize_ip_network
 from libnmstate.iplib import canonicalize_ip_address
@@ -249,11 +250,35 @@ class RouteState:
             return {}
         return self._routes
 
-    def verify(self, cur_route_state):
+    def route_tables_of_ifaces(self, iface_names):
+        """
+        Return IDs of route tables used by desired or current routes of
+        specified interfaces.
+        """
+        route_tables = set()
+        for iface_name in iface_names:
+            for routes in (
+                self._routes.get(iface_name, set()),
+                self._cur_routes.get(iface_name, set()),
+            ):
+                for route in routes:
+                    if route.table_id == Route.USE_DEFAULT_ROUTE_TABLE:
+                        route_tables.add(KERNEL_MAIN_ROUTE_TABLE_ID)
+                    else:
+                        route_tables.add(route.table_id)
+        return route_tables
+
+    def verify(self, cur_route_state, iface_names=None):
+        """
+        When `iface_names` is not None, only verify routes of specified
+        interfaces.
+        """
         current = RouteState(
             ifaces=None, des_route_state=None, cur_route_state=cur_route_state
         )
         for iface_name, route_set in self._routes.items():
+            if iface_names is not None and iface_name not in iface_names:
+                continue
             routes_info = [r.to_dict() for r in sorted(route_set)]
             cur_routes_info = [
                 r.to_dict()
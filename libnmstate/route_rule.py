@@ -18,6 +18,7 @@
 #
 
 from collections import defaultdict
+from itertools import chain
 import logging
 
 from libnmstate.error import NmstateVerificationError
@@ -122,6 +123,13 @@ class RouteRuleState:
     def _config(self):
         return _get_config(self._rules)
 
+    @property
+    def config_rules(self):
+        """
+        Return all the route rules after merging desired state into current.
+        """
+        return set(chain.from_iterable(self._rules.values()))
+
     def _merge_rules(self, des_rule_state, route_state):
         """
         Handle absent rules before adding desired rule entries to make sure
@@ -152,13 +160,32 @@ class RouteRuleState:
             if new_rules != rule_set:
                 self._rules[route_table] = new_rules
 
-    def verify(self, cur_rule_state):
+    def route_tables_to_verify(self, route_state, iface_names):
+        """
+        Return IDs of route tables required by verify(): route tables with
+        rules changed and route tables used by routes of specified interfaces.
+        """
+        route_tables = set(
+            route_table
+            for route_table, rules in self._rules.items()
+            if rules != self._cur_rules.get(route_table, set())
+        )
+        route_tables.update(route_state.route_tables_of_ifaces(iface_names))
+        return route_tables
+
+    def verify(self, cur_rule_state, route_tables=None):
+        """
+        When `route_tables` is not None, only verify route rules of specified
+        route tables.
+        """
         current = RouteRuleState(
             route_state=None,
             des_rule_state=None,
             cur_rule_state=cur_rule_state,
         )
         for route_table, rules in self._rules.items():
+            if route_tables is not None and route_table not in route_tables:
+                continue
             rule_info = [
                 _remove_route_rule_default_values(r.to_dict())
                 for r in sorted(rules)
@@ -216,15 +243,12 @@ class RouteRuleState:
                     return route.next_hop_interface
 
         for iface in ifaces.values():
-            autotable_ipv4 = (
-                iface.to_dict()
-                .get(Interface.IPV4, {})
-                .get(InterfaceIP.AUTO_ROUTE_TABLE_ID)
+            iface_info = iface.to_dict_view()
+            autotable_ipv4 = iface_info.get(Interface.IPV4, {}).get(
+                InterfaceIP.AUTO_ROUTE_TABLE_ID
             )
-            autotable_ipv6 = (
-                iface.to_dict()
-                .get(Interface.IPV6, {})
-                .get(InterfaceIP.AUTO_ROUTE_TABLE_ID)
+            autotable_ipv6 = iface_info.get(Interface.IPV6, {}).get(
+                InterfaceIP.AUTO_ROUTE_TABLE_ID
             )
             if autotable_ipv4 == route_table or autotable_ipv6 == route_table:
                 return iface.name
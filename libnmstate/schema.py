@@ -17,20 +17,73 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 #
 
+import functools
+import json
+import sys
 import warnings
+import zlib
 
 import pkgutil
-import yaml
+
+PRECOMPILED_CHECKSUM = "yaml-crc32"
+PRECOMPILED_SCHEMA = "schema"
 
 
 def load(schema_name):
-    return yaml.load(
-        pkgutil.get_data("libnmstate", "schemas/" + schema_name + ".yaml"),
-        Loader=yaml.SafeLoader,
+    """
+    Return the schema parsed from `schemas/<schema_name>.yaml`. The
+    `schemas/<schema_name>.json` generated at build time by `precompile()` is
+    used instead when it was generated from the same YAML.
+    """
+    content = pkgutil.get_data("libnmstate", f"schemas/{schema_name}.yaml")
+    try:
+        precompiled = json.loads(
+            pkgutil.get_data("libnmstate", f"schemas/{schema_name}.json")
+        )
+    except (OSError, ValueError):
+        precompiled = {}
+    if precompiled.get(PRECOMPILED_CHECKSUM) == zlib.crc32(content):
+        return precompiled[PRECOMPILED_SCHEMA]
+
+    import yaml
+
+    return yaml.load(content, Loader=yaml.SafeLoader)
+
+
+def precompile(yaml_content):
+    """
+    Return the JSON string holding the schema parsed from `yaml_content` and
+    the checksum of `yaml_content` for `load()` to detect stale JSON.
+    """
+    import yaml
+
+    return json.dumps(
+        {
+            PRECOMPILED_CHECKSUM: zlib.crc32(yaml_content),
+            PRECOMPILED_SCHEMA: yaml.load(
+                yaml_content, Loader=yaml.SafeLoader
+            ),
+        }
     )
 
 
-ifaces_schema = load("operational-state")
+@functools.lru_cache(maxsize=None)
+def get_ifaces_schema():
+    """
+    Return the JSON schema of network state, parsed on first use.
+    """
+    return load("operational-state")
+
+
+def __getattr__(name):
+    if name == "ifaces_schema":
+        return get_ifaces_schema()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+if sys.version_info < (3, 7):
+    # Module level __getattr__() (PEP 562) requires Python 3.7+
+    ifaces_schema = get_ifaces_schema()
 
 
 class Interface:
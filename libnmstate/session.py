@@ -0,0 +1,130 @@
+#
+# Copyright (c) 2021 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+from libnmstate.error import NmstateValueError
+
+from .netapplier import apply_with_plugins
+from .nmstate import destroy_checkpoints
+from .nmstate import load_plugins
+from .nmstate import plugins_action_context
+from .nmstate import rollback_checkpoints
+from .nmstate import show_running_config_with_plugins
+from .nmstate import show_with_plugins
+from .nmstate import unload_plugins
+
+
+class NmstateSession:
+    """
+    Long-lived session keeping the plugins loaded between calls, so
+    repeated show/apply calls reuse the NetworkManager client and OVS
+    database connection instead of setting them up each time.
+    The plugins refresh their content incrementally on each call.
+
+    Close the session via `close()` or use it as context manager:
+
+        with NmstateSession() as session:
+            session.show()
+
+    With `kernel_only=True`, the session applies memory-only changes directly
+    to kernel without NetworkManager.
+    """
+
+    def __init__(self, *, kernel_only=False):
+        self._kernel_only = kernel_only
+        self._plugins = load_plugins(kernel_only)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if self._plugins is not None:
+            unload_plugins(self._plugins)
+            self._plugins = None
+
+    @property
+    def is_closed(self):
+        return self._plugins is None
+
+    def show(self, *, include_status_data=False, fields=None):
+        """
+        Same as `libnmstate.show()`.
+        """
+        with self._action_context() as plugins:
+            return show_with_plugins(
+                plugins, include_status_data, fields=fields
+            )
+
+    def show_running_config(self):
+        """
+        Same as `libnmstate.show_running_config()`.
+        """
+        with self._action_context() as plugins:
+            return show_running_config_with_plugins(plugins)
+
+    def apply(
+        self,
+        desired_state,
+        *,
+        verify_change=True,
+        commit=True,
+        rollback_timeout=60,
+        save_to_disk=True,
+        scoped_checkpoint=False,
+        timings_callback=None,
+    ):
+        """
+        Same as `libnmstate.apply()`.
+        """
+        if self._kernel_only and save_to_disk:
+            raise NmstateValueError(
+                "Applying directly to kernel requires save_to_disk=False"
+            )
+        with self._action_context() as plugins:
+            return apply_with_plugins(
+                plugins,
+                desired_state,
+                verify_change=verify_change,
+                commit=commit,
+                rollback_timeout=rollback_timeout,
+                save_to_disk=save_to_disk,
+                scoped_checkpoint=scoped_checkpoint,
+                timings_callback=timings_callback,
+            )
+
+    def commit(self, *, checkpoint=None):
+        """
+        Same as `libnmstate.commit()`.
+        """
+        with self._action_context() as plugins:
+            destroy_checkpoints(plugins, checkpoint)
+
+    def rollback(self, *, checkpoint=None):
+        """
+        Same as `libnmstate.rollback()`.
+        """
+        with self._action_context() as plugins:
+            rollback_checkpoints(plugins, checkpoint)
+
+    def _action_context(self):
+        if self.is_closed:
+            raise NmstateValueError("The NmstateSession is already closed")
+        return plugins_action_context(self._plugins)
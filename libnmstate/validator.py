@@ -17,7 +17,6 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 #
 
-import copy
 import logging
 
 import jsonschema as js
@@ -33,13 +32,53 @@ from .plugin import NmstatePlugin
 MAX_SUPPORTED_INTERFACES = 1000
 
 
-def schema_validate(data, validation_schema=schema.ifaces_schema):
-    data = copy.deepcopy(data)
+# Indexed by id() of schema, storing (schema, validator) to make sure the
+# schema is not garbage collected and its id() reused.
+_VALIDATORS = {}
+
+
+def schema_validate(data, validation_schema=None):
+    if validation_schema is None:
+        validation_schema = schema.get_ifaces_schema()
     _validate_max_supported_intface_count(data)
-    for ifstate in data.get(schema.Interface.KEY, ()):
+    data = _complement_unknown_iface_type(data)
+    validator = _get_validator(validation_schema)
+    error = js.exceptions.best_match(validator.iter_errors(data))
+    if error is not None:
+        raise error
+
+
+def _get_validator(validation_schema):
+    """
+    Check the schema and create the validator only once per schema.
+    """
+    cached = _VALIDATORS.get(id(validation_schema))
+    if cached is None or cached[0] is not validation_schema:
+        validator_cls = js.validators.validator_for(validation_schema)
+        validator_cls.check_schema(validation_schema)
+        cached = (validation_schema, validator_cls(validation_schema))
+        _VALIDATORS[id(validation_schema)] = cached
+    return cached[1]
+
+
+def _complement_unknown_iface_type(data):
+    """
+    Return data with interface type set to unknown when not defined.
+    Only the top level dictionary, the interface list and interfaces without
+    type are copied, the input data is not modified.
+    """
+    ifstates = data.get(schema.Interface.KEY, ())
+    if all(ifstate.get(schema.Interface.TYPE) for ifstate in ifstates):
+        return data
+    complemented_ifstates = []
+    for ifstate in ifstates:
         if not ifstate.get(schema.Interface.TYPE):
+            ifstate = dict(ifstate)
             ifstate[schema.Interface.TYPE] = schema.InterfaceType.UNKNOWN
-    js.validate(data, validation_schema)
+        complemented_ifstates.append(ifstate)
+    data = dict(data)
+    data[schema.Interface.KEY] = complemented_ifstates
+    return data
 
 
 def validate_capabilities(state, capabilities):
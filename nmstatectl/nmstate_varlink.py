@@ -19,11 +19,19 @@
 
 from contextlib import contextmanager
 import errno
+import json
 import logging
 import os
+import socket
+import threading
+import time
 
 import libnmstate
 import libnmstate.error as libnmError
+from libnmstate.nispor.monitor import NetlinkMonitor
+from libnmstate.schema import Interface
+from libnmstate.schema import Route
+from libnmstate.schema import RouteRule
 
 try:
     import varlink
@@ -31,6 +39,11 @@ except ModuleNotFoundError:
     raise libnmError.NmstateDependencyError("python3 varlink module not found")
 
 
+# Interval of Monitor to check on changes when change notification is not
+# available, and to check whether client is still connected
+MONITOR_POLL_INTERVAL = 5
+
+
 class NmstateVarlinkLogHandler(logging.Handler):
     def __init__(self):
         self._log_records = list()
@@ -131,6 +144,410 @@ def start_varlink_server(address):
         varlink_server.server_close()
 
 
+class StateChangeWatcher:
+    """
+    Count the network changes noticed via netlink notifications of kernel
+    network changes and NetworkManager device/profile change signals.
+    The watchers are started on first use of `start()`. When any watcher
+    stops on failure, the change notification is disabled.
+    """
+
+    NETLINK_WAIT_TIMEOUT = 60
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._generation = 0
+        self._started = False
+        self._enabled = False
+
+    @property
+    def generation(self):
+        """
+        Changed whenever network change noticed.
+        """
+        with self._cond:
+            return self._generation
+
+    def start(self):
+        """
+        Return False if change notification is not available, as netlink
+        could not be listened on or any watcher has stopped on failure.
+        """
+        with self._cond:
+            if not self._started:
+                self._started = True
+                self._enabled = self._start_watch()
+            return self._enabled
+
+    def notify(self):
+        with self._cond:
+            self._generation += 1
+            self._cond.notify_all()
+
+    def wait(self, generation, timeout):
+        """
+        Block till generation is not `generation` anymore or timeout.
+        Return the current generation.
+        """
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._generation != generation, timeout
+            )
+            return self._generation
+
+    def _start_watch(self):
+        try:
+            netlink_monitor = NetlinkMonitor()
+        except OSError as e:
+            logging.warning(f"Failed to listen on netlink: {e}")
+            return False
+        _start_daemon_thread(self._watch_netlink, netlink_monitor)
+        nm_monitor = _gen_nm_change_monitor(self.notify)
+        if nm_monitor:
+            _start_daemon_thread(self._watch_nm, nm_monitor)
+        return True
+
+    def _watch_netlink(self, netlink_monitor):
+        try:
+            while True:
+                if netlink_monitor.wait(
+                    None, StateChangeWatcher.NETLINK_WAIT_TIMEOUT
+                ):
+                    self.notify()
+        except Exception as e:
+            self._disable(f"Stopped watching netlink changes: {e}")
+
+    def _watch_nm(self, nm_monitor):
+        try:
+            nm_monitor.run()
+        except Exception as e:
+            self._disable(f"Stopped monitoring NetworkManager changes: {e}")
+
+    def _disable(self, message):
+        """
+        Changes could be missed from now on, bump the generation to
+        invalidate the cached states.
+        """
+        logging.error(message)
+        with self._cond:
+            self._enabled = False
+            self._generation += 1
+            self._cond.notify_all()
+
+
+class ShowCache:
+    """
+    Cache of `libnmstate.show()` result shared by all request handler
+    threads.
+    The cache is invalidated by any change noticed by `watcher`, and is
+    only used when change notification is available, as otherwise changes
+    could be missed.
+    The returned state is shared, caller should not modify it.
+    """
+
+    def __init__(self, watcher):
+        self._lock = threading.Lock()
+        self._watcher = watcher
+        # include_status_data: (generation, state)
+        self._states = {}
+
+    def show(self, include_status_data=False):
+        include_status_data = bool(include_status_data)
+        is_enabled = self._watcher.start()
+        generation = self._watcher.generation
+        with self._lock:
+            cached_generation, state = self._states.get(
+                include_status_data, (None, None)
+            )
+        if (
+            is_enabled
+            and state is not None
+            and cached_generation == generation
+        ):
+            return state
+
+        state = libnmstate.show(include_status_data=include_status_data)
+        # The state is still valid for `generation` if no change noticed
+        # during show()
+        if is_enabled and self._watcher.generation == generation:
+            with self._lock:
+                self._states[include_status_data] = (generation, state)
+        return state
+
+    def invalidate(self):
+        self._watcher.notify()
+
+
+class ReadWriteLock:
+    """
+    Lock allowing multiple readers or a single writer.
+    Waiting writers block new readers, so a writer is not starved by
+    continuous reads.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    @property
+    def stats(self):
+        """
+        Return a dict of current readers, writer and waiting writers.
+        """
+        with self._cond:
+            return {
+                "readers": self._readers,
+                "writer": self._writer,
+                "waiting_writers": self._waiting_writers,
+            }
+
+    @contextmanager
+    def read_locked(self):
+        with self._cond:
+            while self._writer or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write_locked(self):
+        with self._cond:
+            self._waiting_writers += 1
+            try:
+                while self._writer or self._readers:
+                    self._cond.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+class _InFlightCall:
+    def __init__(self):
+        self._done = threading.Event()
+        self._result = None
+        self._exception = None
+
+    def set_result(self, result):
+        self._result = result
+        self._done.set()
+
+    def set_exception(self, exception):
+        self._exception = exception
+        self._done.set()
+
+    def result(self):
+        self._done.wait()
+        if self._exception:
+            raise self._exception
+        return self._result
+
+
+class RequestCoordinator:
+    """
+    Coordinate concurrent requests of all handler threads:
+        * Concurrent identical read requests are merged into a single
+          in-flight retrieval whose result is shared.
+        * Read requests share the lock, change requests hold it
+          exclusively.
+    The queue metrics of each request are logged at debug level, so they
+    are included in the reply log.
+    """
+
+    def __init__(self):
+        self._lock = ReadWriteLock()
+        self._in_flight_lock = threading.Lock()
+        self._in_flight = {}
+
+    def read(self, key, func):
+        """
+        Return func() holding the shared lock, or the result of an in-flight
+        call of the same key.
+        The result is shared, caller should not modify it.
+        """
+        with self._in_flight_lock:
+            call = self._in_flight.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _InFlightCall()
+                self._in_flight[key] = call
+
+        if not is_leader:
+            start_time = time.monotonic()
+            try:
+                return call.result()
+            finally:
+                self._log_metrics(key, start_time, coalesced=True)
+
+        start_time = time.monotonic()
+        try:
+            with self._lock.read_locked():
+                self._log_metrics(key, start_time, coalesced=False)
+                result = func()
+            call.set_result(result)
+            return result
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        finally:
+            with self._in_flight_lock:
+                del self._in_flight[key]
+
+    @contextmanager
+    def exclusive(self, name):
+        """
+        Hold the lock exclusively, blocking all reads and other changes.
+        """
+        start_time = time.monotonic()
+        with self._lock.write_locked():
+            self._log_metrics(name, start_time, coalesced=False)
+            yield
+
+    def _log_metrics(self, name, start_time, coalesced):
+        with self._in_flight_lock:
+            in_flight = len(self._in_flight)
+        logging.debug(
+            f"Request {name} queue metrics: "
+            f"wait_time={time.monotonic() - start_time:.6f}s "
+            f"coalesced={coalesced} in_flight_reads={in_flight} "
+            f"lock={self._lock.stats}"
+        )
+
+
+def _start_daemon_thread(target, *args):
+    thread = threading.Thread(target=target, args=args)
+    thread.daemon = True
+    thread.start()
+
+
+def _is_connection_open(request):
+    try:
+        return request.recv(1, socket.MSG_PEEK | socket.MSG_DONTWAIT) != b""
+    except BlockingIOError:
+        # Nothing to read but still connected
+        return True
+    except OSError:
+        return False
+
+
+def _gen_nm_change_monitor(callback):
+    """
+    Making NetworkManager change monitor as optional
+    """
+    try:
+        from libnmstate.nm.monitor import NmChangeMonitor
+
+        return NmChangeMonitor(callback)
+    except Exception as e:
+        logging.warning(f"Failed to monitor NetworkManager changes: {e}")
+        return None
+
+
+def gen_state_delta(old_state, new_state):
+    """
+    Return the changes from `old_state` to `new_state`, empty dict if no
+    change:
+        {
+            "interfaces": {
+                "updated": [<full state of new or changed interfaces>],
+                "removed": [{"name": "eth1", "type": "ethernet"}],
+            },
+            "routes": {
+                "running": {"added": [<route>], "removed": [<route>]},
+                "config": {"added": [<route>], "removed": [<route>]},
+            },
+            "route-rules": {
+                "config": {"added": [<rule>], "removed": [<rule>]},
+            },
+            "dns-resolver": <full new DNS state>,
+        }
+    Only changed sections are included. Other top level sections like
+    "dns-resolver" are reported in full when changed.
+    """
+    delta = {}
+    for key in set(old_state.keys()) | set(new_state.keys()):
+        old_value = old_state.get(key)
+        new_value = new_state.get(key)
+        if old_value == new_value:
+            continue
+        if key == Interface.KEY:
+            delta[key] = _gen_ifaces_delta(old_value or [], new_value or [])
+        elif key in (Route.KEY, RouteRule.KEY):
+            sections_delta = _gen_list_sections_delta(
+                old_value or {}, new_value or {}
+            )
+            # Reordered entries are not a change
+            if sections_delta:
+                delta[key] = sections_delta
+        else:
+            delta[key] = new_value
+    return delta
+
+
+def _gen_ifaces_delta(old_ifaces, new_ifaces):
+    old_ifaces = {
+        (iface[Interface.NAME], iface[Interface.TYPE]): iface
+        for iface in old_ifaces
+    }
+    new_ifaces = {
+        (iface[Interface.NAME], iface[Interface.TYPE]): iface
+        for iface in new_ifaces
+    }
+    return {
+        "updated": [
+            iface
+            for key, iface in new_ifaces.items()
+            if old_ifaces.get(key) != iface
+        ],
+        "removed": [
+            {Interface.NAME: name, Interface.TYPE: iface_type}
+            for name, iface_type in old_ifaces.keys()
+            if (name, iface_type) not in new_ifaces
+        ],
+    }
+
+
+def _gen_list_sections_delta(old_sections, new_sections):
+    delta = {}
+    for section in set(old_sections.keys()) | set(new_sections.keys()):
+        old_entries = _index_entries(old_sections.get(section, []))
+        new_entries = _index_entries(new_sections.get(section, []))
+        added = [
+            entry
+            for key, entry in new_entries.items()
+            if key not in old_entries
+        ]
+        removed = [
+            entry
+            for key, entry in old_entries.items()
+            if key not in new_entries
+        ]
+        if added or removed:
+            delta[section] = {"added": added, "removed": removed}
+    return delta
+
+
+def _index_entries(entries):
+    """
+    Return a dict of the entries keyed by their canonical JSON string, so
+    large route tables are compared without pairwise dict comparisons.
+    """
+    return {json.dumps(entry, sort_keys=True): entry for entry in entries}
+
+
 class NmstateError(varlink.VarlinkError):
     def __init__(self, message, logs):
         varlink.VarlinkError.__init__(
@@ -190,6 +607,11 @@ class ServiceRequestHandler(varlink.RequestHandler):
 
 @ServiceRequestHandler.service.interface("io.nmstate")
 class NmstateVarlinkService:
+    def __init__(self):
+        self._watcher = StateChangeWatcher()
+        self._show_cache = ShowCache(self._watcher)
+        self._coordinator = RequestCoordinator()
+
     def Show(self, arguments):
         """
         Reports the state data on the system
@@ -198,18 +620,71 @@ class NmstateVarlinkService:
             method_args = ["include_status_data"]
             show_kwargs = validate_method_arguments(arguments, method_args)
             try:
-                configured_state = libnmstate.show(**show_kwargs)
+                configured_state = self._coordinator.read(
+                    ("Show", bool(show_kwargs.get("include_status_data"))),
+                    lambda: self._show_cache.show(**show_kwargs),
+                )
                 return {"state": configured_state, "log": log_handler.logs}
             except libnmstate.error.NmstateValueError as exception:
                 logging.error(str(exception))
                 raise NmstateValueError(str(exception), log_handler.logs)
 
+    def Monitor(self, arguments, _more=False, _request=None):
+        """
+        Stream the changes of state data on the system. The first reply
+        contains the full state, each following reply contains the changes
+        against the state sent in previous reply.
+        Without 'more' flag set by client, only the first reply is sent.
+        The streaming stops once the client disconnected.
+        """
+        method_args = ["include_status_data"]
+        show_kwargs = validate_method_arguments(arguments, method_args)
+        include_status_data = bool(show_kwargs.get("include_status_data"))
+        last_state = {}
+        while True:
+            is_watching = self._watcher.start()
+            generation = self._watcher.generation
+            with nmstate_varlink_logger() as log_handler:
+                try:
+                    state = self._coordinator.read(
+                        ("Show", include_status_data),
+                        lambda: self._show_cache.show(include_status_data),
+                    )
+                except libnmstate.error.NmstateValueError as exception:
+                    logging.error(str(exception))
+                    raise NmstateValueError(str(exception), log_handler.logs)
+                changes = gen_state_delta(last_state, state)
+                logs = log_handler.logs
+            if changes:
+                yield {"changes": changes, "log": logs, "_continues": _more}
+            if not _more:
+                return
+            last_state = state
+            if not self._wait_for_change(generation, is_watching, _request):
+                return
+
+    def _wait_for_change(self, generation, is_watching, request):
+        """
+        Block till change noticed or `MONITOR_POLL_INTERVAL` passed when
+        not watching. Return False if client of `request` disconnected.
+        """
+        while True:
+            if request is not None and not _is_connection_open(request):
+                return False
+            new_generation = self._watcher.wait(
+                generation, MONITOR_POLL_INTERVAL
+            )
+            if new_generation != generation or not is_watching:
+                return True
+
     def ShowRunningConfig(self, arguments):
         with nmstate_varlink_logger() as log_handler:
             method_args = []
             validate_method_arguments(arguments, method_args)
             try:
-                configured_state = libnmstate.show_running_config()
+                configured_state = self._coordinator.read(
+                    ("ShowRunningConfig",), libnmstate.show_running_config
+                )
                 return {"state": configured_state, "log": log_handler.logs}
             except libnmstate.error.NmstateValueError as exception:
                 logging.error(str(exception))
@@ -234,9 +709,13 @@ class NmstateVarlinkService:
                 raise NmstateValueError(
                     "desired_state: No state specified", log_handler.logs
                 )
+            timings = {}
             try:
-                libnmstate.apply(**apply_kwargs)
-                return {"log": log_handler.logs}
+                with self._exclusive_change("Apply"):
+                    libnmstate.apply(
+                        timings_callback=timings.update, **apply_kwargs
+                    )
+                return {"timings": timings, "log": log_handler.logs}
             except TypeError as exception:
                 logging.error(str(exception), log_handler.logs)
                 raise varlink.InvalidParameter(exception)
@@ -263,7 +742,8 @@ class NmstateVarlinkService:
             method_args = ["checkpoint"]
             commit_kwargs = validate_method_arguments(arguments, method_args)
             try:
-                libnmstate.commit(**commit_kwargs)
+                with self._exclusive_change("Commit"):
+                    libnmstate.commit(**commit_kwargs)
                 return {"log": log_handler.logs}
             except libnmstate.error.NmstateValueError as exception:
                 logging.error(str(exception))
@@ -277,8 +757,22 @@ class NmstateVarlinkService:
             method_args = ["checkpoint"]
             rollback_kwargs = validate_method_arguments(arguments, method_args)
             try:
-                libnmstate.rollback(**rollback_kwargs)
+                with self._exclusive_change("Rollback"):
+                    libnmstate.rollback(**rollback_kwargs)
                 return {"log": log_handler.logs}
             except libnmstate.error.NmstateValueError as exception:
                 logging.error(str(exception))
                 raise NmstateValueError(str(exception), log_handler.logs)
+
+    @contextmanager
+    def _exclusive_change(self, name):
+        """
+        Hold exclusive access during the change and invalidate the show
+        cache afterwards regardless of outcome, as notifications might
+        arrive later than next Show request.
+        """
+        with self._coordinator.exclusive(name):
+            try:
+                yield
+            finally:
+                self._show_cache.invalidate()
@@ -32,13 +32,13 @@ import yaml
 import libnmstate
 from libnmstate import PrettyState
 from libnmstate.error import NmstateConflictError
+from libnmstate.error import NmstateError
 from libnmstate.error import NmstatePermissionError
 from libnmstate.error import NmstateValueError
 from libnmstate.schema import Interface
 from libnmstate.schema import InterfaceIP
 from libnmstate.schema import Route
 from libnmstate.schema import RouteRule
-from nmstatectl.nmstate_varlink import start_varlink_server
 
 
 def main():
@@ -58,6 +58,7 @@ def main():
     setup_subcommand_show(subparsers)
     setup_subcommand_version(subparsers)
     setup_subcommand_varlink(subparsers)
+    setup_subcommand_gen_conf(subparsers)
     parser.add_argument(
         "--version", action="store_true", help="Display nmstate version"
     )
@@ -162,6 +163,26 @@ def setup_subcommand_apply(subparsers):
         default=True,
         help="Do not make the state persistent.",
     )
+    parser_set.add_argument(
+        "--scoped-checkpoint",
+        action="store_true",
+        default=False,
+        help="Only include the affected interfaces in the checkpoint.",
+    )
+    parser_set.add_argument(
+        "--kernel",
+        action="store_true",
+        dest="kernel_only",
+        default=False,
+        help="Apply memory-only state directly to kernel without "
+        "NetworkManager.",
+    )
+    parser_set.add_argument(
+        "--timings",
+        action="store_true",
+        default=False,
+        help="Print seconds spent on each phase of the apply to stderr.",
+    )
     parser_set.set_defaults(func=apply)
 
 
@@ -207,6 +228,26 @@ def setup_subcommand_set(subparsers):
         default=True,
         help="Do not make the state persistent.",
     )
+    parser_set.add_argument(
+        "--scoped-checkpoint",
+        action="store_true",
+        default=False,
+        help="Only include the affected interfaces in the checkpoint.",
+    )
+    parser_set.add_argument(
+        "--kernel",
+        action="store_true",
+        dest="kernel_only",
+        default=False,
+        help="Apply memory-only state directly to kernel without "
+        "NetworkManager.",
+    )
+    parser_set.add_argument(
+        "--timings",
+        action="store_true",
+        default=False,
+        help="Print seconds spent on each phase of the apply to stderr.",
+    )
     parser_set.set_defaults(func=set)
 
 
@@ -253,6 +294,33 @@ def setup_subcommand_varlink(subparsers):
     parser_varlink.set_defaults(func=run_varlink_server)
 
 
+def setup_subcommand_gen_conf(subparsers):
+    parser_gen_conf = subparsers.add_parser(
+        "gen-conf",
+        help="Generate configuration files without applying network state",
+    )
+    parser_gen_conf.add_argument(
+        "file",
+        help="File containing desired state. "
+        "stdin is used when no file is specified.",
+        nargs="*",
+    )
+    parser_gen_conf.add_argument(
+        "--json",
+        help="Output as JSON",
+        default=True,
+        action="store_false",
+        dest="yaml",
+    )
+    parser_gen_conf.add_argument(
+        "--output-dir",
+        default=None,
+        help="Write configuration files into the <plugin_name> folder of "
+        "specified directory instead of printing them.",
+    )
+    parser_gen_conf.set_defaults(func=gen_conf)
+
+
 def version(args):
     print(libnmstate.__version__)
 
@@ -329,7 +397,10 @@ def apply(args):
                 args.verify,
                 args.commit,
                 args.timeout,
-                args.save_to_disk,
+                args.save_to_disk and not args.kernel_only,
+                args.scoped_checkpoint,
+                args.kernel_only,
+                args.timings,
             )
             if ret:
                 return ret
@@ -340,28 +411,86 @@ def apply(args):
             args.verify,
             args.commit,
             args.timeout,
-            args.save_to_disk,
+            args.save_to_disk and not args.kernel_only,
+            args.scoped_checkpoint,
+            args.kernel_only,
+            args.timings,
         )
     else:
         sys.stderr.write("ERROR: No state specified\n")
         return 1
 
 
+def gen_conf(args):
+    if args.file:
+        statedatas = []
+        for statefile in args.file:
+            if statefile == "-" and not os.path.isfile(statefile):
+                statedatas.append(sys.stdin.read())
+            else:
+                with open(statefile) as statefile:
+                    statedatas.append(statefile.read())
+    elif not sys.stdin.isatty():
+        statedatas = [sys.stdin.read()]
+    else:
+        sys.stderr.write("ERROR: No state specified\n")
+        return 1
+
+    for statedata in statedatas:
+        state, _ = _load_state_data(statedata)
+        try:
+            configs = libnmstate.generate_configurations(state)
+        except NmstateValueError as e:
+            sys.stderr.write(f"ERROR: Invalid desired state: {e}\n")
+            return os.EX_DATAERR
+        except NmstateError as e:
+            sys.stderr.write(f"ERROR: Failed to generate configuration: {e}\n")
+            return os.EX_SOFTWARE
+        if args.output_dir:
+            _write_configs(configs, args.output_dir)
+        elif args.yaml:
+            sys.stdout.write(yaml.dump(configs, default_flow_style=False))
+        else:
+            print(json.dumps(configs, indent=4))
+
+
+def _write_configs(configs, output_dir):
+    for plugin_name, plugin_configs in configs.items():
+        plugin_dir = os.path.join(output_dir, plugin_name)
+        os.makedirs(plugin_dir, exist_ok=True)
+        for file_name, content in plugin_configs:
+            file_path = os.path.join(plugin_dir, file_name)
+            # NetworkManager refuses keyfile readable by other users
+            fd = os.open(
+                file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600
+            )
+            with os.fdopen(fd, "w") as config_file:
+                config_file.write(content)
+            print(file_path)
+
+
 def run_varlink_server(args):
+    # Only the varlink command needs the varlink module
+    from nmstatectl.nmstate_varlink import start_varlink_server
+
     try:
         start_varlink_server(args.address)
     except Exception as exception:
         logging.exception(exception)
 
 
-def apply_state(statedata, verify_change, commit, timeout, save_to_disk):
-    use_yaml = False
-    # JSON dictionaries start with a curly brace
-    if statedata[0] == "{":
-        state = json.loads(statedata)
-    else:
-        state = yaml.load(statedata, Loader=yaml.SafeLoader)
-        use_yaml = True
+def apply_state(
+    statedata,
+    verify_change,
+    commit,
+    timeout,
+    save_to_disk,
+    scoped_checkpoint,
+    kernel_only,
+    timings,
+):
+    state, use_yaml = _load_state_data(statedata)
+    timings_report = {}
 
     try:
         checkpoint = libnmstate.apply(
@@ -370,6 +499,9 @@ def apply_state(statedata, verify_change, commit, timeout, save_to_disk):
             commit=commit,
             rollback_timeout=timeout,
             save_to_disk=save_to_disk,
+            scoped_checkpoint=scoped_checkpoint,
+            kernel_only=kernel_only,
+            timings_callback=timings_report.update if timings else None,
         )
     except NmstatePermissionError as e:
         sys.stderr.write("ERROR: Missing permissions:{}\n".format(str(e)))
@@ -380,6 +512,9 @@ def apply_state(statedata, verify_change, commit, timeout, save_to_disk):
             "Commit, roll back or wait before retrying.\n"
         )
         return os.EX_UNAVAILABLE
+    finally:
+        if timings_report:
+            _print_timings(timings_report, use_yaml)
 
     print("Desired state applied: ")
     print_state(state, use_yaml=use_yaml)
@@ -387,6 +522,14 @@ def apply_state(statedata, verify_change, commit, timeout, save_to_disk):
         print("Checkpoint: {}".format(checkpoint))
 
 
+def _print_timings(timings_report, use_yaml):
+    sys.stderr.write("Timings: \n")
+    if use_yaml:
+        sys.stderr.write(yaml.dump(timings_report, default_flow_style=False))
+    else:
+        sys.stderr.write(json.dumps(timings_report, indent=4) + "\n")
+
+
 def _filter_state(state, whitelist):
     if whitelist != "*":
         patterns = [p for p in whitelist.split(",")]
@@ -488,6 +631,17 @@ def _try_edit_again(error):
     return True
 
 
+def _load_state_data(statedata):
+    """
+    Return the state and whether it is in YAML format.
+    """
+    # JSON dictionaries start with a curly brace
+    if statedata[0] == "{":
+        return json.loads(statedata), False
+    else:
+        return yaml.load(statedata, Loader=yaml.SafeLoader), True
+
+
 def print_state(state, use_yaml=False):
     state = PrettyState(state)
     if use_yaml:
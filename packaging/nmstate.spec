@@ -12,6 +12,8 @@ Source0:        https://github.com/%{srcname}/%{srcname}/releases/download/v%{ve
 BuildArch:      noarch
 BuildRequires:  python3-devel
 BuildRequires:  python3-setuptools
+# Precompiling the schema at build time
+BuildRequires:  python3-pyyaml
 Requires:       python3-%{libname} = %{?epoch:%{epoch}:}%{version}-%{release}
 BuildRequires:  systemd-rpm-macros
 
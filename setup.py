@@ -1,5 +1,10 @@
 from setuptools import setup, find_packages
+from setuptools.command.build_py import build_py
 from datetime import date
+import importlib.util
+import os
+
+SCHEMA_NAMES = ["operational-state"]
 
 
 def readme():
@@ -34,6 +39,36 @@ def gen_manpage():
     return [("share/man/man8", ["doc/nmstatectl.8"])]
 
 
+class BuildPyWithPrecompiledSchema(build_py):
+    """
+    Also store the YAML schemas as JSON into the build folder, saving the
+    YAML parsing on every process using libnmstate.
+    """
+
+    def run(self):
+        super().run()
+        try:
+            import yaml  # NOQA: F401
+        except ImportError:
+            # libnmstate falls back to parse the YAML schema at runtime
+            self.warn("PyYAML not found, skipping schema precompilation")
+            return
+        # Avoid importing the libnmstate package which might not be built
+        spec = importlib.util.spec_from_file_location(
+            "nmstate_schema", "libnmstate/schema.py"
+        )
+        schema = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(schema)
+        for schema_name in SCHEMA_NAMES:
+            with open(f"libnmstate/schemas/{schema_name}.yaml", "rb") as f:
+                content = schema.precompile(f.read())
+            json_path = os.path.join(
+                self.build_lib, "libnmstate", "schemas", f"{schema_name}.json"
+            )
+            with open(json_path, "w") as f:
+                f.write(content)
+
+
 setup(
     name="nmstate",
     version=get_version(),
@@ -54,4 +89,5 @@ setup(
         "nmstatectl": ["io.nmstate.varlink", "nmstate-varlink.service"],
     },
     data_files=gen_manpage(),
+    cmdclass={"build_py": BuildPyWithPrecompiledSchema},
 )
@@ -0,0 +1,75 @@
+#
+# Copyright (c) 2021 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Compare two benchmark result files generated by `--benchmark-output`:
+    python3 tests/benchmark/compare.py old.json new.json
+Exit with 1 when any benchmark is slower than the threshold ratio.
+"""
+
+import argparse
+import json
+import sys
+
+DEFAULT_THRESHOLD = 1.2
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("old", help="benchmark results of base commit")
+    parser.add_argument("new", help="benchmark results of new commit")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="new/old ratio of best time considered as regression",
+    )
+    args = parser.parse_args()
+
+    old_results = _load_results(args.old)
+    new_results = _load_results(args.new)
+    regressed = False
+    for key in sorted(new_results.keys() & old_results.keys()):
+        ratio = new_results[key] / old_results[key]
+        mark = ""
+        if ratio > args.threshold:
+            mark = " REGRESSION"
+            regressed = True
+        print(
+            f"{' '.join(key):<60} {old_results[key]:10.4f}s "
+            f"{new_results[key]:10.4f}s {ratio:6.2f}x{mark}"
+        )
+    return 1 if regressed else 0
+
+
+def _load_results(file_path):
+    with open(file_path) as fd:
+        results = json.load(fd)["results"]
+    return {
+        (
+            result["name"],
+            result.get("topology", ""),
+            str(result.get("iface_count", "")),
+        ): result["best"]
+        for result in results
+    }
+
+
+if __name__ == "__main__":
+    sys.exit(main())
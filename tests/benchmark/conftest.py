@@ -0,0 +1,128 @@
+#
+# Copyright (c) 2021 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+import datetime
+import json
+import logging
+import platform
+import subprocess
+import time
+
+import pytest
+
+import libnmstate
+
+DEFAULT_SIZES = "10,100,1000,10000"
+DEFAULT_REPEAT = 3
+DEFAULT_OUTPUT = "benchmark.json"
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--benchmark-sizes",
+        default=DEFAULT_SIZES,
+        help="comma separated interface counts of synthetic states",
+    )
+    parser.addoption(
+        "--benchmark-repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help="times to run each benchmark, the best one is reported",
+    )
+    parser.addoption(
+        "--benchmark-output",
+        default=DEFAULT_OUTPUT,
+        help="JSON file to store the benchmark results",
+    )
+
+
+def pytest_generate_tests(metafunc):
+    if "iface_count" in metafunc.fixturenames:
+        sizes = [
+            int(size)
+            for size in metafunc.config.getoption("--benchmark-sizes").split(
+                ","
+            )
+        ]
+        metafunc.parametrize("iface_count", sizes, ids=str)
+
+
+@pytest.fixture(scope="session")
+def benchmark_results(request):
+    results = []
+    yield results
+    output = request.config.getoption("--benchmark-output")
+    report = {
+        "commit": _get_git_commit(),
+        "nmstate_version": libnmstate.__version__,
+        "python_version": platform.python_version(),
+        "time": datetime.datetime.now().isoformat(),
+        "results": results,
+    }
+    with open(output, "w") as fd:
+        json.dump(report, fd, indent=4)
+    logging.info(f"Benchmark results saved to {output}")
+
+
+@pytest.fixture
+def benchmark(request, benchmark_results):
+    """
+    Return a function running `func(*setup())` repeatedly and recording the
+    seconds spent under `name` along with the parameters of current test.
+    The `setup` is not timed. When `func` returns a dict, the one of the last
+    run is recorded as `metrics`.
+    """
+    repeat = request.config.getoption("--benchmark-repeat")
+    params = getattr(request.node, "callspec", None)
+    params = dict(params.params) if params else {}
+
+    def run(name, func, setup=None):
+        elapsed = []
+        metrics = None
+        for _ in range(repeat):
+            args = setup() if setup else ()
+            start = time.perf_counter()
+            metrics = func(*args)
+            elapsed.append(time.perf_counter() - start)
+        result = {
+            "name": name,
+            "best": min(elapsed),
+            "mean": sum(elapsed) / len(elapsed),
+            "repeat": repeat,
+        }
+        result.update(params)
+        if isinstance(metrics, dict):
+            result["metrics"] = metrics
+        benchmark_results.append(result)
+        logging.info(
+            f"{name} {params}: best {result['best']:.3f}s of {repeat}"
+        )
+
+    return run
+
+
+def _get_git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"],
+            stderr=subprocess.DEVNULL,
+            universal_newlines=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
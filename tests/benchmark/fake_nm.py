@@ -0,0 +1,540 @@
+#
+# Copyright (c) 2021 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+In-process stand-in of NM.Client, NM.Device, NM.ActiveConnection and
+NM.RemoteConnection for benchmarking the NetworkManager plugin without the
+NetworkManager daemon. The NM.Setting* and NM.SimpleConnection are still
+provided by libnm.
+
+Every method ending with `_async` (or the libnm equivalent like
+`add_connection2()`) is counted as a D-Bus round trip and its callback is
+invoked from the GLib main context of the client after `latency` seconds.
+Activation walks the device through the NM.DeviceState transitions with
+`state_latency` seconds between each of them, emitting the same signals as
+libnm.
+"""
+
+from gi.repository import GLib
+from gi.repository import NM
+
+DEFAULT_LATENCY = 0.001
+DEFAULT_STATE_LATENCY = 0.001
+ACTIVATION_DEVICE_STATES = (
+    NM.DeviceState.PREPARE,
+    NM.DeviceState.CONFIG,
+    NM.DeviceState.IP_CONFIG,
+    NM.DeviceState.ACTIVATED,
+)
+# NM.Device.get_type_description() of connection type if differs
+DEVICE_TYPE_DESCRIPTIONS = {NM.SETTING_WIRED_SETTING_NAME: "ethernet"}
+OBJECT_PATH_PREFIX = "/org/freedesktop/NetworkManager"
+
+
+class FakeNmStats:
+    def __init__(self):
+        self.round_trips = 0
+        self.signals = 0
+        self.main_loop_iterations = 0
+
+    def to_dict(self):
+        return {
+            "round_trips": self.round_trips,
+            "signals": self.signals,
+            "main_loop_iterations": self.main_loop_iterations,
+        }
+
+
+class _IterationCounter(GLib.Source):
+    """
+    The prepare() of every attached source is invoked once per main context
+    iteration.
+    """
+
+    def __init__(self, stats):
+        super().__init__()
+        self._stats = stats
+
+    def prepare(self):
+        self._stats.main_loop_iterations += 1
+        return False, -1
+
+    def check(self):
+        return False
+
+    def dispatch(self, callback, args):
+        return GLib.SOURCE_CONTINUE
+
+
+class _FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+
+class _FakeProps:
+    """
+    Mimic `GObject.props` by mapping `props.foo` to `get_foo()`.
+    """
+
+    def __init__(self, obj):
+        self._obj = obj
+
+    def __getattr__(self, name):
+        return getattr(self._obj, f"get_{name}")()
+
+
+class _FakeGObject:
+    def __init__(self, client):
+        self._client = client
+        self._handlers = {}
+        self._next_handler_id = 1
+        self.props = _FakeProps(self)
+
+    def connect(self, signal, callback, *user_data):
+        handler_id = self._next_handler_id
+        self._next_handler_id += 1
+        self._handlers[handler_id] = (signal, callback, user_data)
+        return handler_id
+
+    def handler_disconnect(self, handler_id):
+        self._handlers.pop(handler_id, None)
+
+    def emit(self, signal, *args):
+        for handler_signal, callback, user_data in list(
+            self._handlers.values()
+        ):
+            if handler_signal == signal:
+                self._client.stats.signals += 1
+                callback(self, *args, *user_data)
+
+
+class _FakeBusyWatcher:
+    def weak_ref(self, callback):
+        # Nothing is pending in fake client once main context is dropped
+        callback()
+
+
+class FakeCheckpoint:
+    def __init__(self, path):
+        self._path = path
+
+    def get_path(self):
+        return self._path
+
+
+class FakeRemoteConnection(_FakeGObject):
+    """
+    NM.RemoteConnection holding a NM.SimpleConnection, the getters of
+    NM.Connection are forwarded to it.
+    """
+
+    def __init__(self, client, nm_simple_conn, in_memory, path):
+        super().__init__(client)
+        self._nm_simple_conn = nm_simple_conn
+        self._in_memory = in_memory
+        self._path = path
+
+    def __getattr__(self, name):
+        return getattr(self._nm_simple_conn, name)
+
+    def get_path(self):
+        return self._path
+
+    def get_flags(self):
+        if self._in_memory:
+            return NM.SettingsConnectionFlags.UNSAVED
+        return NM.SettingsConnectionFlags.NONE
+
+    def update2(self, settings, flags, args, cancellable, callback, user_data):
+        self._nm_simple_conn = NM.SimpleConnection.new_from_dbus(settings)
+        self._in_memory = bool(flags & NM.SettingsUpdate2Flags.IN_MEMORY)
+        self._client.reply(callback, self, {}, user_data)
+
+    def update2_finish(self, result):
+        return result.value
+
+    def delete_async(self, cancellable, callback, user_data):
+        self._client.remove_connection(self)
+        self._client.reply(callback, self, True, user_data)
+
+    def delete_finish(self, result):
+        return result.value
+
+
+class FakeActiveConnection(_FakeGObject):
+    def __init__(self, client, nm_profile, nm_dev):
+        super().__init__(client)
+        self._nm_profile = nm_profile
+        self._nm_dev = nm_dev
+        self._state = NM.ActiveConnectionState.ACTIVATING
+        self._state_flags = NM.ActivationStateFlags.NONE
+
+    def get_connection(self):
+        return self._nm_profile
+
+    def get_uuid(self):
+        return self._nm_profile.get_uuid()
+
+    def get_id(self):
+        return self._nm_profile.get_id()
+
+    def get_devices(self):
+        return [self._nm_dev]
+
+    def get_state(self):
+        return self._state
+
+    def get_state_flags(self):
+        return self._state_flags
+
+    def get_state_reason(self):
+        return NM.ActiveConnectionStateReason.NONE
+
+    def set_state(self, state):
+        self._state = state
+        if state == NM.ActiveConnectionState.ACTIVATED:
+            self._state_flags = (
+                NM.ActivationStateFlags.LAYER2_READY
+                | NM.ActivationStateFlags.IP4_READY
+                | NM.ActivationStateFlags.IP6_READY
+            )
+            self.emit("notify::state-flags", None)
+        self.emit("state-changed", state, NM.ActiveConnectionStateReason.NONE)
+
+
+class FakeDevice(_FakeGObject):
+    def __init__(self, client, iface_name, type_description, path):
+        super().__init__(client)
+        self._iface_name = iface_name
+        self._type_description = type_description
+        self._path = path
+        self._state = NM.DeviceState.DISCONNECTED
+        self._state_reason = NM.DeviceStateReason.NONE
+        self._nm_ac = None
+        self._is_real = True
+
+    def get_iface(self):
+        return self._iface_name
+
+    def get_type_description(self):
+        return self._type_description
+
+    def get_device_type(self):
+        return NM.DeviceType.GENERIC
+
+    def get_path(self):
+        return self._path
+
+    def get_state(self):
+        return self._state
+
+    def get_state_reason(self):
+        return self._state_reason
+
+    def get_active_connection(self):
+        return self._nm_ac
+
+    def get_managed(self):
+        return True
+
+    def get_capabilities(self):
+        return NM.DeviceCapabilities.NONE
+
+    def get_slaves(self):
+        return []
+
+    def is_real(self):
+        return self._is_real
+
+    def set_state(self, state, reason=NM.DeviceStateReason.NONE):
+        old_state = self._state
+        self._state = state
+        self._state_reason = reason
+        self.emit("state-changed", state, old_state, reason)
+
+    def set_active_connection(self, nm_ac):
+        self._nm_ac = nm_ac
+
+    def get_applied_connection_async(
+        self, flags, cancellable, callback, user_data
+    ):
+        nm_profile = self._nm_ac.get_connection() if self._nm_ac else None
+        self._client.reply(callback, self, (nm_profile, 0), user_data)
+
+    def get_applied_connection_finish(self, result):
+        return result.value
+
+    def reapply_async(
+        self,
+        nm_simple_conn,
+        version_id,
+        flags,
+        cancellable,
+        callback,
+        user_data,
+    ):
+        self._client.reply(callback, self, True, user_data)
+
+    def reapply_finish(self, result):
+        return result.value
+
+    def delete_async(self, cancellable, callback, user_data):
+        self._is_real = False
+        self._client.remove_device(self)
+        self._client.reply(callback, self, True, user_data)
+
+    def delete_finish(self, result):
+        return result.value
+
+
+class FakeClient(_FakeGObject):
+    def __init__(
+        self, latency=DEFAULT_LATENCY, state_latency=DEFAULT_STATE_LATENCY
+    ):
+        self.stats = FakeNmStats()
+        super().__init__(self)
+        self._latency = latency
+        self._state_latency = state_latency
+        self._main_context = GLib.MainContext.new()
+        self._devices = []
+        self._connections = []
+        self._active_connections = []
+        self._checkpoints = []
+        self._next_path_id = 1
+        _IterationCounter(self.stats).attach(self._main_context)
+
+    def get_main_context(self):
+        return self._main_context
+
+    def get_version(self):
+        return f"{NM.MAJOR_VERSION}.{NM.MINOR_VERSION}.{NM.MICRO_VERSION}"
+
+    def get_capabilities(self):
+        return [NM.Capability.OVS, NM.Capability.TEAM]
+
+    def get_context_busy_watcher(self):
+        return _FakeBusyWatcher()
+
+    def get_devices(self):
+        return list(self._devices)
+
+    def get_device_by_path(self, path):
+        for nm_dev in self._devices:
+            if nm_dev.get_path() == path:
+                return nm_dev
+        return None
+
+    def get_connections(self):
+        return list(self._connections)
+
+    def get_active_connections(self):
+        return list(self._active_connections)
+
+    def get_checkpoints(self):
+        return list(self._checkpoints)
+
+    def add_device(self, iface_name, type_description):
+        nm_dev = FakeDevice(
+            self, iface_name, type_description, self._gen_path("Devices")
+        )
+        self._devices.append(nm_dev)
+        self.emit("device-added", nm_dev)
+        return nm_dev
+
+    def remove_device(self, nm_dev):
+        if nm_dev in self._devices:
+            self._devices.remove(nm_dev)
+            self.emit("device-removed", nm_dev)
+
+    def remove_connection(self, nm_profile):
+        if nm_profile in self._connections:
+            self._connections.remove(nm_profile)
+
+    def reply(self, callback, source_object, value, user_data):
+        """
+        Invoke `callback(source_object, result, user_data)` after latency
+        like a D-Bus method reply.
+        """
+        self.stats.round_trips += 1
+        self._schedule(
+            self._latency,
+            callback,
+            source_object,
+            _FakeResult(value),
+            user_data,
+        )
+
+    def add_connection2(
+        self,
+        settings,
+        flags,
+        args,
+        ignore_out_result,
+        cancellable,
+        callback,
+        user_data,
+    ):
+        nm_profile = FakeRemoteConnection(
+            self,
+            NM.SimpleConnection.new_from_dbus(settings),
+            bool(flags & NM.SettingsAddConnection2Flags.IN_MEMORY),
+            self._gen_path("Settings"),
+        )
+        self._connections.append(nm_profile)
+        self.reply(callback, self, (nm_profile, None), user_data)
+
+    def add_connection2_finish(self, result):
+        return result.value
+
+    def activate_connection_async(
+        self,
+        nm_profile,
+        nm_dev,
+        specific_object,
+        cancellable,
+        callback,
+        user_data,
+    ):
+        if nm_dev is None:
+            nm_dev = self._get_or_add_device(nm_profile)
+        old_nm_ac = nm_dev.get_active_connection()
+        if old_nm_ac:
+            self._active_connections.remove(old_nm_ac)
+        nm_ac = FakeActiveConnection(self, nm_profile, nm_dev)
+        self._active_connections.append(nm_ac)
+        nm_dev.set_active_connection(nm_ac)
+        self.reply(callback, self, nm_ac, user_data)
+        self._schedule_activation(nm_ac, nm_dev)
+
+    def activate_connection_finish(self, result):
+        return result.value
+
+    def deactivate_connection_async(
+        self, nm_ac, cancellable, callback, user_data
+    ):
+        self.reply(callback, self, True, user_data)
+        nm_dev = nm_ac.get_devices()[0]
+        self._schedule(self._state_latency, self._deactivate, nm_ac, nm_dev)
+
+    def deactivate_connection_finish(self, result):
+        return result.value
+
+    def checkpoint_create(
+        self, devices, timeout, flags, cancellable, callback, user_data
+    ):
+        checkpoint = FakeCheckpoint(self._gen_path("Checkpoint"))
+        self._checkpoints.append(checkpoint)
+        self.reply(callback, self, checkpoint, user_data)
+
+    def checkpoint_create_finish(self, result):
+        return result.value
+
+    def checkpoint_adjust_rollback_timeout(
+        self, checkpoint_path, timeout, cancellable, callback, user_data
+    ):
+        self.stats.round_trips += 1
+
+    def checkpoint_destroy(
+        self, checkpoint_path, cancellable, callback, user_data
+    ):
+        self._remove_checkpoint(checkpoint_path)
+        self.reply(callback, self, True, user_data)
+
+    def checkpoint_destroy_finish(self, result):
+        return result.value
+
+    def checkpoint_rollback(
+        self, checkpoint_path, cancellable, callback, user_data
+    ):
+        # Rollback is not modeled, report no device changed
+        self._remove_checkpoint(checkpoint_path)
+        self.reply(callback, self, {}, user_data)
+
+    def checkpoint_rollback_finish(self, result):
+        return result.value
+
+    def _remove_checkpoint(self, checkpoint_path):
+        self._checkpoints = [
+            checkpoint
+            for checkpoint in self._checkpoints
+            if checkpoint.get_path() != checkpoint_path
+        ]
+
+    def _gen_path(self, kind):
+        path = f"{OBJECT_PATH_PREFIX}/{kind}/{self._next_path_id}"
+        self._next_path_id += 1
+        return path
+
+    def _get_or_add_device(self, nm_profile):
+        iface_name = nm_profile.get_interface_name()
+        conn_type = nm_profile.get_connection_type()
+        type_description = DEVICE_TYPE_DESCRIPTIONS.get(conn_type, conn_type)
+        for nm_dev in self._devices:
+            if (
+                nm_dev.get_iface() == iface_name
+                and nm_dev.get_type_description() == type_description
+            ):
+                return nm_dev
+        return self.add_device(iface_name, type_description)
+
+    def _schedule(self, delay, func, *args):
+        if delay > 0:
+            source = GLib.timeout_source_new(int(delay * 1000))
+        else:
+            source = GLib.idle_source_new()
+        source.set_callback(_dispatch, (func, args))
+        source.attach(self._main_context)
+
+    def _schedule_activation(self, nm_ac, nm_dev):
+        delay = self._latency
+        for state in ACTIVATION_DEVICE_STATES:
+            delay += self._state_latency
+            self._schedule(
+                delay, self._set_activation_state, nm_ac, nm_dev, state
+            )
+
+    def _set_activation_state(self, nm_ac, nm_dev, state):
+        if nm_dev.get_active_connection() != nm_ac:
+            # Replaced by another activation
+            return
+        reason = (
+            NM.DeviceStateReason.NEW_ACTIVATION
+            if state == NM.DeviceState.PREPARE
+            else NM.DeviceStateReason.NONE
+        )
+        nm_dev.set_state(state, reason)
+        if state == NM.DeviceState.ACTIVATED:
+            nm_ac.set_state(NM.ActiveConnectionState.ACTIVATED)
+
+    def _deactivate(self, nm_ac, nm_dev):
+        if nm_ac in self._active_connections:
+            self._active_connections.remove(nm_ac)
+        if nm_dev.get_active_connection() == nm_ac:
+            nm_dev.set_active_connection(None)
+            nm_dev.set_state(
+                NM.DeviceState.DISCONNECTED,
+                NM.DeviceStateReason.USER_REQUESTED,
+            )
+        nm_ac.set_state(NM.ActiveConnectionState.DEACTIVATED)
+
+
+def _dispatch(data):
+    func, args = data
+    func(*args)
+    return GLib.SOURCE_REMOVE
@@ -0,0 +1,73 @@
+#
+# Copyright (c) 2021 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Benchmark of the time spent on importing libnmstate and on running
+`nmstatectl version`, each in a new python interpreter. The startup time of
+the interpreter itself is recorded as `import_none` for reference. The
+parsing of the YAML schema is compared with loading its precompiled JSON.
+"""
+
+import json
+import os
+import pkgutil
+import subprocess
+import sys
+
+import pytest
+import yaml
+
+import libnmstate
+from libnmstate import schema
+
+PROJECT_DIR = os.path.dirname(libnmstate.ROOT_DIR)
+CODES = {
+    "import_none": "pass",
+    "import_libnmstate": "import libnmstate",
+    "import_nmstatectl": "import nmstatectl.nmstatectl",
+    "nmstatectl_version": (
+        "import sys\n"
+        "from nmstatectl.nmstatectl import main\n"
+        "sys.argv = ['nmstatectl', 'version']\n"
+        "main()"
+    ),
+}
+
+
+@pytest.mark.parametrize("name", CODES.keys())
+def test_import_time(benchmark, name):
+    benchmark(name, _run_python, lambda: (CODES[name],))
+
+
+def test_schema_load(benchmark):
+    content = pkgutil.get_data("libnmstate", "schemas/operational-state.yaml")
+    precompiled = schema.precompile(content)
+    benchmark(
+        "schema_load_yaml",
+        lambda: yaml.load(content, Loader=yaml.SafeLoader),
+    )
+    benchmark("schema_load_precompiled", lambda: json.loads(precompiled))
+
+
+def _run_python(code):
+    subprocess.check_call(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_DIR,
+        stdout=subprocess.DEVNULL,
+    )
@@ -0,0 +1,110 @@
+#
+# Copyright (c) 2021 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Benchmark of the NetworkManager plugin applying synthetic topologies against
+the in-process fake NM.Client of `fake_nm`. Requires PyGObject and libnm, but
+not the NetworkManager daemon. Besides the wall time, the D-Bus round trips,
+emitted signals and GLib main context iterations are recorded as metrics.
+"""
+
+import copy
+from unittest import mock
+
+import pytest
+
+from libnmstate.net_state import NetState
+from libnmstate.schema import Interface
+from libnmstate.schema import InterfaceType
+
+from .topology import TOPOLOGIES
+
+gi = pytest.importorskip("gi")
+try:
+    gi.require_version("NM", "1.0")
+    from gi.repository import NM  # NOQA: F401
+except (ValueError, ImportError):
+    pytest.skip("libnm typelib not found", allow_module_level=True)
+
+from libnmstate.nm import context as nm_context  # NOQA: E402
+from libnmstate.nm.plugin import NetworkManagerPlugin  # NOQA: E402
+
+from . import fake_nm  # NOQA: E402
+
+
+class _NmWithFakeClient:
+    """
+    The `NM` module with `NM.Client.new()` returning the fake client.
+    """
+
+    def __init__(self, client):
+        self.Client = mock.Mock()
+        self.Client.new.return_value = client
+
+    def __getattr__(self, name):
+        return getattr(NM, name)
+
+
+@pytest.fixture(params=TOPOLOGIES.keys())
+def topology(request):
+    return request.param
+
+
+@pytest.fixture(params=[0, fake_nm.DEFAULT_LATENCY], ids=["0ms", "1ms"])
+def latency(request):
+    return request.param
+
+
+def test_nm_apply(benchmark, topology, iface_count, latency):
+    des_state = TOPOLOGIES[topology](iface_count)
+    eth_ifaces = [
+        iface
+        for iface in des_state[Interface.KEY]
+        if iface[Interface.TYPE] == InterfaceType.ETHERNET
+    ]
+
+    def setup():
+        client = fake_nm.FakeClient(latency=latency, state_latency=latency)
+        for iface in eth_ifaces:
+            client.add_device(iface[Interface.NAME], "ethernet")
+        net_state = NetState(
+            copy.deepcopy(des_state),
+            {Interface.KEY: copy.deepcopy(eth_ifaces)},
+            save_to_disk=False,
+        )
+        return client, net_state
+
+    benchmark("nm_apply", _apply, setup)
+
+
+def _apply(client, net_state):
+    with mock.patch.object(nm_context, "NM", _NmWithFakeClient(client)):
+        plugin = NetworkManagerPlugin()
+    try:
+        checkpoint = plugin.create_checkpoint()
+        plugin.start_action_timings()
+        plugin.apply_changes(net_state, False)
+        action_count = len(plugin.pop_action_timings())
+        plugin.destroy_checkpoint(checkpoint)
+    finally:
+        plugin.unload()
+    metrics = client.stats.to_dict()
+    metrics["actions"] = action_count
+    metrics["profiles"] = len(client.get_connections())
+    return metrics
@@ -0,0 +1,133 @@
+#
+# Copyright (c) 2021 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Benchmark of the state engine on synthetic topologies without
+NetworkManager or kernel, not included in the default test run. Run with:
+    pytest --log-cli-level=INFO tests/benchmark \
+        --benchmark-sizes=10,100,1000,10000 --benchmark-output=new.json
+Then compare with results of other commit:
+    python3 tests/benchmark/compare.py old.json new.json
+"""
+
+import copy
+
+import pytest
+
+from libnmstate import validator
+from libnmstate.net_state import NetState
+from libnmstate.prettystate import PrettyState
+from libnmstate.route import RouteState
+from libnmstate.route_rule import RouteRuleState
+from libnmstate.schema import Interface
+from libnmstate.schema import Route
+from libnmstate.schema import RouteRule
+
+from .topology import TOPOLOGIES
+
+ROUTE_TOPOLOGY = "route_rule"
+
+
+@pytest.fixture(params=TOPOLOGIES.keys())
+def topology(request):
+    return request.param
+
+
+@pytest.fixture
+def states(topology, iface_count):
+    gen = TOPOLOGIES[topology]
+    # The desired state is also the state after applied
+    return gen(iface_count), gen(iface_count, changed=True)
+
+
+def _gen_net_state(states):
+    cur_state, des_state = states
+    return NetState(
+        copy.deepcopy(des_state), copy.deepcopy(cur_state), save_to_disk=True
+    )
+
+
+def test_schema_validate(benchmark, states):
+    _, des_state = states
+    benchmark(
+        "schema_validate", validator.schema_validate, lambda: (des_state,)
+    )
+
+
+def test_net_state(benchmark, states):
+    benchmark(
+        "net_state",
+        NetState,
+        lambda: (copy.deepcopy(states[1]), copy.deepcopy(states[0])),
+    )
+
+
+def test_ifaces_verify(benchmark, states):
+    net_state = _gen_net_state(states)
+    benchmark(
+        "ifaces_verify",
+        net_state.ifaces.verify,
+        lambda: (copy.deepcopy(states[1][Interface.KEY]),),
+    )
+
+
+def test_pretty_state(benchmark, states):
+    _, des_state = states
+    benchmark("pretty_state_yaml", lambda: PrettyState(des_state).yaml)
+    benchmark("pretty_state_json", lambda: PrettyState(des_state).json)
+
+
+@pytest.mark.parametrize("topology", [ROUTE_TOPOLOGY])
+def test_route_merge_and_verify(benchmark, states):
+    cur_state, des_state = states
+    net_state = _gen_net_state(states)
+    benchmark(
+        "route_merge",
+        RouteState,
+        lambda: (
+            net_state.ifaces,
+            copy.deepcopy(des_state[Route.KEY]),
+            copy.deepcopy(cur_state[Route.KEY]),
+        ),
+    )
+    benchmark(
+        "route_verify",
+        net_state.route.verify,
+        lambda: (copy.deepcopy(des_state[Route.KEY]),),
+    )
+
+
+@pytest.mark.parametrize("topology", [ROUTE_TOPOLOGY])
+def test_route_rule_merge_and_verify(benchmark, states):
+    cur_state, des_state = states
+    net_state = _gen_net_state(states)
+    benchmark(
+        "route_rule_merge",
+        RouteRuleState,
+        lambda: (
+            net_state.route,
+            copy.deepcopy(des_state[RouteRule.KEY]),
+            copy.deepcopy(cur_state[RouteRule.KEY]),
+        ),
+    )
+    benchmark(
+        "route_rule_verify",
+        net_state.route_rule.verify,
+        lambda: (copy.deepcopy(des_state[RouteRule.KEY]),),
+    )
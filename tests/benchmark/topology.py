@@ -0,0 +1,210 @@
+#
+# Copyright (c) 2021 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Generators of synthetic network states used by the benchmarks. Each
+generator returns a state holding roughly `iface_count` interfaces.
+When `changed` is True, part of the interfaces are modified and more routes
+are added, so the returned state could be used as desired state against the
+unchanged one.
+"""
+
+from libnmstate.schema import Bond
+from libnmstate.schema import BondMode
+from libnmstate.schema import Interface
+from libnmstate.schema import InterfaceIPv4
+from libnmstate.schema import InterfaceIPv6
+from libnmstate.schema import InterfaceState
+from libnmstate.schema import InterfaceType
+from libnmstate.schema import LinuxBridge
+from libnmstate.schema import OVSBridge
+from libnmstate.schema import Route
+from libnmstate.schema import RouteRule
+from libnmstate.schema import VLAN
+
+# One in every CHANGE_RATIO interfaces is modified
+CHANGE_RATIO = 10
+OVS_PORTS_PER_BRIDGE = 100
+ROUTES_PER_IFACE = 4
+MTU = 1500
+CHANGED_MTU = 1400
+
+
+def gen_ethernet_vlan(iface_count, changed=False):
+    ifaces = []
+    for i in range(iface_count // 2):
+        ifaces.append(_gen_iface(f"eth{i}", InterfaceType.ETHERNET))
+        vlan = _gen_iface(
+            f"eth{i}.{i % 4094 + 1}",
+            InterfaceType.VLAN,
+            ipv4_index=i,
+            changed=changed and i % CHANGE_RATIO == 0,
+        )
+        vlan[VLAN.CONFIG_SUBTREE] = {
+            VLAN.ID: i % 4094 + 1,
+            VLAN.BASE_IFACE: f"eth{i}",
+        }
+        ifaces.append(vlan)
+    return {Interface.KEY: ifaces}
+
+
+def gen_bond_bridge_vlan(iface_count, changed=False):
+    """
+    Stacks of two ethernet ports bonded, VLAN on top of bond and the VLAN
+    attached to a linux bridge holding the IP.
+    """
+    ifaces = []
+    for i in range(max(iface_count // 5, 1)):
+        eth_names = [f"eth{i * 2}", f"eth{i * 2 + 1}"]
+        for eth_name in eth_names:
+            ifaces.append(_gen_iface(eth_name, InterfaceType.ETHERNET))
+        bond = _gen_iface(f"bond{i}", InterfaceType.BOND)
+        bond[Bond.CONFIG_SUBTREE] = {
+            Bond.MODE: BondMode.ACTIVE_BACKUP,
+            Bond.PORT: eth_names,
+        }
+        ifaces.append(bond)
+        vlan = _gen_iface(f"bond{i}.100", InterfaceType.VLAN)
+        vlan[VLAN.CONFIG_SUBTREE] = {
+            VLAN.ID: 100,
+            VLAN.BASE_IFACE: f"bond{i}",
+        }
+        ifaces.append(vlan)
+        bridge = _gen_iface(
+            f"br{i}",
+            InterfaceType.LINUX_BRIDGE,
+            ipv4_index=i,
+            changed=changed and i % CHANGE_RATIO == 0,
+        )
+        bridge[LinuxBridge.CONFIG_SUBTREE] = {
+            LinuxBridge.PORT_SUBTREE: [{LinuxBridge.Port.NAME: f"bond{i}.100"}]
+        }
+        ifaces.append(bridge)
+    return {Interface.KEY: ifaces}
+
+
+def gen_ovs_bridge(iface_count, changed=False):
+    """
+    OVS bridges each holding OVS_PORTS_PER_BRIDGE internal interfaces.
+    """
+    ifaces = []
+    port_count = max(iface_count, 1)
+    for i in range(port_count):
+        ifaces.append(
+            _gen_iface(
+                f"ovs{i}",
+                InterfaceType.OVS_INTERFACE,
+                ipv4_index=i,
+                changed=changed and i % CHANGE_RATIO == 0,
+            )
+        )
+    for start in range(0, port_count, OVS_PORTS_PER_BRIDGE):
+        end = min(start + OVS_PORTS_PER_BRIDGE, port_count)
+        ifaces.append(
+            {
+                Interface.NAME: f"ovs-br{start // OVS_PORTS_PER_BRIDGE}",
+                Interface.TYPE: InterfaceType.OVS_BRIDGE,
+                Interface.STATE: InterfaceState.UP,
+                OVSBridge.CONFIG_SUBTREE: {
+                    OVSBridge.PORT_SUBTREE: [
+                        {OVSBridge.Port.NAME: f"ovs{i}"}
+                        for i in range(start, end)
+                    ]
+                },
+            }
+        )
+    return {Interface.KEY: ifaces}
+
+
+def gen_route_rule(iface_count, changed=False):
+    """
+    Ethernet interfaces each holding ROUTES_PER_IFACE routes in its own
+    route table and a route rule pointing to that table.
+    """
+    ifaces = []
+    routes = []
+    rules = []
+    for i in range(iface_count):
+        iface_name = f"eth{i}"
+        ifaces.append(
+            _gen_iface(iface_name, InterfaceType.ETHERNET, ipv4_index=i)
+        )
+        table_id = i + 100
+        # Changed state holds one more route on some interfaces
+        route_count = ROUTES_PER_IFACE
+        if changed and i % CHANGE_RATIO == 0:
+            route_count += 1
+        for j in range(route_count):
+            routes.append(
+                {
+                    Route.DESTINATION: f"172.{16 + j}.{i // 256 % 256}."
+                    f"{i % 256}/32",
+                    Route.NEXT_HOP_ADDRESS: _gen_ipv4(i, 254),
+                    Route.NEXT_HOP_INTERFACE: iface_name,
+                    Route.METRIC: 100,
+                    Route.TABLE_ID: table_id,
+                }
+            )
+        rules.append(
+            {
+                RouteRule.IP_FROM: f"{_gen_ipv4(i, 0)}/24",
+                RouteRule.PRIORITY: 1000 + i,
+                RouteRule.ROUTE_TABLE: table_id,
+            }
+        )
+    return {
+        Interface.KEY: ifaces,
+        Route.KEY: {Route.CONFIG: routes},
+        RouteRule.KEY: {RouteRule.CONFIG: rules},
+    }
+
+
+TOPOLOGIES = {
+    "ethernet_vlan": gen_ethernet_vlan,
+    "bond_bridge_vlan": gen_bond_bridge_vlan,
+    "ovs_bridge": gen_ovs_bridge,
+    "route_rule": gen_route_rule,
+}
+
+
+def _gen_iface(name, iface_type, ipv4_index=None, changed=False):
+    iface = {
+        Interface.NAME: name,
+        Interface.TYPE: iface_type,
+        Interface.STATE: InterfaceState.UP,
+        Interface.MTU: CHANGED_MTU if changed else MTU,
+        Interface.IPV4: {InterfaceIPv4.ENABLED: False},
+        Interface.IPV6: {InterfaceIPv6.ENABLED: False},
+    }
+    if ipv4_index is not None:
+        iface[Interface.IPV4] = {
+            InterfaceIPv4.ENABLED: True,
+            InterfaceIPv4.DHCP: False,
+            InterfaceIPv4.ADDRESS: [
+                {
+                    InterfaceIPv4.ADDRESS_IP: _gen_ipv4(ipv4_index, 1),
+                    InterfaceIPv4.ADDRESS_PREFIX_LENGTH: 24,
+                }
+            ],
+        }
+    return iface
+
+
+def _gen_ipv4(index, host):
+    return f"10.{index // 256 % 256}.{index % 256}.{host}"
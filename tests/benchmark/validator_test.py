@@ -0,0 +1,67 @@
+#
+# Copyright (c) 2021 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Benchmark of libnmstate.validator.schema_validate(), not included in the
+default test run. Run with:
+    pytest --log-cli-level=INFO tests/benchmark
+"""
+
+from libnmstate import validator
+from libnmstate.schema import Interface
+from libnmstate.schema import InterfaceIPv4
+from libnmstate.schema import InterfaceIPv6
+from libnmstate.schema import InterfaceState
+from libnmstate.schema import InterfaceType
+
+
+def _gen_state(iface_count):
+    ifaces = []
+    for i in range(iface_count):
+        iface = {
+            Interface.NAME: f"eth{i}",
+            Interface.STATE: InterfaceState.UP,
+            Interface.MTU: 1500,
+            Interface.IPV4: {
+                InterfaceIPv4.ENABLED: True,
+                InterfaceIPv4.DHCP: False,
+                InterfaceIPv4.ADDRESS: [
+                    {
+                        InterfaceIPv4.ADDRESS_IP: f"10.{i // 256 % 256}."
+                        f"{i % 256}.1",
+                        InterfaceIPv4.ADDRESS_PREFIX_LENGTH: 24,
+                    }
+                ],
+            },
+            Interface.IPV6: {InterfaceIPv6.ENABLED: False},
+        }
+        # Leave some interfaces without type to be defaulted as unknown
+        if i % 2:
+            iface[Interface.TYPE] = InterfaceType.ETHERNET
+        ifaces.append(iface)
+    return {Interface.KEY: ifaces}
+
+
+def test_schema_validate_untyped_ifaces(benchmark, iface_count):
+    state = _gen_state(iface_count)
+    benchmark(
+        "schema_validate_untyped_ifaces",
+        validator.schema_validate,
+        lambda: (state,),
+    )
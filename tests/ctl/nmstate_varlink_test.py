@@ -0,0 +1,267 @@
+#
+# Copyright (c) 2021 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+import socket
+import threading
+import time
+
+from unittest import mock
+
+import pytest
+
+from libnmstate.schema import DNS
+from libnmstate.schema import Interface
+from libnmstate.schema import InterfaceType
+from libnmstate.schema import Route
+from nmstatectl import nmstate_varlink
+from nmstatectl.nmstate_varlink import NmstateVarlinkService
+from nmstatectl.nmstate_varlink import ReadWriteLock
+from nmstatectl.nmstate_varlink import RequestCoordinator
+from nmstatectl.nmstate_varlink import ShowCache
+from nmstatectl.nmstate_varlink import StateChangeWatcher
+from nmstatectl.nmstate_varlink import _InFlightCall
+from nmstatectl.nmstate_varlink import gen_state_delta
+
+WAIT_TIMEOUT = 5
+
+
+def test_concurrent_identical_reads_are_coalesced():
+    coordinator = RequestCoordinator()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    results = []
+
+    def _show():
+        calls.append(1)
+        started.set()
+        release.wait(WAIT_TIMEOUT)
+        return {"foo": 1}
+
+    def _request():
+        results.append(coordinator.read(("Show", False), _show))
+
+    threads = [threading.Thread(target=_request) for _ in range(3)]
+    threads[0].start()
+    started.wait(WAIT_TIMEOUT)
+    waiting_followers = []
+    orig_result = _InFlightCall.result
+
+    def _result(call):
+        waiting_followers.append(1)
+        return orig_result(call)
+
+    with mock.patch.object(_InFlightCall, "result", _result):
+        for thread in threads[1:]:
+            thread.start()
+        while len(waiting_followers) != 2:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(WAIT_TIMEOUT)
+
+    assert len(calls) == 1
+    assert results == [{"foo": 1}] * 3
+
+
+def test_failure_shared_by_coalesced_reads():
+    coordinator = RequestCoordinator()
+
+    def _show():
+        raise ValueError("foo")
+
+    with pytest.raises(ValueError):
+        coordinator.read(("Show", False), _show)
+    # Failed call is not cached
+    assert coordinator.read(("Show", False), lambda: "bar") == "bar"
+
+
+def test_exclusive_change_wait_for_readers():
+    lock = ReadWriteLock()
+    events = []
+
+    with lock.read_locked():
+        writer = threading.Thread(
+            target=lambda: _hold_write_lock(lock, events)
+        )
+        writer.start()
+        while not lock.stats["waiting_writers"]:
+            time.sleep(0.01)
+        events.append("read")
+    writer.join(WAIT_TIMEOUT)
+
+    assert events == ["read", "write"]
+
+
+def test_waiting_writer_block_new_readers():
+    lock = ReadWriteLock()
+    events = []
+
+    with lock.read_locked():
+        writer = threading.Thread(
+            target=lambda: _hold_write_lock(lock, events)
+        )
+        writer.start()
+        while not lock.stats["waiting_writers"]:
+            time.sleep(0.01)
+        reader = threading.Thread(target=lambda: _hold_read_lock(lock, events))
+        reader.start()
+    writer.join(WAIT_TIMEOUT)
+    reader.join(WAIT_TIMEOUT)
+
+    assert events == ["write", "read"]
+
+
+def _hold_write_lock(lock, events):
+    with lock.write_locked():
+        events.append("write")
+
+
+def _hold_read_lock(lock, events):
+    with lock.read_locked():
+        events.append("read")
+
+
+ETH1 = {Interface.NAME: "eth1", Interface.TYPE: InterfaceType.ETHERNET}
+ETH2 = {Interface.NAME: "eth2", Interface.TYPE: InterfaceType.ETHERNET}
+ROUTE1 = {
+    Route.DESTINATION: "198.51.100.0/24",
+    Route.NEXT_HOP_INTERFACE: "eth1",
+}
+ROUTE2 = {
+    Route.DESTINATION: "203.0.113.0/24",
+    Route.NEXT_HOP_INTERFACE: "eth1",
+}
+
+
+def _gen_state(ifaces, routes, dns_servers):
+    return {
+        Interface.KEY: ifaces,
+        Route.KEY: {Route.RUNNING: routes, Route.CONFIG: []},
+        DNS.KEY: {DNS.RUNNING: {DNS.SERVER: dns_servers}},
+    }
+
+
+def test_state_delta_from_empty_is_full_state():
+    state = _gen_state([ETH1], [ROUTE1], ["192.0.2.1"])
+
+    assert gen_state_delta({}, state) == {
+        Interface.KEY: {"updated": [ETH1], "removed": []},
+        Route.KEY: {Route.RUNNING: {"added": [ROUTE1], "removed": []}},
+        DNS.KEY: state[DNS.KEY],
+    }
+
+
+def test_state_delta_of_changes():
+    old_state = _gen_state([ETH1, ETH2], [ROUTE1], ["192.0.2.1"])
+    eth1 = dict(ETH1)
+    eth1[Interface.MTU] = 9000
+    new_state = _gen_state([eth1], [ROUTE2], ["192.0.2.1"])
+
+    assert gen_state_delta(old_state, new_state) == {
+        Interface.KEY: {"updated": [eth1], "removed": [ETH2]},
+        Route.KEY: {Route.RUNNING: {"added": [ROUTE2], "removed": [ROUTE1]}},
+    }
+
+
+def test_state_delta_of_reordered_routes():
+    old_state = _gen_state([ETH1], [ROUTE1, ROUTE2], ["192.0.2.1"])
+    new_state = _gen_state(
+        [ETH1], [ROUTE2, dict(reversed(list(ROUTE1.items())))], ["192.0.2.1"]
+    )
+
+    assert gen_state_delta(old_state, new_state) == {}
+
+
+def test_state_delta_of_no_change():
+    state = _gen_state([ETH1], [ROUTE1], ["192.0.2.1"])
+
+    assert gen_state_delta(state, state) == {}
+
+
+def test_watcher_wait_for_notification():
+    watcher = StateChangeWatcher()
+    generation = watcher.generation
+    assert watcher.wait(generation, 0) == generation
+
+    watcher.notify()
+    assert watcher.wait(generation, WAIT_TIMEOUT) != generation
+
+
+@mock.patch("nmstatectl.nmstate_varlink._gen_nm_change_monitor")
+@mock.patch("nmstatectl.nmstate_varlink.NetlinkMonitor")
+def test_watcher_disabled_on_netlink_failure(monitor_mock, nm_monitor_mock):
+    nm_monitor_mock.return_value = None
+    failed = threading.Event()
+
+    def _wait(*_args):
+        failed.set()
+        raise OSError("foo")
+
+    monitor_mock.return_value.wait.side_effect = _wait
+    watcher = StateChangeWatcher()
+    generation = watcher.generation
+
+    assert watcher.start()
+    failed.wait(WAIT_TIMEOUT)
+    assert watcher.wait(generation, WAIT_TIMEOUT) != generation
+    assert not watcher.start()
+
+
+@mock.patch("nmstatectl.nmstate_varlink.libnmstate.show")
+def test_show_cache_not_used_when_watcher_disabled(show_mock):
+    show_mock.side_effect = [{"foo": 1}, {"foo": 2}, {"foo": 3}]
+    watcher = mock.Mock()
+    watcher.start.return_value = True
+    watcher.generation = 1
+    show_cache = ShowCache(watcher)
+
+    assert show_cache.show() == {"foo": 1}
+    assert show_cache.show() == {"foo": 1}
+
+    watcher.start.return_value = False
+    assert show_cache.show() == {"foo": 2}
+    assert show_cache.show() == {"foo": 3}
+
+
+@mock.patch.object(nmstate_varlink, "MONITOR_POLL_INTERVAL", 0.01)
+@mock.patch.object(
+    nmstate_varlink.NmstateVarlinkLogHandler,
+    "logs",
+    new_callable=mock.PropertyMock,
+    return_value=[],
+)
+@mock.patch.object(nmstate_varlink.libnmstate, "show")
+@mock.patch.object(StateChangeWatcher, "start", return_value=True)
+def test_monitor_stops_when_client_disconnected(
+    _start_mock, show_mock, _logs_mock
+):
+    show_mock.return_value = {"foo": 1}
+    server_sock, client_sock = socket.socketpair()
+    try:
+        replies = NmstateVarlinkService().Monitor(
+            {}, _more=True, _request=server_sock
+        )
+        assert next(replies)["changes"] == {"foo": 1}
+
+        client_sock.close()
+        with pytest.raises(StopIteration):
+            next(replies)
+    finally:
+        server_sock.close()
+        client_sock.close()
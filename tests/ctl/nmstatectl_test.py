@@ -18,10 +18,14 @@
 #
 import io
 import json
+import os
 import subprocess
 
 from unittest import mock
 
+import yaml
+
+from libnmstate.error import NmstateValueError
 from nmstatectl import nmstatectl
 
 LO_JSON_STATE = """{
@@ -82,6 +86,9 @@ def _mock_libnmstate_apply_func(
     commit=True,
     rollback_timeout=60,
     save_to_disk=True,
+    scoped_checkpoint=False,
+    kernel_only=False,
+    timings_callback=None,
 ):
     return None
 
@@ -95,6 +102,104 @@ def test_run_ctl_directly_set():
     nmstatectl.main()
 
 
+@mock.patch(
+    "sys.argv",
+    ["nmstatectl", "apply", "--scoped-checkpoint", "mystate.json"],
+)
+@mock.patch.object(
+    nmstatectl, "open", mock.mock_open(read_data="{}"), create=True
+)
+def test_run_ctl_directly_apply_with_scoped_checkpoint():
+    with mock.patch.object(nmstatectl.libnmstate, "apply") as apply_mock:
+        nmstatectl.main()
+
+    assert apply_mock.call_args[1]["scoped_checkpoint"] is True
+
+
+@mock.patch("sys.argv", ["nmstatectl", "apply", "--kernel", "mystate.json"])
+@mock.patch.object(
+    nmstatectl, "open", mock.mock_open(read_data="{}"), create=True
+)
+def test_run_ctl_directly_apply_with_kernel_only():
+    with mock.patch.object(nmstatectl.libnmstate, "apply") as apply_mock:
+        nmstatectl.main()
+
+    assert apply_mock.call_args[1]["kernel_only"] is True
+    assert apply_mock.call_args[1]["save_to_disk"] is False
+
+
+def _mock_libnmstate_apply_with_timings(state, timings_callback, **kwargs):
+    timings_callback({"total": 1.5, "phases": {"apply": 1.0}})
+
+
+@mock.patch("sys.argv", ["nmstatectl", "apply", "--timings", "mystate.yml"])
+@mock.patch.object(
+    nmstatectl.libnmstate, "apply", _mock_libnmstate_apply_with_timings
+)
+@mock.patch.object(
+    nmstatectl, "open", mock.mock_open(read_data="{}"), create=True
+)
+def test_run_ctl_directly_apply_with_timings(capsys):
+    nmstatectl.main()
+
+    err = capsys.readouterr().err
+    assert err.startswith("Timings:")
+    assert yaml.safe_load(err.split("\n", 1)[1]) == {
+        "total": 1.5,
+        "phases": {"apply": 1.0},
+    }
+
+
+@mock.patch("sys.argv", ["nmstatectl", "gen-conf", "mystate.json"])
+@mock.patch.object(
+    nmstatectl.libnmstate,
+    "generate_configurations",
+    lambda state: {"NetworkManager": [["eth1.nmconnection", "[connection]"]]},
+)
+@mock.patch.object(
+    nmstatectl, "open", mock.mock_open(read_data="{}"), create=True
+)
+@mock.patch("nmstatectl.nmstatectl.sys.stdout", new_callable=io.StringIO)
+def test_run_ctl_directly_gen_conf(mock_stdout):
+    nmstatectl.main()
+    assert yaml.safe_load(mock_stdout.getvalue()) == {
+        "NetworkManager": [["eth1.nmconnection", "[connection]"]]
+    }
+
+
+def test_run_ctl_directly_gen_conf_to_output_dir(tmpdir):
+    with mock.patch(
+        "sys.argv",
+        ["nmstatectl", "gen-conf", "--output-dir", str(tmpdir), "s.json"],
+    ), mock.patch.object(
+        nmstatectl.libnmstate,
+        "generate_configurations",
+        lambda state: {"NetworkManager": [["eth1.nmconnection", "[conn]"]]},
+    ), mock.patch.object(
+        nmstatectl, "open", mock.mock_open(read_data="{}"), create=True
+    ):
+        nmstatectl.main()
+
+    keyfile = tmpdir.join("NetworkManager", "eth1.nmconnection")
+    assert keyfile.read() == "[conn]"
+    assert keyfile.stat().mode & 0o777 == 0o600
+
+
+@mock.patch("sys.argv", ["nmstatectl", "gen-conf", "mystate.json"])
+@mock.patch.object(
+    nmstatectl.libnmstate,
+    "generate_configurations",
+    side_effect=NmstateValueError("foo"),
+)
+@mock.patch.object(
+    nmstatectl, "open", mock.mock_open(read_data="{}"), create=True
+)
+@mock.patch("nmstatectl.nmstatectl.sys.stderr", new_callable=io.StringIO)
+def test_run_ctl_directly_gen_conf_invalid_state(mock_stderr, _gen_conf_mock):
+    assert nmstatectl.main() == os.EX_DATAERR
+    assert "foo" in mock_stderr.getvalue()
+
+
 @mock.patch("sys.argv", ["nmstatectl", "show"])
 @mock.patch.object(nmstatectl.libnmstate, "show", lambda: {})
 def test_run_ctl_directly_show_empty():
@@ -87,6 +87,51 @@ def test_varlink_show(server):
         assert varlink_state["state"] == lib_state
 
 
+def test_varlink_show_after_change_outside_service(server):
+    iface_name = "varlink_test1"
+    with varlink.Client(_format_address(server.server_address)).open(
+        VARLINK_INTERFACE, namespaced=False
+    ) as con:
+        con._call("Show")
+        subprocess.run(
+            ("ip", "link", "add", iface_name, "type", "dummy"), check=True
+        )
+        try:
+            # Allow the netlink notification to reach the service
+            time.sleep(1)
+            varlink_state = con._call("Show")
+            assert any(
+                iface[Interface.NAME] == iface_name
+                for iface in varlink_state["state"][Interface.KEY]
+            )
+        finally:
+            subprocess.run(("ip", "link", "del", iface_name))
+
+
+def test_varlink_monitor(server):
+    iface_name = "varlink_test2"
+    with varlink.Client(_format_address(server.server_address)).open(
+        VARLINK_INTERFACE, namespaced=False
+    ) as con:
+        replies = con._call_more("Monitor", {})
+        first_reply = next(replies)
+        assert first_reply["changes"][Interface.KEY]["updated"]
+
+        subprocess.run(
+            ("ip", "link", "add", iface_name, "type", "dummy"), check=True
+        )
+        try:
+            changes = next(replies)["changes"]
+            while Interface.KEY not in changes:
+                changes = next(replies)["changes"]
+            assert any(
+                iface[Interface.NAME] == iface_name
+                for iface in changes[Interface.KEY]["updated"]
+            )
+        finally:
+            subprocess.run(("ip", "link", "del", iface_name))
+
+
 def test_varlink_show_running_config(server):
     lib_state = libnmstate.show_running_config()
     with varlink.Client(_format_address(server.server_address)).open(
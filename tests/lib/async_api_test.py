@@ -0,0 +1,134 @@
+#
+# Copyright (c) 2021 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+import asyncio
+import threading
+import time
+
+from unittest import mock
+
+import pytest
+
+from libnmstate import async_api
+
+WAIT_TIMEOUT = 5
+
+
+def _run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+@pytest.fixture
+def show_mock():
+    with mock.patch.object(async_api, "show") as m:
+        yield m
+
+
+@pytest.fixture
+def apply_mock():
+    with mock.patch.object(async_api, "apply") as m:
+        yield m
+
+
+def test_show_async(show_mock):
+    show_mock.return_value = {"foo": 1}
+
+    assert _run(async_api.show_async(include_status_data=True)) == {"foo": 1}
+    show_mock.assert_called_once_with(include_status_data=True, fields=None)
+
+
+def test_show_async_calls_overlap(show_mock):
+    # Both calls have to be running at the same time to pass the barrier
+    barrier = threading.Barrier(2, timeout=WAIT_TIMEOUT)
+    show_mock.side_effect = lambda **_: barrier.wait()
+
+    async def _show_twice():
+        return await asyncio.gather(
+            async_api.show_async(), async_api.show_async()
+        )
+
+    assert sorted(_run(_show_twice())) == [0, 1]
+
+
+def test_apply_async_serialized(apply_mock):
+    running = []
+    max_running = []
+
+    def _apply(*_args, **_kwargs):
+        running.append(1)
+        max_running.append(len(running))
+        time.sleep(0.1)
+        running.pop()
+
+    apply_mock.side_effect = _apply
+
+    async def _apply_twice():
+        await asyncio.gather(
+            async_api.apply_async({}), async_api.apply_async({})
+        )
+
+    _run(_apply_twice())
+
+    assert max(max_running) == 1
+    apply_mock.assert_called_with(
+        {},
+        verify_change=True,
+        commit=True,
+        rollback_timeout=60,
+        save_to_disk=True,
+        scoped_checkpoint=False,
+        kernel_only=False,
+        timings_callback=None,
+    )
+
+
+def test_show_async_not_blocked_by_queued_changes(show_mock, apply_mock):
+    release = threading.Event()
+    apply_mock.side_effect = lambda *_args, **_kwargs: release.wait(
+        WAIT_TIMEOUT
+    )
+    show_mock.return_value = {"foo": 1}
+    change_count = async_api.ASYNC_MAX_WORKERS + 1
+
+    async def _show_while_changing():
+        changes = [
+            asyncio.ensure_future(async_api.apply_async({}))
+            for _ in range(change_count)
+        ]
+        try:
+            return await asyncio.wait_for(
+                async_api.show_async(), WAIT_TIMEOUT / 2
+            )
+        finally:
+            release.set()
+            await asyncio.gather(*changes)
+
+    assert _run(_show_while_changing()) == {"foo": 1}
+    assert apply_mock.call_count == change_count
+
+
+def test_show_async_raise_error(show_mock):
+    show_mock.side_effect = ValueError("foo")
+
+    with pytest.raises(ValueError):
+        _run(async_api.show_async())
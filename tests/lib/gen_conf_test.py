@@ -0,0 +1,103 @@
+#
+# Copyright (c) 2021 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+from unittest import mock
+
+import pytest
+
+from libnmstate import gen_conf
+from libnmstate.error import NmstateValueError
+from libnmstate.schema import Bond
+from libnmstate.schema import BondMode
+from libnmstate.schema import Interface
+from libnmstate.schema import InterfaceState
+from libnmstate.schema import InterfaceType
+
+BOND_STATE = {
+    Interface.KEY: [
+        {
+            Interface.NAME: "bond99",
+            Interface.TYPE: InterfaceType.BOND,
+            Interface.STATE: InterfaceState.UP,
+            Bond.CONFIG_SUBTREE: {
+                Bond.MODE: BondMode.ROUND_ROBIN,
+                Bond.PORT: ["eth1"],
+            },
+        }
+    ]
+}
+
+
+@pytest.fixture
+def generate_nm_keyfiles_mock():
+    with mock.patch.object(gen_conf, "_generate_nm_keyfiles") as m:
+        yield m
+
+
+def test_generate_configurations_without_current_state(
+    generate_nm_keyfiles_mock,
+):
+    desired_state = {
+        Interface.KEY: BOND_STATE[Interface.KEY]
+        + [
+            {
+                Interface.NAME: "eth1",
+                Interface.TYPE: InterfaceType.ETHERNET,
+                Interface.STATE: InterfaceState.UP,
+            }
+        ]
+    }
+    generate_nm_keyfiles_mock.return_value = [["bond99.nmconnection", ""]]
+
+    configs = gen_conf.generate_configurations(desired_state)
+
+    assert configs == {gen_conf.NM_PLUGIN_NAME: [["bond99.nmconnection", ""]]}
+    net_state = generate_nm_keyfiles_mock.call_args[0][0]
+    bond_iface = net_state.ifaces.all_kernel_ifaces["bond99"]
+    assert bond_iface.is_desired
+    assert net_state.ifaces.all_kernel_ifaces["eth1"].controller == "bond99"
+
+
+@pytest.mark.parametrize(
+    "iface_type", [InterfaceType.UNKNOWN, InterfaceType.OTHER]
+)
+def test_generate_configurations_with_unsupported_iface_type(
+    generate_nm_keyfiles_mock, iface_type
+):
+    desired_state = {
+        Interface.KEY: [
+            {
+                Interface.NAME: "foo",
+                Interface.TYPE: iface_type,
+                Interface.STATE: InterfaceState.UP,
+            }
+        ]
+    }
+
+    with pytest.raises(NmstateValueError):
+        gen_conf.generate_configurations(desired_state)
+    generate_nm_keyfiles_mock.assert_not_called()
+
+
+def test_generate_configurations_with_undefined_port(
+    generate_nm_keyfiles_mock,
+):
+    with pytest.raises(NmstateValueError):
+        gen_conf.generate_configurations(BOND_STATE)
+    generate_nm_keyfiles_mock.assert_not_called()
@@ -0,0 +1,68 @@
+#
+# Copyright (c) 2021 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+import pytest
+
+from libnmstate.ifaces.base_iface import BaseIface
+from libnmstate.ifaces.info_view import InfoListView
+from libnmstate.ifaces.info_view import InfoView
+from libnmstate.schema import Interface
+
+from ..testlib.ifacelib import gen_foo_iface_info_static_ip
+
+
+class TestInfoView:
+    def test_read_nested_data(self):
+        info = {"dict_a": {"list_b": [{"item_c": 1}]}}
+        view = InfoView(info)
+
+        assert isinstance(view["dict_a"], InfoView)
+        assert isinstance(view["dict_a"]["list_b"], InfoListView)
+        assert view["dict_a"]["list_b"][0]["item_c"] == 1
+        assert view == info
+        assert view["dict_a"]["list_b"] == info["dict_a"]["list_b"]
+
+    def test_view_is_read_only(self):
+        view = InfoView({"dict_a": {"list_b": [1]}})
+
+        with pytest.raises(TypeError):
+            view["dict_a"]["item_c"] = 1
+        with pytest.raises(AttributeError):
+            view["dict_a"]["list_b"].append(2)
+
+    def test_to_dict_is_a_copy(self):
+        info = {"dict_a": {"item_b": 1}}
+        copied = InfoView(info).to_dict()
+        copied["dict_a"]["item_b"] = 2
+
+        assert info["dict_a"]["item_b"] == 1
+
+
+class TestBaseIfaceDictView:
+    def test_dict_view_match_to_dict(self):
+        iface = BaseIface(gen_foo_iface_info_static_ip())
+
+        assert iface.to_dict_view() == iface.to_dict()
+
+    def test_dict_view_reflect_changes(self):
+        iface = BaseIface(gen_foo_iface_info_static_ip())
+        view = iface.to_dict_view()
+        iface.raw[Interface.MTU] = 9000
+
+        assert view[Interface.MTU] == 9000
@@ -19,6 +19,8 @@
 
 from copy import deepcopy
 from operator import itemgetter
+import socket
+import threading
 
 import pytest
 
@@ -29,6 +31,8 @@ from libnmstate.schema import InterfaceType
 
 from libnmstate.ifaces.ovs import OvsBridgeIface
 from libnmstate.ifaces.ovs import OvsInternalIface
+from libnmstate.ifaces.ovs import is_ovs_running
+from libnmstate.ifaces.ovs import ovs_running_cache
 from libnmstate.ifaces.ifaces import Ifaces
 
 from ..testlib.constants import PORT1_IFACE_NAME
@@ -243,3 +247,63 @@ class TestOvsInternalIface:
         assert OvsInternalIface(gen_ovs_bridge_info()).can_have_ip_as_port
 
     # The 'parent' property is tested by `test_auto_create_ovs_interface`.
+
+
+class TestIsOvsRunning:
+    @pytest.fixture
+    def ovs_db_socket_path(self, tmp_path, monkeypatch):
+        socket_path = str(tmp_path / "db.sock")
+        monkeypatch.setenv("OVS_DB_UNIX_SOCKET_PATH", socket_path)
+        yield socket_path
+
+    def test_ovs_db_socket_listening(self, ovs_db_socket_path):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.bind(ovs_db_socket_path)
+            sock.listen(1)
+            assert is_ovs_running()
+
+    def test_ovs_db_socket_not_exist(self, ovs_db_socket_path):
+        assert not is_ovs_running()
+
+    def test_ovs_db_socket_not_listening(self, ovs_db_socket_path):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.bind(ovs_db_socket_path)
+            assert not is_ovs_running()
+
+    def test_result_is_cached_within_context(self, ovs_db_socket_path):
+        with ovs_running_cache():
+            assert not is_ovs_running()
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.bind(ovs_db_socket_path)
+                sock.listen(1)
+                assert not is_ovs_running()
+                # New context probes again
+                with ovs_running_cache():
+                    assert is_ovs_running()
+                assert not is_ovs_running()
+
+    def test_result_not_cached_without_context(self, ovs_db_socket_path):
+        assert not is_ovs_running()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.bind(ovs_db_socket_path)
+            sock.listen(1)
+            assert is_ovs_running()
+
+    def test_cache_not_shared_between_threads(self, ovs_db_socket_path):
+        results = []
+
+        def _probe_in_other_thread():
+            with ovs_running_cache():
+                results.append(is_ovs_running())
+
+        with ovs_running_cache():
+            assert not is_ovs_running()
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.bind(ovs_db_socket_path)
+                sock.listen(1)
+                thread = threading.Thread(target=_probe_in_other_thread)
+                thread.start()
+                thread.join()
+                assert not is_ovs_running()
+
+        assert results == [True]
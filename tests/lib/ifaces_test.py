@@ -164,6 +164,21 @@ class TestIfaces:
         des_iface_infos = self._gen_iface_infos()
         Ifaces(des_iface_infos, cur_iface_infos)
 
+    def test_iface_names_to_verify(self):
+        cur_iface_infos = self._gen_iface_infos()
+        cur_iface_infos[0][Interface.NAME] = PORT1_IFACE_NAME
+        cur_iface_infos[1][Interface.NAME] = PORT2_IFACE_NAME
+        not_changed_iface_info = gen_foo_iface_info()
+        not_changed_iface_info[Interface.NAME] = FOO3_IFACE_NAME
+        cur_iface_infos.append(not_changed_iface_info)
+        des_iface_info = gen_bridge_iface_info()
+
+        ifaces = Ifaces([des_iface_info], cur_iface_infos)
+
+        assert ifaces.iface_names_to_verify == set(
+            [LINUX_BRIDGE_IFACE_NAME, PORT1_IFACE_NAME, PORT2_IFACE_NAME]
+        )
+
     def test_remove_unknown_interfaces(self):
         des_iface_infos = self._gen_iface_infos()
         cur_iface_info = {
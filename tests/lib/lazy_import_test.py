@@ -0,0 +1,81 @@
+#
+# Copyright (c) 2021 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import libnmstate
+from libnmstate import schema
+
+HEAVY_MODULES = ("gi", "jsonschema", "nispor", "varlink", "yaml")
+PROJECT_DIR = os.path.dirname(libnmstate.ROOT_DIR)
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (3, 7),
+    reason="Lazy import requires module __getattr__() of Python 3.7+",
+)
+
+
+def _get_imported_heavy_modules(code):
+    output = subprocess.check_output(
+        [
+            sys.executable,
+            "-c",
+            f"{code}\n"
+            "import sys\n"
+            "print(' '.join(sorted(set("
+            "name.split('.')[0] for name in sys.modules))))",
+        ],
+        cwd=PROJECT_DIR,
+        universal_newlines=True,
+    )
+    return set(output.split()) & set(HEAVY_MODULES)
+
+
+def test_import_libnmstate_does_not_import_heavy_modules():
+    assert _get_imported_heavy_modules("import libnmstate") == set()
+
+
+def test_schema_constants_does_not_import_heavy_modules():
+    code = "from libnmstate.schema import Interface\nInterface.KEY"
+
+    assert _get_imported_heavy_modules(code) == set()
+
+
+def test_import_nmstatectl_only_imports_yaml():
+    assert _get_imported_heavy_modules("import nmstatectl.nmstatectl") == {
+        "yaml"
+    }
+
+
+def test_public_api_loaded_on_first_use():
+    assert libnmstate.show is libnmstate.netinfo.show
+    assert set(libnmstate.__all__) <= set(dir(libnmstate))
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError):
+        libnmstate.no_such_attribute
+
+
+def test_ifaces_schema_parsed_once():
+    assert schema.ifaces_schema is schema.get_ifaces_schema()
@@ -0,0 +1,89 @@
+#
+# Copyright (c) 2021 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+from libnmstate.net_state import NetState
+from libnmstate.schema import Bond
+from libnmstate.schema import BondMode
+from libnmstate.schema import Interface
+from libnmstate.schema import InterfaceState
+from libnmstate.schema import InterfaceType
+
+BOND0 = "bond0"
+ETH1 = "eth1"
+ETH2 = "eth2"
+
+
+def _gen_bond_info(mtu):
+    return {
+        Interface.NAME: BOND0,
+        Interface.TYPE: InterfaceType.BOND,
+        Interface.STATE: InterfaceState.UP,
+        Interface.MTU: mtu,
+        Bond.CONFIG_SUBTREE: {
+            Bond.MODE: BondMode.ROUND_ROBIN,
+            Bond.PORT: [ETH1, ETH2],
+        },
+    }
+
+
+def _gen_eth_info(iface_name, state=InterfaceState.UP):
+    return {
+        Interface.NAME: iface_name,
+        Interface.TYPE: InterfaceType.ETHERNET,
+        Interface.STATE: state,
+    }
+
+
+class TestNetStateHasChanges:
+    def test_has_changes_keeps_ignored_port_of_desired_bond(self):
+        net_state = NetState(
+            {
+                Interface.KEY: [
+                    _gen_eth_info(ETH1, InterfaceState.IGNORE),
+                    _gen_bond_info(1400),
+                ]
+            },
+            {
+                Interface.KEY: [
+                    _gen_eth_info(ETH1),
+                    _gen_eth_info(ETH2),
+                    _gen_bond_info(1500),
+                ]
+            },
+        )
+
+        assert net_state.has_changes
+        bond_iface = net_state.ifaces.get_iface(BOND0, InterfaceType.BOND)
+        assert bond_iface.to_dict()[Bond.CONFIG_SUBTREE][Bond.PORT] == [
+            ETH1,
+            ETH2,
+        ]
+
+    def test_has_no_changes(self):
+        cur_iface_infos = [
+            _gen_eth_info(ETH1),
+            _gen_eth_info(ETH2),
+            _gen_bond_info(1500),
+        ]
+        net_state = NetState(
+            {Interface.KEY: [_gen_bond_info(1500)]},
+            {Interface.KEY: cur_iface_infos},
+        )
+
+        assert not net_state.has_changes
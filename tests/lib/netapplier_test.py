@@ -23,6 +23,8 @@ import pytest
 from unittest import mock
 
 from libnmstate import netapplier
+from libnmstate.error import NmstateVerificationError
+from libnmstate.plugin import NmstatePlugin
 from libnmstate.schema import Bond
 from libnmstate.schema import BondMode
 from libnmstate.schema import Interface
@@ -85,6 +87,22 @@ def test_iface_admin_state_change(
     )
 
 
+@pytest.mark.parametrize("save_to_disk", [True, False])
+def test_plugins_loaded_for_memory_only_apply(
+    show_with_plugins_mock, plugin_context_mock, net_state_mock, save_to_disk
+):
+    show_with_plugins_mock.return_value = {}
+    plugin_context_mock.return_value.__enter__.return_value = [
+        mock.MagicMock()
+    ]
+
+    netapplier.apply({}, verify_change=False, save_to_disk=save_to_disk)
+
+    plugin_context_mock.assert_called_once_with(
+        False, memory_only=not save_to_disk
+    )
+
+
 def test_add_new_bond(
     plugin_context_mock,
     show_with_plugins_mock,
@@ -156,6 +174,283 @@ def test_edit_existing_bond(
     )
 
 
+class TestNoOpApply:
+    CURRENT_STATE = {
+        Interface.KEY: [
+            {
+                Interface.NAME: "foo",
+                Interface.TYPE: InterfaceType.DUMMY,
+                Interface.STATE: InterfaceState.UP,
+                Interface.IPV4: {InterfaceIPv4.ENABLED: False},
+                Interface.IPV6: {InterfaceIPv6.ENABLED: False},
+            }
+        ]
+    }
+
+    def _gen_plugin(self, has_pending_changes):
+        plugin = mock.MagicMock()
+        plugin.has_pending_changes.return_value = has_pending_changes
+        return plugin
+
+    def test_skip_checkpoint_and_apply_when_already_applied(
+        self, show_with_plugins_mock
+    ):
+        show_with_plugins_mock.return_value = self.CURRENT_STATE
+        plugin = self._gen_plugin(has_pending_changes=False)
+
+        assert (
+            netapplier.apply_with_plugins(
+                [plugin], copy.deepcopy(self.CURRENT_STATE)
+            )
+            is None
+        )
+
+        plugin.create_checkpoint.assert_not_called()
+        plugin.apply_changes.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "iface_state,changed",
+        [(InterfaceState.UP, False), (InterfaceState.DOWN, True)],
+    )
+    def test_report_changed(
+        self, show_with_plugins_mock, iface_state, changed
+    ):
+        show_with_plugins_mock.return_value = self.CURRENT_STATE
+        desired_state = copy.deepcopy(self.CURRENT_STATE)
+        desired_state[Interface.KEY][0][Interface.STATE] = iface_state
+        plugin = self._gen_plugin(has_pending_changes=False)
+        plugin.pop_action_timings.return_value = []
+        timings_callback = mock.MagicMock()
+
+        netapplier.apply_with_plugins(
+            [plugin],
+            desired_state,
+            verify_change=False,
+            timings_callback=timings_callback,
+        )
+
+        assert timings_callback.call_args[0][0]["changed"] is changed
+
+    def test_apply_when_plugin_has_pending_changes(
+        self, show_with_plugins_mock
+    ):
+        show_with_plugins_mock.return_value = self.CURRENT_STATE
+        plugin = self._gen_plugin(has_pending_changes=True)
+
+        netapplier.apply_with_plugins(
+            [plugin], copy.deepcopy(self.CURRENT_STATE), verify_change=False
+        )
+
+        plugin.create_checkpoint.assert_called_once()
+        plugin.apply_changes.assert_called_once()
+
+    def test_apply_when_desired_state_differs(self, show_with_plugins_mock):
+        show_with_plugins_mock.return_value = self.CURRENT_STATE
+        desired_state = copy.deepcopy(self.CURRENT_STATE)
+        desired_state[Interface.KEY][0][Interface.STATE] = InterfaceState.DOWN
+        plugin = self._gen_plugin(has_pending_changes=False)
+
+        netapplier.apply_with_plugins(
+            [plugin], desired_state, verify_change=False
+        )
+
+        plugin.create_checkpoint.assert_called_once()
+        plugin.apply_changes.assert_called_once()
+
+    def test_keep_checkpoint_when_not_commit(self, show_with_plugins_mock):
+        show_with_plugins_mock.return_value = self.CURRENT_STATE
+        plugin = self._gen_plugin(has_pending_changes=False)
+
+        netapplier.apply_with_plugins(
+            [plugin],
+            copy.deepcopy(self.CURRENT_STATE),
+            verify_change=False,
+            commit=False,
+        )
+
+        plugin.create_checkpoint.assert_called_once()
+
+
+class TestScopedCheckpoint:
+    CURRENT_STATE = TestNoOpApply.CURRENT_STATE
+
+    def _apply(self, scoped_checkpoint):
+        desired_state = copy.deepcopy(self.CURRENT_STATE)
+        desired_state[Interface.KEY][0][Interface.STATE] = InterfaceState.DOWN
+        plugin = mock.MagicMock()
+        netapplier.apply_with_plugins(
+            [plugin],
+            desired_state,
+            verify_change=False,
+            scoped_checkpoint=scoped_checkpoint,
+        )
+        return plugin
+
+    def test_checkpoint_all_interfaces_by_default(
+        self, show_with_plugins_mock
+    ):
+        show_with_plugins_mock.return_value = self.CURRENT_STATE
+
+        plugin = self._apply(scoped_checkpoint=False)
+
+        plugin.create_checkpoint.assert_called_once_with(60)
+
+    def test_checkpoint_affected_interfaces_only(self, show_with_plugins_mock):
+        show_with_plugins_mock.return_value = self.CURRENT_STATE
+
+        plugin = self._apply(scoped_checkpoint=True)
+
+        plugin.create_checkpoint.assert_called_once_with(
+            60, iface_names={"foo"}
+        )
+
+
+class TestApplyTimings:
+    CURRENT_STATE = TestNoOpApply.CURRENT_STATE
+
+    def test_report_phases_and_plugin_actions(self, show_with_plugins_mock):
+        show_with_plugins_mock.return_value = self.CURRENT_STATE
+        desired_state = copy.deepcopy(self.CURRENT_STATE)
+        desired_state[Interface.KEY][0][Interface.STATE] = InterfaceState.DOWN
+        plugin = mock.MagicMock()
+        plugin.name = "foo_plugin"
+        plugin.pop_action_timings.return_value = [
+            ("Activate profile: foo", 1.0)
+        ]
+        timings_callback = mock.MagicMock()
+
+        netapplier.apply_with_plugins(
+            [plugin],
+            desired_state,
+            verify_change=False,
+            timings_callback=timings_callback,
+        )
+
+        plugin.start_action_timings.assert_called_once()
+        plugin.pop_action_timings.assert_called_once()
+        timings = timings_callback.call_args[0][0]
+        assert list(timings["phases"].keys()) == [
+            "validate",
+            "show",
+            "net_state",
+            "checkpoint",
+            "apply",
+            "commit",
+        ]
+        assert timings["verify_attempts"] == 0
+        assert timings["actions"] == {
+            "foo_plugin": [
+                {"action": "Activate profile: foo", "duration": 1.0}
+            ]
+        }
+
+    def test_report_timings_on_failure(self, show_with_plugins_mock):
+        show_with_plugins_mock.return_value = self.CURRENT_STATE
+        desired_state = copy.deepcopy(self.CURRENT_STATE)
+        desired_state[Interface.KEY][0][Interface.STATE] = InterfaceState.DOWN
+        plugin = mock.MagicMock()
+        plugin.pop_action_timings.return_value = []
+        plugin.apply_changes.side_effect = NmstateVerificationError("foo")
+        timings_callback = mock.MagicMock()
+
+        with pytest.raises(NmstateVerificationError):
+            netapplier.apply_with_plugins(
+                [plugin],
+                desired_state,
+                timings_callback=timings_callback,
+            )
+
+        timings = timings_callback.call_args[0][0]
+        assert "apply" in timings["phases"]
+        assert "commit" not in timings["phases"]
+
+    def test_no_action_timings_without_callback(self, show_with_plugins_mock):
+        show_with_plugins_mock.return_value = self.CURRENT_STATE
+        desired_state = copy.deepcopy(self.CURRENT_STATE)
+        desired_state[Interface.KEY][0][Interface.STATE] = InterfaceState.DOWN
+        plugin = mock.MagicMock()
+
+        netapplier.apply_with_plugins(
+            [plugin], desired_state, verify_change=False
+        )
+
+        plugin.start_action_timings.assert_not_called()
+
+
+@pytest.fixture
+def time_sleep_mock():
+    with mock.patch.object(netapplier.time, "sleep") as m:
+        yield m
+
+
+def _gen_plugin(has_change_notification):
+    plugin = mock.MagicMock()
+    plugin.plugin_capabilities = [NmstatePlugin.PLUGIN_CAPABILITY_IFACE]
+    if has_change_notification:
+        plugin.plugin_capabilities.append(
+            NmstatePlugin.PLUGIN_CAPABILITY_CHANGE_NOTIFICATION
+        )
+    return plugin
+
+
+def test_verify_retry_on_change_notification(
+    show_with_plugins_mock, time_sleep_mock
+):
+    plugin = _gen_plugin(has_change_notification=True)
+    plugin.wait_for_change.return_value = True
+    net_state = mock.MagicMock()
+    net_state.verify.side_effect = [NmstateVerificationError("foo"), None]
+
+    netapplier._apply_ifaces_state([plugin], net_state, True, True)
+
+    assert net_state.verify.call_count == 2
+    plugin.wait_for_change.assert_called_once()
+    time_sleep_mock.assert_not_called()
+
+
+def test_verify_retry_fallback_to_sleep(
+    show_with_plugins_mock, time_sleep_mock
+):
+    plugin = _gen_plugin(has_change_notification=False)
+    net_state = mock.MagicMock()
+    net_state.verify.side_effect = [NmstateVerificationError("foo"), None]
+
+    netapplier._apply_ifaces_state([plugin], net_state, True, True)
+
+    assert net_state.verify.call_count == 2
+    time_sleep_mock.assert_called_once()
+    plugin.wait_for_change.assert_not_called()
+
+
+def test_verify_retry_timeout(show_with_plugins_mock):
+    plugin = _gen_plugin(has_change_notification=True)
+    plugin.wait_for_change.return_value = False
+    net_state = mock.MagicMock()
+    net_state.verify.side_effect = NmstateVerificationError("foo")
+
+    with mock.patch.object(netapplier, "VERIFY_RETRY_TIMEOUT", 0):
+        with pytest.raises(NmstateVerificationError):
+            netapplier._apply_ifaces_state([plugin], net_state, True, True)
+
+    net_state.verify.assert_called_once()
+
+
+def test_wait_for_change_across_plugins():
+    plugins = [
+        _gen_plugin(has_change_notification=True),
+        _gen_plugin(has_change_notification=True),
+    ]
+    plugins[0].wait_for_change.return_value = False
+    plugins[1].wait_for_change.return_value = True
+
+    netapplier._wait_for_change(plugins, set(["foo"]), 1)
+
+    plugins[0].wait_for_change.assert_called_once()
+    plugins[1].wait_for_change.assert_called_once()
+    timeout = plugins[1].wait_for_change.call_args[0][1]
+    assert timeout <= netapplier.CHANGE_NOTIFICATION_SLICE
+
+
 def test_error_apply():
     with pytest.raises(TypeError):
         # pylint: disable=too-many-function-args
@@ -0,0 +1,268 @@
+#
+# Copyright (c) 2021 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+import pytest
+
+from libnmstate.error import NmstateNotSupportedError
+from libnmstate.net_state import NetState
+from libnmstate.nispor.ip_batch import gen_ip_batch_commands
+from libnmstate.schema import Bond
+from libnmstate.schema import BondMode
+from libnmstate.schema import Interface
+from libnmstate.schema import InterfaceIPv4
+from libnmstate.schema import InterfaceIPv6
+from libnmstate.schema import InterfaceState
+from libnmstate.schema import InterfaceType
+from libnmstate.schema import Route
+from libnmstate.schema import RouteRule
+from libnmstate.schema import Veth
+from libnmstate.schema import VLAN
+
+ETH1_CURRENT = {
+    Interface.NAME: "eth1",
+    Interface.TYPE: InterfaceType.ETHERNET,
+    Interface.STATE: InterfaceState.UP,
+    Interface.IPV4: {InterfaceIPv4.ENABLED: False},
+    Interface.IPV6: {InterfaceIPv6.ENABLED: False},
+}
+
+# Route rule is stored in the interface holding route of the same table
+TABLE100_CURRENT = {
+    Interface.KEY: [
+        {
+            Interface.NAME: "eth1",
+            Interface.TYPE: InterfaceType.ETHERNET,
+            Interface.STATE: InterfaceState.UP,
+            Interface.IPV4: {
+                InterfaceIPv4.ENABLED: True,
+                InterfaceIPv4.ADDRESS: [
+                    {
+                        InterfaceIPv4.ADDRESS_IP: "192.0.2.1",
+                        InterfaceIPv4.ADDRESS_PREFIX_LENGTH: 24,
+                    }
+                ],
+            },
+            Interface.IPV6: {InterfaceIPv6.ENABLED: False},
+        }
+    ],
+    Route.KEY: {
+        Route.CONFIG: [
+            {
+                Route.DESTINATION: "198.51.100.0/24",
+                Route.NEXT_HOP_ADDRESS: "192.0.2.254",
+                Route.NEXT_HOP_INTERFACE: "eth1",
+                Route.TABLE_ID: 100,
+            }
+        ]
+    },
+}
+
+
+def _gen_cmds(desired_state, current_state=None):
+    if current_state is None:
+        current_state = {Interface.KEY: [ETH1_CURRENT]}
+    return gen_ip_batch_commands(
+        NetState(desired_state, current_state, save_to_disk=False)
+    )
+
+
+def _static_ipv4(address, prefix_length):
+    return {
+        InterfaceIPv4.ENABLED: True,
+        InterfaceIPv4.ADDRESS: [
+            {
+                InterfaceIPv4.ADDRESS_IP: address,
+                InterfaceIPv4.ADDRESS_PREFIX_LENGTH: prefix_length,
+            }
+        ],
+    }
+
+
+def test_create_dummy_with_ip_and_route():
+    cmds = _gen_cmds(
+        {
+            Interface.KEY: [
+                {
+                    Interface.NAME: "dummy0",
+                    Interface.TYPE: InterfaceType.DUMMY,
+                    Interface.STATE: InterfaceState.UP,
+                    Interface.MTU: 1400,
+                    Interface.IPV4: _static_ipv4("192.0.2.1", 24),
+                }
+            ],
+            Route.KEY: {
+                Route.CONFIG: [
+                    {
+                        Route.DESTINATION: "198.51.100.0/24",
+                        Route.NEXT_HOP_ADDRESS: "192.0.2.254",
+                        Route.NEXT_HOP_INTERFACE: "dummy0",
+                    }
+                ]
+            },
+        }
+    )
+
+    assert cmds == [
+        "link add name dummy0 type dummy",
+        "link set dummy0 mtu 1400",
+        "link set dummy0 up",
+        "address replace 192.0.2.1/24 dev dummy0",
+        "route replace 198.51.100.0/24 via 192.0.2.254 dev dummy0 "
+        "proto static",
+    ]
+
+
+def test_remove_existing_virtual_interface():
+    cmds = _gen_cmds(
+        {
+            Interface.KEY: [
+                {
+                    Interface.NAME: "dummy0",
+                    Interface.STATE: InterfaceState.ABSENT,
+                }
+            ]
+        },
+        {
+            Interface.KEY: [
+                ETH1_CURRENT,
+                {
+                    Interface.NAME: "dummy0",
+                    Interface.TYPE: InterfaceType.DUMMY,
+                    Interface.STATE: InterfaceState.UP,
+                },
+            ]
+        },
+    )
+
+    assert cmds == ["link del dummy0"]
+
+
+def test_create_veth_pair_once():
+    cmds = _gen_cmds(
+        {
+            Interface.KEY: [
+                {
+                    Interface.NAME: "veth1",
+                    Interface.TYPE: InterfaceType.VETH,
+                    Interface.STATE: InterfaceState.UP,
+                    Veth.CONFIG_SUBTREE: {Veth.PEER: "veth0"},
+                },
+                {
+                    Interface.NAME: "veth0",
+                    Interface.TYPE: InterfaceType.VETH,
+                    Interface.STATE: InterfaceState.UP,
+                    Veth.CONFIG_SUBTREE: {Veth.PEER: "veth1"},
+                },
+            ]
+        }
+    )
+
+    assert [cmd for cmd in cmds if cmd.startswith("link add")] == [
+        "link add name veth0 type veth peer name veth1"
+    ]
+
+
+def test_create_vlan_and_bond_with_port():
+    cmds = _gen_cmds(
+        {
+            Interface.KEY: [
+                {
+                    Interface.NAME: "eth1.101",
+                    Interface.TYPE: InterfaceType.VLAN,
+                    Interface.STATE: InterfaceState.UP,
+                    VLAN.CONFIG_SUBTREE: {
+                        VLAN.ID: 101,
+                        VLAN.BASE_IFACE: "eth1",
+                    },
+                },
+                {
+                    Interface.NAME: "bond99",
+                    Interface.TYPE: InterfaceType.BOND,
+                    Interface.STATE: InterfaceState.UP,
+                    Bond.CONFIG_SUBTREE: {
+                        Bond.MODE: BondMode.ACTIVE_BACKUP,
+                        Bond.PORT: ["eth1.101"],
+                    },
+                },
+            ]
+        }
+    )
+
+    assert cmds.index("link add name bond99 type bond mode active-backup") < (
+        cmds.index("link add link eth1 name eth1.101 type vlan id 101")
+    )
+    assert cmds.index("link set eth1.101 down") < cmds.index(
+        "link set eth1.101 master bond99"
+    )
+
+
+def test_dynamic_ip_not_supported():
+    with pytest.raises(NmstateNotSupportedError):
+        _gen_cmds(
+            {
+                Interface.KEY: [
+                    {
+                        Interface.NAME: "eth1",
+                        Interface.TYPE: InterfaceType.ETHERNET,
+                        Interface.STATE: InterfaceState.UP,
+                        Interface.IPV4: {
+                            InterfaceIPv4.ENABLED: True,
+                            InterfaceIPv4.DHCP: True,
+                        },
+                    }
+                ]
+            }
+        )
+
+
+def test_route_rule_with_default_priority_not_added_again():
+    rule = {
+        RouteRule.IP_FROM: "192.0.2.0/24",
+        RouteRule.ROUTE_TABLE: 100,
+    }
+    current_rule = dict(rule)
+    current_rule[RouteRule.PRIORITY] = 32765
+    current_state = dict(TABLE100_CURRENT)
+    current_state[RouteRule.KEY] = {RouteRule.CONFIG: [current_rule]}
+    cmds = _gen_cmds(
+        {RouteRule.KEY: {RouteRule.CONFIG: [rule]}}, current_state
+    )
+
+    assert not [cmd for cmd in cmds if cmd.startswith("rule")]
+
+
+def test_add_route_rule():
+    cmds = _gen_cmds(
+        {
+            RouteRule.KEY: {
+                RouteRule.CONFIG: [
+                    {
+                        RouteRule.IP_TO: "198.51.100.0/24",
+                        RouteRule.PRIORITY: 1000,
+                        RouteRule.ROUTE_TABLE: 100,
+                    }
+                ]
+            }
+        },
+        TABLE100_CURRENT,
+    )
+
+    assert [cmd for cmd in cmds if cmd.startswith("rule")] == [
+        "rule add to 198.51.100.0/24 priority 1000 table 100"
+    ]
@@ -0,0 +1,135 @@
+#
+# Copyright (c) 2021 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+import socket
+import struct
+
+from libnmstate.nispor.monitor import RTM_NEWADDR
+from libnmstate.nispor.monitor import RTM_NEWLINK
+from libnmstate.nispor.monitor import RTM_NEWROUTE
+from libnmstate.nispor.monitor import is_relevant_netlink_data
+
+RTM_NEWRULE = 32
+IFLA_IFNAME = 3
+RTA_OIF = 4
+RTA_MULTIPATH = 9
+
+
+def _gen_nl_msg(msg_type, payload):
+    return (
+        struct.pack("=IHHII", 16 + len(payload), msg_type, 0, 0, 0) + payload
+    )
+
+
+def _gen_link_msg(iface_name, iface_index=1):
+    name = iface_name.encode("utf-8") + b"\0"
+    rta = struct.pack("=HH", 4 + len(name), IFLA_IFNAME) + name
+    rta += b"\0" * ((4 - len(rta) % 4) % 4)
+    ifinfomsg = struct.pack(
+        "=BBHiII", socket.AF_UNSPEC, 0, 0, iface_index, 0, 0
+    )
+    return _gen_nl_msg(RTM_NEWLINK, ifinfomsg + rta)
+
+
+def _gen_addr_msg(iface_index):
+    ifaddrmsg = struct.pack("=BBBBI", socket.AF_INET, 24, 0, 0, iface_index)
+    return _gen_nl_msg(RTM_NEWADDR, ifaddrmsg)
+
+
+def _gen_route_msg(oif_index=None, multipath_indexes=None):
+    rtmsg = struct.pack(
+        "=BBBBBBBBI", socket.AF_INET, 24, 0, 0, 254, 0, 0, 1, 0
+    )
+    rtas = b""
+    if oif_index is not None:
+        rtas += struct.pack("=HHI", 8, RTA_OIF, oif_index)
+    if multipath_indexes:
+        nexthops = b"".join(
+            struct.pack("=HBBi", 8, 0, 0, index) for index in multipath_indexes
+        )
+        rtas += struct.pack("=HH", 4 + len(nexthops), RTA_MULTIPATH)
+        rtas += nexthops
+    return _gen_nl_msg(RTM_NEWROUTE, rtmsg + rtas)
+
+
+def test_link_message_of_watched_iface():
+    assert is_relevant_netlink_data(_gen_link_msg("eth1"), set(["eth1"]))
+
+
+def test_link_message_of_other_iface():
+    assert not is_relevant_netlink_data(_gen_link_msg("eth2"), set(["eth1"]))
+
+
+def test_multiple_link_messages():
+    data = _gen_link_msg("eth2") + _gen_link_msg("eth1")
+    assert is_relevant_netlink_data(data, set(["eth1"]))
+
+
+def test_address_message_of_watched_iface():
+    assert is_relevant_netlink_data(_gen_addr_msg(2), set(["eth1"]), {2})
+
+
+def test_address_message_of_other_iface():
+    assert not is_relevant_netlink_data(_gen_addr_msg(3), set(["eth1"]), {2})
+
+
+def test_address_message_after_link_message_of_watched_iface():
+    iface_indexes = set()
+    data = _gen_link_msg("eth1", 5)
+    assert is_relevant_netlink_data(data, set(["eth1"]), iface_indexes)
+    assert is_relevant_netlink_data(
+        _gen_addr_msg(5), set(["eth1"]), iface_indexes
+    )
+
+
+def test_link_message_of_renamed_watched_iface():
+    assert is_relevant_netlink_data(
+        _gen_link_msg("eth9", 2), set(["eth1"]), {2}
+    )
+
+
+def test_route_message_of_watched_iface():
+    assert is_relevant_netlink_data(_gen_route_msg(2), set(["eth1"]), {2})
+
+
+def test_route_message_of_other_iface():
+    assert not is_relevant_netlink_data(_gen_route_msg(3), set(["eth1"]), {2})
+
+
+def test_multipath_route_message_of_watched_iface():
+    data = _gen_route_msg(multipath_indexes=[3, 2])
+    assert is_relevant_netlink_data(data, set(["eth1"]), {2})
+
+
+def test_multipath_route_message_of_other_iface():
+    data = _gen_route_msg(multipath_indexes=[3, 4])
+    assert not is_relevant_netlink_data(data, set(["eth1"]), {2})
+
+
+def test_route_message_without_oif():
+    assert is_relevant_netlink_data(_gen_route_msg(), set(["eth1"]), {2})
+
+
+def test_rule_message():
+    data = _gen_nl_msg(RTM_NEWRULE, b"\0" * 12)
+    assert is_relevant_netlink_data(data, set(["eth1"]), {2})
+
+
+def test_link_message_of_any_iface():
+    assert is_relevant_netlink_data(_gen_link_msg("eth2"), None)
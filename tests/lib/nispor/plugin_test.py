@@ -0,0 +1,109 @@
+#
+# Copyright (c) 2021 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+from unittest import mock
+
+import pytest
+
+from libnmstate.error import NmstateNotSupportedError
+from libnmstate.nispor import plugin as nispor_plugin
+from libnmstate.nispor.kernel_plugin import NisporKernelPlugin
+from libnmstate.nispor.plugin import NisporPlugin
+from libnmstate.schema import Route
+from libnmstate.schema import RouteRule
+
+
+@pytest.fixture
+def np_state_mock():
+    with mock.patch.object(nispor_plugin, "NisporNetState") as m:
+        m.retrieve.return_value.ifaces = {}
+        m.retrieve.return_value.routes = []
+        m.retrieve.return_value.route_rules = []
+        yield m
+
+
+def test_single_retrieve_per_refresh(np_state_mock):
+    plugin = NisporPlugin()
+    plugin.refresh_content()
+    plugin.get_interfaces()
+    plugin.get_routes()
+    plugin.get_route_rules()
+
+    np_state_mock.retrieve.assert_called_once()
+
+
+def test_refresh_drops_previous_snapshot(np_state_mock):
+    plugin = NisporPlugin()
+    plugin.refresh_content()
+    plugin.get_interfaces()
+    plugin.refresh_content()
+    plugin.get_routes()
+
+    assert np_state_mock.retrieve.call_count == 2
+
+
+def test_retrieve_on_demand_without_refresh(np_state_mock):
+    plugin = NisporPlugin()
+
+    assert plugin.get_routes() == {Route.RUNNING: []}
+    assert plugin.get_route_rules() == {RouteRule.CONFIG: []}
+    np_state_mock.retrieve.assert_called_once()
+
+
+def test_kernel_plugin_refuse_save_to_disk(np_state_mock):
+    plugin = NisporKernelPlugin()
+
+    with pytest.raises(NmstateNotSupportedError):
+        plugin.apply_changes(mock.MagicMock(), True)
+
+
+def test_kernel_plugin_report_static_routes_as_config(np_state_mock):
+    static_route = mock.MagicMock(
+        dst="198.51.100.0/24",
+        via="192.0.2.254",
+        oif="eth1",
+        table=254,
+        metric=0,
+        scope="universe",
+        protocol="static",
+    )
+    kernel_route = mock.MagicMock(
+        dst="192.0.2.0/24",
+        via=None,
+        oif="eth1",
+        table=254,
+        metric=0,
+        scope="universe",
+        protocol="kernel",
+    )
+    np_state_mock.retrieve.return_value.routes = [static_route, kernel_route]
+    plugin = NisporKernelPlugin()
+
+    routes = plugin.get_routes()
+
+    assert len(routes[Route.RUNNING]) == 2
+    assert routes[Route.CONFIG] == [
+        {
+            Route.TABLE_ID: Route.USE_DEFAULT_ROUTE_TABLE,
+            Route.DESTINATION: "198.51.100.0/24",
+            Route.NEXT_HOP_INTERFACE: "eth1",
+            Route.NEXT_HOP_ADDRESS: "192.0.2.254",
+            Route.METRIC: Route.USE_DEFAULT_METRIC,
+        }
+    ]
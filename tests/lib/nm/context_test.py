@@ -0,0 +1,138 @@
+#
+# Copyright (c) 2021 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+from unittest import mock
+
+import pytest
+
+from libnmstate import nm
+
+
+@pytest.fixture
+def client_mock():
+    with mock.patch.object(nm.context, "NM") as nm_mock:
+        with mock.patch.object(nm.context, "Gio"):
+            with mock.patch.object(nm.context, "GLib"):
+                yield nm_mock.Client.new.return_value
+
+
+def _gen_nm_dev(iface_name):
+    nm_dev = mock.MagicMock()
+    nm_dev.get_iface.return_value = iface_name
+    return nm_dev
+
+
+def _get_signal_callback(client_mock, signal):
+    for call in client_mock.connect.call_args_list:
+        if call[0][0] == signal:
+            return call[0][1]
+    return None
+
+
+def test_get_devices_by_name(client_mock):
+    eth1 = _gen_nm_dev("eth1")
+    eth2 = _gen_nm_dev("eth2")
+    client_mock.get_devices.return_value = [eth1, eth2]
+    ctx = nm.context.NmContext()
+
+    assert ctx.get_devices_by_name("eth1") == [eth1]
+    assert ctx.get_devices_by_name("eth3") == []
+    client_mock.get_devices.assert_called_once()
+
+
+def test_device_index_follow_device_added_and_removed(client_mock):
+    eth1 = _gen_nm_dev("eth1")
+    client_mock.get_devices.return_value = [eth1]
+    ctx = nm.context.NmContext()
+    ctx.get_devices_by_name("eth1")
+
+    eth2 = _gen_nm_dev("eth2")
+    _get_signal_callback(client_mock, "device-added")(client_mock, eth2)
+    _get_signal_callback(client_mock, "device-removed")(client_mock, eth1)
+
+    assert ctx.get_devices_by_name("eth1") == []
+    assert ctx.get_devices_by_name("eth2") == [eth2]
+    client_mock.get_devices.assert_called_once()
+
+
+def test_register_async_wait_for_single_free_slot(client_mock):
+    ctx = nm.context.NmContext(fast_queue_size=2)
+    ctx.register_async("action1", fast=True)
+    ctx.register_async("action2", fast=True)
+    ctx.context.iteration.side_effect = lambda _: ctx.finish_async("action1")
+
+    ctx.register_async("action3", fast=True)
+
+    ctx.context.iteration.assert_called_once()
+    assert ctx._fast_queue == set(["action2", "action3"])
+    stats = ctx.queue_stats
+    assert stats["fast_queue_peak"] == 2
+    assert stats["slow_queue_peak"] == 0
+    assert stats["queue_full_wait_count"] == 1
+
+
+def test_register_async_without_waiting(client_mock):
+    ctx = nm.context.NmContext(slow_queue_size=2)
+    ctx.register_async("action1")
+    ctx.register_async("action2", fast=True)
+
+    ctx.context.iteration.assert_not_called()
+    assert ctx.queue_stats["queue_full_wait_count"] == 0
+
+
+def test_pop_action_timings(client_mock):
+    ctx = nm.context.NmContext()
+    ctx.start_action_timings()
+    ctx.register_async("action1")
+    ctx.register_async("action2", fast=True)
+    ctx.finish_async("action2")
+
+    timings = ctx.pop_action_timings()
+
+    assert [action for action, _ in timings] == ["action2"]
+    assert timings[0][1] >= 0
+    ctx.start_action_timings()
+    ctx.finish_async("action1")
+    assert [action for action, _ in ctx.pop_action_timings()] == ["action1"]
+    assert ctx.pop_action_timings() == []
+
+
+def test_action_timings_not_recorded_when_not_started(client_mock):
+    ctx = nm.context.NmContext()
+    ctx.register_async("action1")
+    ctx.finish_async("action1")
+
+    assert ctx.pop_action_timings() == []
+
+
+def test_wait_any_async_group_finish(client_mock):
+    ctx = nm.context.NmContext()
+    with ctx.async_group("group1"):
+        ctx.register_async("action1")
+        ctx.register_async("action2")
+    with ctx.async_group("group2"):
+        ctx.register_async("action3")
+    finish_order = ["action1", "action3", "action2"]
+    ctx.context.iteration.side_effect = lambda _: ctx.finish_async(
+        finish_order.pop(0)
+    )
+
+    assert ctx.wait_any_async_group_finish(["group1", "group2"]) == {"group2"}
+    assert not ctx.is_async_group_finished("group1")
+    assert ctx.get_async_group("action2") == "group1"
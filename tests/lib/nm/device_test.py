@@ -46,3 +46,17 @@ def test_get_device_common_info():
         "state": dev.get_state.return_value,
     }
     assert expected_info == info
+
+
+def test_get_nm_dev_lookup_by_name_and_type():
+    ctx = mock.MagicMock()
+    nm_dev = mock.MagicMock()
+    ctx.get_devices_by_name.return_value = [nm_dev]
+
+    with mock.patch.object(nm.device, "get_iface_type") as get_type_mock:
+        get_type_mock.return_value = "ethernet"
+        assert nm.device.get_nm_dev(ctx, "eth1", "ethernet") == nm_dev
+        assert nm.device.get_nm_dev(ctx, "eth1", "bond") is None
+
+    ctx.get_devices_by_name.assert_called_with("eth1")
+    ctx.client.get_devices.assert_not_called()
@@ -0,0 +1,344 @@
+#
+# Copyright (c) 2021 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+from unittest import mock
+
+import pytest
+
+import libnmstate.nm.profile
+import libnmstate.nm.profiles
+from libnmstate.nm.profile import NmProfile
+from libnmstate.nm.profile import NmProfilePlaceholder
+from libnmstate.nm.profiles import NmProfiles
+from libnmstate.nm.profiles import generate_keyfiles
+from libnmstate.nm.profiles import _do_actions_by_graph
+from libnmstate.nm.profiles import _gen_action_graph
+from libnmstate.nm.profiles import _use_uuid_as_controller_and_parent
+from libnmstate.net_state import NetState
+from libnmstate.schema import Interface
+from libnmstate.schema import InterfaceState
+from libnmstate.schema import InterfaceType
+from libnmstate.schema import OVSBridge
+
+
+def _gen_profile(
+    name, iface_type, actions, controller=None, controller_type=None
+):
+    profile = mock.MagicMock()
+    profile.iface.name = name
+    profile.iface.type = iface_type
+    profile.iface.controller = controller
+    profile.iface.controller_type = controller_type
+    profile.iface.parent = None
+    profile.has_action.side_effect = lambda action: action in actions
+    return profile
+
+
+def test_action_graph_port_depend_on_controller_only():
+    bond = _gen_profile(
+        "bond99",
+        InterfaceType.BOND,
+        [NmProfile.ACTION_MODIFIED, NmProfile.ACTION_TOP_MASTER],
+    )
+    port = _gen_profile(
+        "eth1",
+        InterfaceType.ETHERNET,
+        [NmProfile.ACTION_MODIFIED],
+        controller="bond99",
+        controller_type=InterfaceType.BOND,
+    )
+    other = _gen_profile(
+        "eth2", InterfaceType.ETHERNET, [NmProfile.ACTION_MODIFIED]
+    )
+
+    graph = _gen_action_graph([bond, port, other])
+
+    assert graph[(bond, NmProfile.ACTION_TOP_MASTER)] == set()
+    assert graph[(bond, NmProfile.ACTION_MODIFIED)] == {
+        (bond, NmProfile.ACTION_TOP_MASTER)
+    }
+    assert graph[(port, NmProfile.ACTION_MODIFIED)] == {
+        (bond, NmProfile.ACTION_MODIFIED)
+    }
+    assert graph[(other, NmProfile.ACTION_MODIFIED)] == set()
+
+
+def test_action_graph_vlan_depend_on_parent():
+    eth1 = _gen_profile(
+        "eth1", InterfaceType.ETHERNET, [NmProfile.ACTION_MODIFIED]
+    )
+    vlan = _gen_profile(
+        "eth1.101",
+        InterfaceType.VLAN,
+        [NmProfile.ACTION_MODIFIED, NmProfile.ACTION_NEW_VLAN],
+    )
+    vlan.iface.parent = "eth1"
+
+    graph = _gen_action_graph([eth1, vlan])
+
+    assert graph[(vlan, NmProfile.ACTION_MODIFIED)] == {
+        (eth1, NmProfile.ACTION_MODIFIED)
+    }
+
+
+def test_action_graph_teardown_after_all_activations():
+    eth1 = _gen_profile(
+        "eth1", InterfaceType.ETHERNET, [NmProfile.ACTION_MODIFIED]
+    )
+    dummy = _gen_profile(
+        "dummy1",
+        InterfaceType.DUMMY,
+        [NmProfile.ACTION_DELETE_PROFILE, NmProfile.ACTION_DELETE_DEVICE],
+    )
+
+    graph = _gen_action_graph([eth1, dummy])
+    barrier = next(
+        node
+        for node in graph[(dummy, NmProfile.ACTION_DELETE_PROFILE)]
+        if node[0] is None
+    )
+
+    assert graph[barrier] == {(eth1, NmProfile.ACTION_MODIFIED)}
+    assert graph[(dummy, NmProfile.ACTION_DELETE_DEVICE)] == {
+        (dummy, NmProfile.ACTION_DELETE_PROFILE),
+        barrier,
+    }
+
+
+def test_action_graph_return_none_on_dependency_loop():
+    bond1 = _gen_profile(
+        "bond1",
+        InterfaceType.BOND,
+        [NmProfile.ACTION_OTHER_MASTER],
+        controller="bond2",
+        controller_type=InterfaceType.BOND,
+    )
+    bond2 = _gen_profile(
+        "bond2",
+        InterfaceType.BOND,
+        [NmProfile.ACTION_OTHER_MASTER],
+        controller="bond1",
+        controller_type=InterfaceType.BOND,
+    )
+
+    assert _gen_action_graph([bond1, bond2]) is None
+
+
+def test_do_actions_start_once_dependency_finished():
+    bond = _gen_profile(
+        "bond99", InterfaceType.BOND, [NmProfile.ACTION_TOP_MASTER]
+    )
+    port = _gen_profile(
+        "eth1",
+        InterfaceType.ETHERNET,
+        [NmProfile.ACTION_MODIFIED],
+        controller="bond99",
+        controller_type=InterfaceType.BOND,
+    )
+    other = _gen_profile(
+        "eth2", InterfaceType.ETHERNET, [NmProfile.ACTION_MODIFIED]
+    )
+    graph = _gen_action_graph([bond, port, other])
+    context = mock.MagicMock()
+    waited_groups = []
+
+    def _wait_any_async_group_finish(groups):
+        waited_groups.append(set(groups))
+        # Finish the groups one by one in the order of interface name
+        return {
+            sorted(
+                groups, key=lambda node: node[0].iface.name if node[0] else ""
+            )[0]
+        }
+
+    context.wait_any_async_group_finish.side_effect = (
+        _wait_any_async_group_finish
+    )
+
+    _do_actions_by_graph(context, graph)
+
+    bond_node = (bond, NmProfile.ACTION_TOP_MASTER)
+    port_node = (port, NmProfile.ACTION_MODIFIED)
+    other_node = (other, NmProfile.ACTION_MODIFIED)
+    assert bond_node in waited_groups[0]
+    assert other_node in waited_groups[0]
+    assert port_node not in waited_groups[0]
+    # Port activation starts before unrelated eth2 finished
+    assert waited_groups[1] == {port_node, other_node}
+    bond.do_action.assert_called_once_with(NmProfile.ACTION_TOP_MASTER)
+    port.do_action.assert_called_once_with(NmProfile.ACTION_MODIFIED)
+    other.do_action.assert_called_once_with(NmProfile.ACTION_MODIFIED)
+    context.wait_all_finish.assert_called_once()
+
+
+def test_placeholder_uuid_only_retrieved_when_referred():
+    bond = _gen_profile("bond99", InterfaceType.BOND, [])
+    bond.iface.is_up = True
+    bond.iface.is_user_space_only = False
+    port = _gen_profile(
+        "eth1",
+        InterfaceType.ETHERNET,
+        [NmProfile.ACTION_MODIFIED],
+        controller="bond99",
+        controller_type=InterfaceType.BOND,
+    )
+    port.iface.need_parent = False
+    port.iface.is_ignore = False
+    port.iface.is_user_space_only = False
+    with mock.patch.object(
+        libnmstate.nm.profile, "get_nm_dev"
+    ) as get_nm_dev_mock:
+        nm_dev = get_nm_dev_mock.return_value
+        nm_profile = nm_dev.get_active_connection().get_connection()
+        nm_profile.get_uuid.return_value = "bond-uuid"
+        ctx = mock.MagicMock()
+        bond_placeholder = NmProfilePlaceholder(ctx, bond.iface)
+        eth2_placeholder = NmProfilePlaceholder(
+            ctx, _gen_profile("eth2", InterfaceType.ETHERNET, []).iface
+        )
+
+        _use_uuid_as_controller_and_parent(
+            [port], [bond_placeholder, eth2_placeholder]
+        )
+
+        port.update_controller.assert_called_once_with("bond-uuid")
+        get_nm_dev_mock.assert_called_once_with(
+            ctx, "bond99", InterfaceType.BOND
+        )
+
+
+class TestHasPendingChanges:
+    @pytest.fixture
+    def nm_dev_mock(self):
+        with mock.patch.object(
+            libnmstate.nm.profiles, "get_nm_dev"
+        ) as get_nm_dev_mock, mock.patch.object(
+            libnmstate.nm.profiles, "is_externally_managed", return_value=False
+        ), mock.patch.object(
+            libnmstate.nm.profiles, "is_memory_only", return_value=False
+        ):
+            yield get_nm_dev_mock.return_value
+
+    def _gen_net_state(self, is_up=True, is_absent=False):
+        iface = _gen_profile("eth1", InterfaceType.ETHERNET, []).iface
+        iface.is_changed = False
+        iface.is_desired = True
+        iface.is_ignore = False
+        iface.is_up = is_up
+        iface.is_absent = is_absent
+        net_state = mock.MagicMock()
+        net_state.ifaces.all_ifaces.return_value = [iface]
+        return net_state
+
+    def test_activated_by_persistent_profile(self, nm_dev_mock):
+        assert not NmProfiles(mock.MagicMock()).has_pending_changes(
+            self._gen_net_state(), True
+        )
+
+    def test_activated_by_memory_only_profile_when_save_to_disk(
+        self, nm_dev_mock
+    ):
+        with mock.patch.object(
+            libnmstate.nm.profiles, "is_memory_only", return_value=True
+        ):
+            assert NmProfiles(mock.MagicMock()).has_pending_changes(
+                self._gen_net_state(), True
+            )
+
+    def test_not_activated(self, nm_dev_mock):
+        nm_dev_mock.get_active_connection.return_value = None
+
+        assert NmProfiles(mock.MagicMock()).has_pending_changes(
+            self._gen_net_state(), True
+        )
+
+    def test_absent_iface_with_profile(self, nm_dev_mock):
+        nm_dev_mock.get_active_connection.return_value = None
+        ctx = mock.MagicMock()
+        nm_profile = mock.MagicMock()
+        nm_profile.get_interface_name.return_value = "eth1"
+        ctx.client.get_connections.return_value = [nm_profile]
+
+        assert NmProfiles(ctx).has_pending_changes(
+            self._gen_net_state(is_up=False, is_absent=True), True
+        )
+
+
+def _gen_keyfile_profile(iface):
+    nm_profile = mock.MagicMock()
+    nm_profile.iface = iface
+    nm_profile.uuid = f"{iface.name}-{iface.type}-uuid"
+    nm_profile.file_name = f"{iface.name}.nmconnection"
+    nm_profile.to_keyfile.return_value = f"{iface.name}/{iface.type}"
+    return nm_profile
+
+
+def test_generate_keyfiles_for_ovs_bridge_with_internal_iface():
+    net_state = NetState(
+        {
+            Interface.KEY: [
+                {
+                    Interface.NAME: "br0",
+                    Interface.TYPE: InterfaceType.OVS_BRIDGE,
+                    Interface.STATE: InterfaceState.UP,
+                    OVSBridge.CONFIG_SUBTREE: {
+                        OVSBridge.PORT_SUBTREE: [{OVSBridge.Port.NAME: "br0"}]
+                    },
+                },
+                {
+                    Interface.NAME: "br0",
+                    Interface.TYPE: InterfaceType.OVS_INTERFACE,
+                    Interface.STATE: InterfaceState.UP,
+                },
+                {
+                    Interface.NAME: "eth1",
+                    Interface.TYPE: InterfaceType.ETHERNET,
+                    Interface.STATE: InterfaceState.DOWN,
+                },
+            ]
+        }
+    )
+    nm_profiles = []
+
+    def _new_keyfile_profile(iface):
+        nm_profile = _gen_keyfile_profile(iface)
+        nm_profiles.append(nm_profile)
+        return nm_profile
+
+    with mock.patch.object(
+        libnmstate.nm.profiles, "NmKeyfileProfile"
+    ) as keyfile_profile_mock:
+        keyfile_profile_mock.side_effect = _new_keyfile_profile
+        keyfile_profile_mock.KEYFILE_SUFFIX = ".nmconnection"
+        keyfiles = generate_keyfiles(net_state)
+
+    assert sorted(keyfiles) == [
+        ["br0-ovs-bridge.nmconnection", "br0/ovs-bridge"],
+        ["br0.nmconnection", "br0/ovs-interface"],
+        ["ovs-port-br0.nmconnection", "ovs-port-br0/ovs-port"],
+    ]
+    profiles_by_type = {
+        nm_profile.iface.type: nm_profile for nm_profile in nm_profiles
+    }
+    profiles_by_type[
+        InterfaceType.OVS_PORT
+    ].update_controller.assert_called_once_with("br0-ovs-bridge-uuid")
+    profiles_by_type[
+        InterfaceType.OVS_INTERFACE
+    ].update_controller.assert_called_once_with("ovs-port-br0-ovs-port-uuid")
@@ -17,12 +17,20 @@
 # along with this program. If not, see <https://www.gnu.org/licenses/>.
 #
 
+import sys
 from unittest import mock
 
+import pytest
+
+from libnmstate import nmstate
+from libnmstate.error import NmstateValueError
 from libnmstate.nmstate import show_with_plugins
 from libnmstate.plugin import NmstatePlugin
 from libnmstate.schema import Interface
+from libnmstate.schema import InterfaceIPv4
 from libnmstate.schema import InterfaceType
+from libnmstate.schema import Route
+from libnmstate.schema import RouteRule
 
 TEST_IFACE1 = "nic1"
 TEST_IFACE2 = "nic2"
@@ -210,3 +218,242 @@ class TestPluginInfrastructure:
                 "foo2": "b",
             },
         ]
+
+    def test_show_with_plugins_filtered_by_iface_names(self):
+        plugins = self._gen_plugin_mocks()
+        for plugin in plugins:
+            plugin.get_interfaces_by_names.return_value = [
+                {
+                    Interface.NAME: TEST_IFACE1,
+                    Interface.TYPE: InterfaceType.ETHERNET,
+                },
+            ]
+
+        show_with_plugins(plugins, iface_names=set([TEST_IFACE1]))
+
+        for plugin in plugins:
+            plugin.get_interfaces_by_names.assert_called_once_with(
+                set([TEST_IFACE1])
+            )
+            plugin.get_interfaces.assert_not_called()
+
+    def test_show_with_plugins_projected_by_fields(self):
+        plugins = self._gen_plugin_mocks()
+        plugins[0].plugin_capabilities.append(
+            NmstatePlugin.PLUGIN_CAPABILITY_ROUTE
+        )
+        plugins[0].get_interfaces_with_properties.return_value = [
+            {
+                Interface.NAME: TEST_IFACE1,
+                Interface.TYPE: InterfaceType.ETHERNET,
+                Interface.MTU: 1500,
+                Interface.IPV4: {InterfaceIPv4.ENABLED: False},
+            },
+        ]
+        plugins[1].get_interfaces_with_properties.return_value = []
+
+        report = show_with_plugins(
+            plugins, fields=["interfaces.name", "interfaces.ipv4"]
+        )
+
+        assert report == {
+            Interface.KEY: [
+                {
+                    Interface.NAME: TEST_IFACE1,
+                    Interface.TYPE: InterfaceType.ETHERNET,
+                    Interface.IPV4: {InterfaceIPv4.ENABLED: False},
+                }
+            ]
+        }
+        for plugin in plugins:
+            plugin.get_interfaces_with_properties.assert_called_once_with(
+                set([Interface.NAME, Interface.TYPE, Interface.IPV4]), None
+            )
+            plugin.get_interfaces.assert_not_called()
+        plugins[0].get_routes.assert_not_called()
+
+    def test_show_with_plugins_projected_by_nested_fields(self):
+        plugins = self._gen_plugin_mocks()
+        plugins[0].plugin_capabilities.append(
+            NmstatePlugin.PLUGIN_CAPABILITY_ROUTE
+        )
+        plugins[0].get_routes.return_value = {
+            Route.CONFIG: [
+                {
+                    Route.DESTINATION: "198.51.100.0/24",
+                    Route.NEXT_HOP_INTERFACE: TEST_IFACE1,
+                }
+            ],
+            Route.RUNNING: [{Route.DESTINATION: "203.0.113.0/24"}],
+        }
+
+        report = show_with_plugins(
+            plugins, fields=["routes.config.destination"]
+        )
+
+        assert report == {
+            Route.KEY: {Route.CONFIG: [{Route.DESTINATION: "198.51.100.0/24"}]}
+        }
+        for plugin in plugins:
+            plugin.get_interfaces.assert_not_called()
+            plugin.get_interfaces_with_properties.assert_not_called()
+
+    def test_show_with_plugins_whole_subtree_field_wins(self):
+        plugins = self._gen_plugin_mocks()
+        for plugin in plugins:
+            plugin.get_interfaces.return_value = []
+
+        show_with_plugins(plugins, fields=["interfaces.ipv4", "interfaces"])
+
+        for plugin in plugins:
+            plugin.get_interfaces.assert_called_once_with()
+            plugin.get_interfaces_with_properties.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "fields",
+        ["interfaces", ["interfaces..ipv4"], [""], [None]],
+        ids=["string", "empty_key", "empty", "none"],
+    )
+    def test_show_with_plugins_invalid_fields(self, fields):
+        with pytest.raises(NmstateValueError):
+            show_with_plugins(self._gen_plugin_mocks(), fields=fields)
+
+
+class _FooPlugin(NmstatePlugin):
+    @property
+    def name(self):
+        return "foo"
+
+    @property
+    def plugin_capabilities(self):
+        return [NmstatePlugin.PLUGIN_CAPABILITY_IFACE]
+
+    def get_interfaces(self):
+        return [
+            {Interface.NAME: TEST_IFACE1},
+            {Interface.NAME: TEST_IFACE2},
+        ]
+
+    def get_routes(self):
+        return {
+            Route.CONFIG: [
+                {Route.NEXT_HOP_INTERFACE: TEST_IFACE1},
+                {Route.NEXT_HOP_INTERFACE: TEST_IFACE2},
+            ]
+        }
+
+    def get_route_rules(self):
+        return {
+            RouteRule.CONFIG: [
+                {RouteRule.ROUTE_TABLE: 100},
+                {RouteRule.IP_FROM: "192.0.2.1"},
+            ]
+        }
+
+
+class TestPluginFilteredQuery:
+    def test_get_interfaces_by_names(self):
+        assert _FooPlugin().get_interfaces_by_names(set([TEST_IFACE2])) == [
+            {Interface.NAME: TEST_IFACE2}
+        ]
+
+    def test_get_interfaces_with_properties(self):
+        assert _FooPlugin().get_interfaces_with_properties(
+            set([Interface.NAME]), set([TEST_IFACE2])
+        ) == [{Interface.NAME: TEST_IFACE2}]
+
+    def test_get_routes_by_ifaces(self):
+        assert _FooPlugin().get_routes_by_ifaces(set([TEST_IFACE1])) == {
+            Route.CONFIG: [{Route.NEXT_HOP_INTERFACE: TEST_IFACE1}]
+        }
+
+    def test_get_route_rules_by_tables_default_to_main_table(self):
+        assert _FooPlugin().get_route_rules_by_tables(set([254])) == {
+            RouteRule.CONFIG: [{RouteRule.IP_FROM: "192.0.2.1"}]
+        }
+
+
+class TestLoadPlugins:
+    def _load_plugin_names(self, kernel_only, nm_plugins, memory_only=False):
+        with mock.patch.object(
+            nmstate, "_load_nm_plugin", return_value=nm_plugins
+        ), mock.patch.object(
+            nmstate, "_load_external_py_plugins", return_value=[]
+        ):
+            return [
+                plugin.name
+                for plugin in nmstate.load_plugins(kernel_only, memory_only)
+            ]
+
+    def test_load_kernel_plugin_when_requested(self):
+        nm_plugin = mock.MagicMock()
+        nm_plugin.priority = NmstatePlugin.DEFAULT_PRIORITY
+
+        assert self._load_plugin_names(True, [nm_plugin]) == ["kernel"]
+
+    def test_no_kernel_plugin_without_nm(self):
+        assert self._load_plugin_names(False, []) == ["nispor"]
+
+    def test_load_kernel_plugin_for_memory_only_without_nm(self):
+        assert self._load_plugin_names(False, [], memory_only=True) == [
+            "kernel"
+        ]
+
+    def test_load_nispor_plugin_for_memory_only_with_nm(self):
+        nm_plugin = mock.MagicMock()
+        nm_plugin.name = "NetworkManager"
+        nm_plugin.priority = NmstatePlugin.DEFAULT_PRIORITY
+
+        assert self._load_plugin_names(
+            False, [nm_plugin], memory_only=True
+        ) == ["nispor", "NetworkManager"]
+
+    def test_load_nispor_plugin_with_nm(self):
+        nm_plugin = mock.MagicMock()
+        nm_plugin.name = "NetworkManager"
+        nm_plugin.priority = NmstatePlugin.DEFAULT_PRIORITY
+
+        assert self._load_plugin_names(False, [nm_plugin]) == [
+            "nispor",
+            "NetworkManager",
+        ]
+
+
+class TestLoadNmPlugin:
+    @pytest.fixture
+    def nm_plugin_cls_mock(self):
+        nm_module = mock.MagicMock()
+        with mock.patch.dict(sys.modules, {"libnmstate.nm": nm_module}):
+            yield nm_module.NetworkManagerPlugin
+
+    def test_load_with_default_queue_sizes(self, nm_plugin_cls_mock):
+        with mock.patch.dict(nmstate.os.environ, clear=True):
+            assert nmstate._load_nm_plugin() == [
+                nm_plugin_cls_mock.return_value
+            ]
+
+        nm_plugin_cls_mock.assert_called_once_with()
+
+    def test_load_with_queue_sizes_from_env(self, nm_plugin_cls_mock):
+        with mock.patch.dict(
+            nmstate.os.environ,
+            {
+                nmstate.NM_FAST_QUEUE_SIZE_ENV: "30",
+                nmstate.NM_SLOW_QUEUE_SIZE_ENV: "10",
+            },
+        ):
+            nmstate._load_nm_plugin()
+
+        nm_plugin_cls_mock.assert_called_once_with(
+            fast_queue_size=30, slow_queue_size=10
+        )
+
+    @pytest.mark.parametrize("value", ["0", "-1", "foo"])
+    def test_load_with_invalid_queue_size(self, nm_plugin_cls_mock, value):
+        with mock.patch.dict(
+            nmstate.os.environ, {nmstate.NM_SLOW_QUEUE_SIZE_ENV: value}
+        ):
+            with pytest.raises(NmstateValueError):
+                nmstate._load_nm_plugin()
+
+        nm_plugin_cls_mock.assert_not_called()
@@ -231,6 +231,39 @@ class TestRouteRuleState:
             }
         )
 
+    def test_verify_only_specified_route_tables(self):
+        ifaces = self._gen_ifaces()
+        state = RouteRuleState(
+            self._gen_route_state(ifaces),
+            {
+                RouteRule.CONFIG: [
+                    _gen_ipv4_route_rule().to_dict(),
+                    _gen_ipv6_route_rule().to_dict(),
+                ]
+            },
+            {},
+        )
+        state.verify(
+            {RouteRule.CONFIG: [_gen_ipv4_route_rule().to_dict()]},
+            route_tables=set([IPV4_ROUTE_TABLE_ID]),
+        )
+
+    def test_route_tables_to_verify(self):
+        ifaces = self._gen_ifaces()
+        route_state = self._gen_route_state(ifaces)
+        state = RouteRuleState(
+            route_state,
+            {RouteRule.CONFIG: [_gen_ipv6_route_rule().to_dict()]},
+            {RouteRule.CONFIG: [_gen_ipv4_route_rule().to_dict()]},
+        )
+
+        assert state.route_tables_to_verify(route_state, set()) == set(
+            [IPV6_ROUTE_TABLE_ID]
+        )
+        assert state.route_tables_to_verify(
+            route_state, set([IPV4_ROUTE_IFACE_NAME])
+        ) == set([IPV4_ROUTE_TABLE_ID, IPV6_ROUTE_TABLE_ID])
+
     def test_gen_metatada(self):
         ifaces = self._gen_ifaces()
         route_state = self._gen_route_state(ifaces)
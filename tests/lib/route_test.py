@@ -20,6 +20,7 @@
 import pytest
 
 from libnmstate.error import NmstateValueError
+from libnmstate.error import NmstateVerificationError
 from libnmstate.schema import Interface
 from libnmstate.schema import InterfaceIPv4
 from libnmstate.schema import InterfaceIPv6
@@ -33,6 +34,7 @@ from libnmstate.route import RouteState
 from .testlib.ifacelib import gen_two_static_ip_ifaces
 from .testlib.routelib import IPV4_ROUTE_IFACE_NAME
 from .testlib.routelib import IPV4_ROUTE_DESITNATION
+from .testlib.routelib import IPV4_ROUTE_TABLE_ID
 from .testlib.routelib import IPV6_ROUTE_IFACE_NAME
 from .testlib.routelib import gen_ipv4_route
 from .testlib.routelib import gen_ipv6_route
@@ -555,6 +557,36 @@ class TestRouteState:
             BaseIface.ROUTES_METADATA
         ] == [ipv6_route.to_dict()]
 
+    def test_verify_only_specified_ifaces(self):
+        ipv4_route = gen_ipv4_route()
+        ipv6_route = gen_ipv6_route()
+        state = self._gen_route_state([ipv4_route], [ipv6_route])
+
+        state.verify(
+            {Route.CONFIG: [ipv4_route.to_dict()]},
+            iface_names=set([IPV4_ROUTE_IFACE_NAME]),
+        )
+
+    def test_verify_failure_on_specified_ifaces(self):
+        ipv4_route = gen_ipv4_route()
+        ipv6_route = gen_ipv6_route()
+        state = self._gen_route_state([ipv4_route], [ipv6_route])
+
+        with pytest.raises(NmstateVerificationError):
+            state.verify(
+                {Route.CONFIG: [ipv6_route.to_dict()]},
+                iface_names=set([IPV4_ROUTE_IFACE_NAME]),
+            )
+
+    def test_route_tables_of_ifaces(self):
+        ipv4_route = gen_ipv4_route()
+        ipv6_route = gen_ipv6_route()
+        state = self._gen_route_state([ipv4_route], [ipv6_route])
+
+        assert state.route_tables_of_ifaces(
+            set([IPV4_ROUTE_IFACE_NAME])
+        ) == set([IPV4_ROUTE_TABLE_ID])
+
 
 def _create_route(dest, via_addr, via_iface, table, metric):
     return RouteEntry(
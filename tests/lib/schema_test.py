@@ -0,0 +1,93 @@
+#
+# Copyright (c) 2021 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+import json
+from unittest import mock
+import zlib
+
+import pytest
+import yaml
+
+from libnmstate import schema
+
+YAML_CONTENT = b"type: object\nproperties:\n  foo:\n    type: string\n"
+YAML_SCHEMA = {"type": "object", "properties": {"foo": {"type": "string"}}}
+PRECOMPILED_SCHEMA = {"type": "object", "description": "precompiled"}
+
+
+@pytest.fixture
+def schema_files():
+    files = {"schemas/foo.yaml": YAML_CONTENT}
+
+    def _get_data(package, resource):
+        try:
+            return files[resource]
+        except KeyError:
+            raise FileNotFoundError(resource)
+
+    with mock.patch.object(schema.pkgutil, "get_data", side_effect=_get_data):
+        yield files
+
+
+def _gen_precompiled(yaml_content):
+    return json.dumps(
+        {
+            schema.PRECOMPILED_CHECKSUM: zlib.crc32(yaml_content),
+            schema.PRECOMPILED_SCHEMA: PRECOMPILED_SCHEMA,
+        }
+    ).encode()
+
+
+def test_load_yaml_without_precompiled(schema_files):
+    assert schema.load("foo") == YAML_SCHEMA
+
+
+def test_load_precompiled(schema_files):
+    schema_files["schemas/foo.json"] = _gen_precompiled(YAML_CONTENT)
+
+    assert schema.load("foo") == PRECOMPILED_SCHEMA
+
+
+def test_load_yaml_when_precompiled_is_stale(schema_files):
+    schema_files["schemas/foo.json"] = _gen_precompiled(b"type: object\n")
+
+    assert schema.load("foo") == YAML_SCHEMA
+
+
+def test_load_yaml_when_precompiled_is_corrupted(schema_files):
+    schema_files["schemas/foo.json"] = b"{"
+
+    assert schema.load("foo") == YAML_SCHEMA
+
+
+def test_precompile_and_load(schema_files):
+    schema_files["schemas/foo.json"] = schema.precompile(YAML_CONTENT).encode()
+
+    assert schema.load("foo") == YAML_SCHEMA
+
+
+def test_precompile_ifaces_schema():
+    content = schema.pkgutil.get_data(
+        "libnmstate", "schemas/operational-state.yaml"
+    )
+    precompiled = json.loads(schema.precompile(content))
+
+    assert precompiled[schema.PRECOMPILED_SCHEMA] == yaml.load(
+        content, Loader=yaml.SafeLoader
+    )
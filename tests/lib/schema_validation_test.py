@@ -185,6 +185,27 @@ class TestIfaceCommon:
         with pytest.raises(js.ValidationError):
             libnmstate.validator.schema_validate(default_data)
 
+    def test_missing_type_defaults_to_unknown_without_modifying_input(
+        self, default_data
+    ):
+        del default_data[INTERFACES][0][Interface.TYPE]
+        expected_data = copy.deepcopy(default_data)
+
+        libnmstate.validator.schema_validate(default_data)
+
+        assert default_data == expected_data
+
+    def test_validator_created_once(self, default_data):
+        libnmstate.validator.schema_validate(default_data)
+        validator = libnmstate.validator._get_validator(
+            libnmstate.schema.ifaces_schema
+        )
+        libnmstate.validator.schema_validate(default_data)
+
+        assert validator is libnmstate.validator._get_validator(
+            libnmstate.schema.ifaces_schema
+        )
+
 
 class TestIfaceMacAddress:
     @pytest.mark.parametrize(
@@ -0,0 +1,105 @@
+#
+# Copyright (c) 2021 Red Hat, Inc.
+#
+# This file is part of nmstate
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2.1 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+
+from unittest import mock
+
+import pytest
+
+from libnmstate import session
+from libnmstate.error import NmstateValueError
+
+
+@pytest.fixture
+def plugin_mock():
+    plugin = mock.MagicMock()
+    plugin.checkpoint = None
+    with mock.patch.object(session, "load_plugins") as load_plugins_mock:
+        load_plugins_mock.return_value = [plugin]
+        yield plugin
+
+
+@pytest.fixture
+def show_with_plugins_mock():
+    with mock.patch.object(session, "show_with_plugins") as m:
+        yield m
+
+
+def test_plugins_loaded_once_for_multiple_show(
+    plugin_mock, show_with_plugins_mock
+):
+    with session.NmstateSession() as nmstate_session:
+        nmstate_session.show()
+        nmstate_session.show(include_status_data=True, fields=["routes"])
+
+    assert show_with_plugins_mock.call_args_list == [
+        mock.call([plugin_mock], False, fields=None),
+        mock.call([plugin_mock], True, fields=["routes"]),
+    ]
+    session.load_plugins.assert_called_once_with(False)
+    plugin_mock.unload.assert_called_once()
+
+
+def test_apply_use_session_plugins(plugin_mock):
+    with mock.patch.object(session, "apply_with_plugins") as apply_mock:
+        with session.NmstateSession() as nmstate_session:
+            nmstate_session.apply({}, commit=False)
+
+    apply_mock.assert_called_once_with(
+        [plugin_mock],
+        {},
+        verify_change=True,
+        commit=False,
+        rollback_timeout=60,
+        save_to_disk=True,
+        scoped_checkpoint=False,
+        timings_callback=None,
+    )
+
+
+def test_kernel_only_session_refuse_save_to_disk(plugin_mock):
+    with session.NmstateSession(kernel_only=True) as nmstate_session:
+        with pytest.raises(NmstateValueError):
+            nmstate_session.apply({})
+
+    session.load_plugins.assert_called_once_with(True)
+
+
+def test_rollback_checkpoint_on_failure_and_keep_plugins(
+    plugin_mock, show_with_plugins_mock
+):
+    plugin_mock.checkpoint = "/checkpoint/1"
+    show_with_plugins_mock.side_effect = [Exception("foo"), {}]
+    with session.NmstateSession() as nmstate_session:
+        with pytest.raises(Exception):
+            nmstate_session.show()
+        plugin_mock.rollback_checkpoint.assert_called_once()
+        plugin_mock.unload.assert_not_called()
+
+        assert nmstate_session.show() == {}
+
+
+def test_closed_session(plugin_mock):
+    nmstate_session = session.NmstateSession()
+    nmstate_session.close()
+    nmstate_session.close()
+
+    assert nmstate_session.is_closed
+    plugin_mock.unload.assert_called_once()
+    with pytest.raises(NmstateValueError):
+        nmstate_session.show()